@@ -0,0 +1,356 @@
+"""Benchmark sitecheck's check engines against a local stub server.
+
+Description:
+    Runs `--checks` checks of a stub server (the one the tests use, in its own process so it
+    doesn't compete for the GIL) at each `--concurrency` and `--engine`, and reports:
+
+    - Throughput, in checks per second.
+    - Client overhead at p50/p95/p99: each check's total time. The stub answers instantly,
+        so this is almost all time spent in the client.
+    - Memory high-water: peak Python allocations during the run (`tracemalloc`). Measured in a
+        second, separate run, so tracing doesn't skew the timings.
+    - Handshakes per check: connections the server accepted per check (TCP, plus TLS with
+        `--tls`). Below `1` means connections were reused.
+
+    Save the results with `--save-baseline`, and compare a later run with `--baseline`. A
+    scenario regresses when its throughput drops, or its p95 overhead or memory grows, by more
+    than `--tolerance`; the script then exits with `1`.
+
+Usage:
+    - `python benchmarks/benchmark.py`: Run the default scenarios.
+    - `--checks CHECKS`: (default=2000) Checks per scenario.
+    - `--concurrency CONCURRENCY [...]`: (default=`1 10 50`) Concurrency levels to run.
+    - `--engine ENGINE [...]`: (default=`thread async`) Engines to run.
+    - `--method METHOD`: (default=`GET`) Request method.
+    - `--pool-size POOL_SIZE`: (default=10) Idle connections per host for the thread engine.
+    - `--tls`: Check the stub server over HTTPS.
+    - `--save-baseline PATH`: Save the results as a JSON baseline.
+    - `--baseline PATH`: Compare the results against a saved baseline.
+    - `--tolerance TOLERANCE`: (default=0.1) Fraction a metric may get worse before it's a regression.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from http.server import ThreadingHTTPServer
+import json
+import logging
+import multiprocessing
+from pathlib import Path
+import ssl
+import statistics
+import sys
+import time
+import tracemalloc
+import typing as t
+
+log: logging.Logger = logging.getLogger(__name__)
+
+## Import sitecheck & the tests' stub server from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sitecheck import (
+    DEFAULT_POOL_SIZE,
+    CheckResult,
+    ConnectionPool,
+    DNSCache,
+    check_sites,
+    check_sites_async,
+    get_ssl_context,
+)
+from tests.fixtures.server_fixtures import STUB_SERVER_PEM, StubHandler
+
+DEFAULT_CHECKS: int = 2000
+DEFAULT_CONCURRENCY: list[int] = [1, 10, 50]
+DEFAULT_ENGINES: list[str] = ["thread", "async"]
+DEFAULT_TOLERANCE: float = 0.1
+
+## Metrics compared against a baseline, and whether a higher value is better
+COMPARED_METRICS: dict[str, bool] = {
+    "checks_per_second": True,
+    "p95_ms": False,
+    "peak_memory_kib": False,
+}
+
+
+class _CountingServer(ThreadingHTTPServer):
+    """A stub server counting the connections it accepted."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, connections: t.Any) -> None:
+        self.connections = connections
+        super().__init__(("127.0.0.1", 0), StubHandler)
+
+    def get_request(self) -> tuple[t.Any, t.Any]:
+        request = super().get_request()
+        ## Only the serving thread accepts connections
+        self.connections.value += 1
+
+        return request
+
+
+def _serve(tls: bool, connections: t.Any, ports: t.Any) -> None:
+    server = _CountingServer(connections)
+    if tls:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(STUB_SERVER_PEM)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+class StubServerProcess:
+    """Run the stub server in a child process, counting the connections it accepts."""
+
+    def __init__(self, tls: bool = False) -> None:
+        self.connections = multiprocessing.Value("q", 0, lock=False)
+        ports: multiprocessing.Queue = multiprocessing.Queue()
+
+        self._process = multiprocessing.Process(
+            target=_serve, args=(tls, self.connections, ports), daemon=True
+        )
+        self._process.start()
+
+        self.url: str = f"{'https' if tls else 'http'}://127.0.0.1:{ports.get(timeout=10)}"
+
+    def close(self) -> None:
+        self._process.terminate()
+        self._process.join()
+
+
+def _run_checks(
+    engine: str, sites: list[str], concurrency: int, pool_size: int, **check_kwargs: t.Any
+) -> list[CheckResult]:
+    if engine == "async":
+
+        async def _collect() -> list[CheckResult]:
+            return [
+                result
+                async for result in check_sites_async(
+                    sites, concurrency=concurrency, **check_kwargs
+                )
+            ]
+
+        return asyncio.run(_collect())
+
+    pool = ConnectionPool(max_per_host=pool_size) if pool_size > 0 else None
+    try:
+        return list(
+            check_sites(sites, concurrency=concurrency, pool=pool, **check_kwargs)
+        )
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+def run_scenario(
+    server: StubServerProcess,
+    engine: str,
+    concurrency: int,
+    checks: int = DEFAULT_CHECKS,
+    method: str = "GET",
+    pool_size: int = DEFAULT_POOL_SIZE,
+    ssl_context: ssl.SSLContext | None = None,
+) -> dict[str, t.Any]:
+    """Run one scenario twice (timed, then traced for memory), returning its metrics."""
+    sites: list[str] = [f"{server.url}/200"] * checks
+    check_kwargs: dict[str, t.Any] = {
+        "method": method,
+        "retries": 1,
+        "sleep": 0,
+        "ssl_context": ssl_context,
+        "dns_cache": DNSCache(),
+    }
+
+    connections_before: int = server.connections.value
+    started: float = time.perf_counter()
+    results: list[CheckResult] = _run_checks(
+        engine, sites, concurrency, pool_size, **check_kwargs
+    )
+    elapsed: float = time.perf_counter() - started
+    connections: int = server.connections.value - connections_before
+
+    tracemalloc.start()
+    try:
+        _run_checks(engine, sites, concurrency, pool_size, **check_kwargs)
+        peak_bytes: int = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    totals: list[float] = sorted(
+        result.response.timings.total_ms
+        for result in results
+        if result.response is not None and result.response.timings.total_ms is not None
+    )
+    percentiles: list[float] = (
+        statistics.quantiles(totals, n=100, method="inclusive")
+        if len(totals) > 1
+        else [totals[0] if totals else 0.0] * 99
+    )
+
+    return {
+        "engine": engine,
+        "concurrency": concurrency,
+        "checks": checks,
+        "errors": sum(1 for result in results if result.error is not None),
+        "checks_per_second": round(checks / elapsed, 1),
+        "p50_ms": round(percentiles[49], 3),
+        "p95_ms": round(percentiles[94], 3),
+        "p99_ms": round(percentiles[98], 3),
+        "peak_memory_kib": round(peak_bytes / 1024, 1),
+        "handshakes_per_check": round(connections / checks, 3),
+    }
+
+
+def run_benchmarks(
+    checks: int = DEFAULT_CHECKS,
+    concurrency: t.Sequence[int] = DEFAULT_CONCURRENCY,
+    engines: t.Sequence[str] = DEFAULT_ENGINES,
+    method: str = "GET",
+    pool_size: int = DEFAULT_POOL_SIZE,
+    tls: bool = False,
+) -> dict[str, dict[str, t.Any]]:
+    """Run every engine & concurrency scenario, returning metrics keyed by scenario name."""
+    server = StubServerProcess(tls=tls)
+    ssl_context: ssl.SSLContext | None = (
+        get_ssl_context(cafile=str(STUB_SERVER_PEM)) if tls else None
+    )
+
+    results: dict[str, dict[str, t.Any]] = {}
+    try:
+        for engine in engines:
+            for level in concurrency:
+                name: str = f"{engine}-c{level}{'-tls' if tls else ''}"
+                log.info(f"Running {name}: {checks} checks")
+                results[name] = run_scenario(
+                    server,
+                    engine,
+                    level,
+                    checks=checks,
+                    method=method,
+                    pool_size=pool_size,
+                    ssl_context=ssl_context,
+                )
+    finally:
+        server.close()
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, t.Any]],
+    baseline: dict[str, dict[str, t.Any]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[str]:
+    """Compare results against a baseline, returning a description of each regression."""
+    regressions: list[str] = []
+
+    for name, metrics in results.items():
+        if name not in baseline:
+            log.info(f"{name}: not in the baseline, skipping comparison")
+            continue
+
+        if metrics["errors"] > baseline[name].get("errors", 0):
+            regressions.append(
+                f"{name}: {metrics['errors']} check(s) failed ({baseline[name].get('errors', 0)} in the baseline)"
+            )
+
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            before: float = baseline[name][metric]
+            after: float = metrics[metric]
+            if not before:
+                continue
+
+            change: float = (after - before) / before
+            worse: float = -change if higher_is_better else change
+            log.info(f"{name}: {metric} {before} -> {after} ({change:+.1%})")
+
+            if worse > tolerance:
+                regressions.append(
+                    f"{name}: {metric} got {worse:.1%} worse ({before} -> {after})"
+                )
+
+    return regressions
+
+
+def _report(results: dict[str, dict[str, t.Any]]) -> None:
+    log.info(
+        f"{'scenario':<16} {'checks/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'peak KiB':>10} {'handshakes':>10} {'errors':>6}"
+    )
+    for name, metrics in results.items():
+        log.info(
+            f"{name:<16} {metrics['checks_per_second']:>10} {metrics['p50_ms']:>8} {metrics['p95_ms']:>8} {metrics['p99_ms']:>8} {metrics['peak_memory_kib']:>10} {metrics['handshakes_per_check']:>10} {metrics['errors']:>6}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark sitecheck's check engines against a local stub server."
+    )
+    parser.add_argument("--checks", type=int, default=DEFAULT_CHECKS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY)
+    parser.add_argument(
+        "--engine", nargs="+", choices=DEFAULT_ENGINES, default=DEFAULT_ENGINES
+    )
+    parser.add_argument("--method", type=str.upper, default="GET")
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE)
+    parser.add_argument("--tls", action="store_true")
+    parser.add_argument("--save-baseline", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args: argparse.Namespace = parse_args()
+
+    ## A log line per check would dominate the timings
+    logging.getLogger("sitecheck").setLevel(logging.WARNING)
+
+    results: dict[str, dict[str, t.Any]] = run_benchmarks(
+        checks=args.checks,
+        concurrency=args.concurrency,
+        engines=args.engine,
+        method=args.method,
+        pool_size=args.pool_size,
+        tls=args.tls,
+    )
+    _report(results)
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        log.info(f"Saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        try:
+            baseline: dict[str, dict[str, t.Any]] = json.loads(
+                args.baseline.read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError) as exc:
+            msg = f"({type(exc)}) Error loading baseline '{args.baseline}'. Details: {exc}"
+            log.error(msg)
+            sys.exit(2)
+
+        regressions: list[str] = compare(results, baseline, tolerance=args.tolerance)
+        for regression in regressions:
+            log.error(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+        log.info(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level="INFO",
+        format="%(asctime)s | [%(levelname)s] | line:%(lineno)s > %(message)s",
+        datefmt=("%Y-%m-%dT%H:%M:%S"),
+    )
+
+    main()
@@ -42,7 +42,10 @@ nox.sessions = ["lint", "tests"]
 PY_VERSIONS: list[str] = ["3.12", "3.11"]
 
 ## Set paths to lint with the lint session
-LINT_PATHS: list[str] = ["sitecheck.py", "tests"]
+LINT_PATHS: list[str] = ["sitecheck.py", "tests", "benchmarks"]
+
+## Benchmark results the benchmark session compares against (saved on the first run)
+BENCHMARK_BASELINE: Path = Path(".benchmarks/baseline.json")
 
 OS_TYPE = platform.system()
 
@@ -162,6 +165,28 @@ def run_tests_in_pipeline(session: nox.Session) -> None:
     )
 
 
+@nox.session(name="benchmark", tags=["perf"])
+def run_benchmark(session: nox.Session) -> None:
+    """Benchmark check throughput & overhead against a local stub server.
+
+    Compares against the saved baseline, or saves one if there is none yet. Pass your own
+    args to the harness after `--`, i.e. `nox -s benchmark -- --checks 5000 --tls`.
+    """
+    install_uv_project(session=session)
+
+    if session.posargs:
+        benchmark_args: list[str] = list(session.posargs)
+    elif BENCHMARK_BASELINE.exists():
+        log.info(f"Comparing against baseline '{BENCHMARK_BASELINE}'")
+        benchmark_args = ["--baseline", str(BENCHMARK_BASELINE)]
+    else:
+        log.info(f"No baseline found, saving one to '{BENCHMARK_BASELINE}'")
+        benchmark_args = ["--save-baseline", str(BENCHMARK_BASELINE)]
+
+    log.info("Running benchmarks")
+    session.run("uv", "run", "python", "benchmarks/benchmark.py", *benchmark_args)
+
+
 @nox.session(name="compile-pex", tags=["pex"])
 def compile_pex(session: nox.Session) -> None:
     """Compile script into a pex file (self-contained executable)."""
@@ -6,166 +6,4017 @@ Description:
     a specified number of times before determining site is offline.
     
     Check the available options with `sitecheck.py --help`.
+
+    The exit code tells the outcome: `0` success, `1` a failure status code (or unmet body expectation),
+    `3` a status code in neither list, `4` a connection error, `5` a timeout. When checking several sites,
+    the most severe outcome (highest code) wins. `2` means the arguments were invalid.
     
 Usage:
     - `-h`/`--help`: Show help message
     - `--site SITE`: Set the site address to request, i.e. `https://www.google.com`
     - `--method`: (Optional, default=`HEAD`) The HTTP method type, i.e. `GET`, `HEAD`, etc.
+        `auto` sends a `HEAD`, and falls back to a `GET` of a single byte (`Range: bytes=0-0`) when the server answers
+        `405` or `501`. Hosts that rejected `HEAD` are remembered, so their later checks (i.e. in `--watch`) go straight
+        to the ranged `GET`. Its `206 Partial Content` answer is classified like a `200`.
+    - `--probe PROBE`: (Optional) Instead of an HTTP request, only open a TCP connection to the site (`tcp`), or also
+        complete a TLS handshake (`tls`, on port 443 unless the URL sets one), reporting the connect/handshake time and
+        the TLS certificate's expiry. Several times cheaper than an HTTP check; a probe that connects is a success.
+    - `--conditional`: Remember the `ETag`/`Last-Modified` of each site's successful `GET` response, and send them as
+        `If-None-Match`/`If-Modified-Since` on its later checks (i.e. every round of `--watch`). A `304 Not Modified`
+        answer skips the body and counts as a success. Checks with `--expect-*` options always fetch the whole body.
+    - `--cert-warn-days CERT_WARN_DAYS`: (Optional) Log a warning when an HTTPS site's (or `--probe tls`'s) certificate
+        expires within this many days, i.e. `14`. Certificates are parsed once per host and reused until they change.
     - `--success-codes SUCCESS_CODES`: (Optional, default=<predefined list>) Specify success codes, i.e. `--success-codes 200 201 202`.
+        Besides single codes, accepts a class (`2xx`), a range (`500-599`) or an exclusion (`'!404'`), i.e. `--success-codes 2xx 3xx '!304'`.
     - `--failure-codes FAILURE_CODES`: (Optional, default=<predefined list>) Specify failure codes, i.e. `--failure-codes 400, 404, 500`.
+        Accepts the same syntax as `--success-codes`. Codes in both lists count as a success.
     - `--headers HEADERS`: (Optional, default=None): Pass request headers, i.e. `--headers '{"Content-Type": "application/json", "Authorization": "Bearer: <api-key>"}'
     - `--body BODY`: (Optional, default=`None`): Pass a request body, i.e. `--body '{"someKey": "someValue"}'`. The body must be quoted, and
-        will be converted to JSON for the request.
-    - `--sleep SLEEP`: (default=5) Time in seconds to pause between retries.
+        will be converted to JSON for the request, sent with `Content-Type: application/json` unless `--headers` sets one.
+    - `--sleep SLEEP`: (default=5) Base delay in seconds between retries. Fractions are allowed, i.e. `0.5`.
+    - `--backoff BACKOFF`: (default=`exponential`) `exponential` doubles the delay after every attempt and picks a
+        random wait up to that value (full jitter). `constant` always waits `--sleep` seconds.
+    - `--max-delay MAX_DELAY`: (default=30) Longest wait between retries, including a server's `Retry-After`.
+    - `--retry-budget RETRY_BUDGET`: (Optional) Maximum retries across the whole run. In `--watch` mode the budget
+        refills once per `--interval`. `429` and `503` responses are retried too, honoring `Retry-After`.
     - `--retries RETRIES`: (default=3) Number of retries on error.
+    - `--sites-file SITES_FILE`: Check every site listed in a file (one URL per line, `#` comments allowed) instead of
+        a single `--site`. Pass `-` to read the list from stdin.
+    - `--config CONFIG`: Check every entry of a TOML file (or a `.json` file of the same shape) instead of a `--site`
+        or `--sites-file`. Each `[[checks]]` table needs a `url`, and can set its own `method`, `headers`, `body`,
+        `success_codes`, `failure_codes`, `connect_timeout`, `read_timeout`, `deadline`, `retries`, `max_redirects`,
+        `max_body_bytes`, `interval` (with `--watch`), `probe` and `expect_text`/`expect_regex`/`expect_json_path` lists.
+        A `[defaults]` table sets any of these (but `url`) for every check. Settings not in the file fall back to the
+        CLI flags, and headers are merged. The whole file is validated before any request; a mistake exits with `2`.
+        i.e.:
+            [defaults]
+            method = "GET"
+            headers = { "User-Agent" = "sitecheck" }
+
+            [[checks]]
+            url = "https://example.com/health"
+            success_codes = ["2xx"]
+            expect_json_path = ["status=ok"]
+            interval = 15
+    - `--concurrency CONCURRENCY`: (default=10) Maximum number of sites checked at the same time in batch mode.
+    - `--workers WORKERS`: (default=1) Shard the sites across this many processes, each running its own `--engine`
+        with `--concurrency` checks and its own connection pool, so TLS handshakes & parsing can use every core.
+        Results are reported as they complete, from every worker. `--retry-budget` is split between the workers.
+        Not supported with `--watch`.
+    - `--pool-size POOL_SIZE`: (default=10) Idle keep-alive connections kept per host and reused between checks.
+        Set to `0` to open a new connection for every request.
+    - `--pool-idle-timeout POOL_IDLE_TIMEOUT`: (default=30, or twice `--interval` with `--watch`) Seconds an idle
+        pooled connection may be reused for.
+    - `--ca-file CA_FILE`: (Optional, default=system trust store) CA bundle used to verify HTTPS sites.
+    - `--min-tls-version MIN_TLS_VERSION`: (Optional) Lowest TLS version to accept, i.e. `1.2` or `1.3`.
+    - `--dns-ttl DNS_TTL`: (default=300) Seconds a resolved hostname is cached for. Lookups of hostnames that
+        don't exist are cached for 60 seconds.
+    - `--no-dns-cache`: Resolve hostnames on every connection instead of caching them.
+    - `--connect-timeout CONNECT_TIMEOUT`: (default=10) Seconds to wait for a connection (and TLS handshake).
+    - `--read-timeout READ_TIMEOUT`: (default=30) Seconds to wait on each read from the site once connected.
+    - `--deadline DEADLINE`: (Optional) Maximum seconds a check may take in total, including retries & redirects.
+    - `--max-redirects MAX_REDIRECTS`: (default=10) Maximum redirects to follow. A redirect loop or more hops than
+        this count as a connection error. Set to `0` to report redirects without following them.
+    - `--max-body-bytes MAX_BODY_BYTES`: (default=1048576) Most bytes of a response body to read. Bodies are read
+        in chunks so keep-alive connections can be reused; a longer body is left unread and its connection closed.
+    - `--expect-text EXPECT_TEXT`: (Optional) Text the response body must contain. Can be repeated.
+    - `--expect-regex EXPECT_REGEX`: (Optional) Regular expression the response body must match. Can be repeated.
+        Matches longer than 4096 bytes may be missed when they span two reads.
+    - `--expect-json-path EXPECT_JSON_PATH`: (Optional) A JSON body must contain this path, i.e. `status.ok` or
+        `$.items[0].id`. Append `=VALUE` to also compare the value, i.e. `status=ok` or `healthy=true`. Can be repeated.
+        Checks with expectations fail when the body doesn't match, even with a success status code. `HEAD` requests
+        have no body, so can't be combined with these.
+    - `--output OUTPUT`: (Optional) Also write one record per check to stdout as it completes, as a JSON array
+        (`json`), one JSON object per line (`ndjson`), or `csv`. Records hold the site, method, status, reason,
+        classification (`success`, `failure`, `unexpected`, `connection_error` or `timeout`), attempts, redirects,
+        timings, the TLS certificate's expiry & issuer, and error.
+    - `--output-file OUTPUT_FILE`: (default=`-`) Write `--output` records to this file instead of stdout.
+    - `--summary-top SUMMARY_TOP`: (default=5) When checking more than one site, how many of the slowest sites to
+        list in the summary logged at the end of the run, each with its slowest check.
+    - `--metrics-port METRICS_PORT`: (Optional) Serve Prometheus metrics at `http://<host>:METRICS_PORT/metrics` while
+        the checks run, most useful with `--watch`: `sitecheck_up` (`1` if a site's last check was a success),
+        `sitecheck_checks_total` per classification, a `sitecheck_check_duration_seconds` histogram,
+        `sitecheck_retries_total` & `sitecheck_redirects_total`, and for HTTPS sites
+        `sitecheck_cert_expiry_timestamp_seconds`, all labelled by `site`.
+    - `--metrics-host METRICS_HOST`: (default=`127.0.0.1`) Address to serve `--metrics-port` on, i.e. `0.0.0.0`.
+    - `--watch`: Keep running, checking every site again each `--interval` seconds. Stop with `Ctrl+C`.
+    - `--interval INTERVAL`: (default=60) Seconds between checks of the same site in `--watch` mode.
+    - `--engine ENGINE`: (default=`thread`) Run checks on a thread pool (`thread`) or multiplexed on a single
+        `asyncio` event loop (`async`).
     
 """
 
 from __future__ import annotations
 
-import argparse
-from dataclasses import dataclass, field
-import http.client
-import json
-import logging
-from socket import gaierror
-import time
-import typing as t
-import urllib.parse
+import abc
+import argparse
+import asyncio
+import bisect
+import collections
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import csv
+from dataclasses import dataclass, field
+import datetime
+import email.utils
+import enum
+import functools
+import heapq
+import http.client
+import http.server
+import itertools
+import json
+import logging
+import multiprocessing
+import pickle
+import queue
+import random
+import re
+import select
+import socket
+from socket import gaierror
+import ssl
+import sys
+import threading
+import time
+import tomllib
+import types
+import typing as t
+import urllib.parse
+
+log: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_SUCCESS_CODES: list[int] = [200, 201, 202]
+DEFAULT_HTTP_FAILURE_CODES: list[int] = [400, 401, 402, 403, 404, 500, 501, 502]
+DEFAULT_CONCURRENCY: int = 10
+DEFAULT_POOL_SIZE: int = 10
+DEFAULT_POOL_IDLE_TIMEOUT: float = 30.0
+DEFAULT_WATCH_INTERVAL: float = 60.0
+DEFAULT_CONNECT_TIMEOUT: float = 10.0
+DEFAULT_READ_TIMEOUT: float = 30.0
+DEFAULT_RETRY_BASE_DELAY: float = 5.0
+DEFAULT_RETRY_MAX_DELAY: float = 30.0
+DEFAULT_MAX_REDIRECTS: int = 10
+DEFAULT_MAX_BODY_BYTES: int = 1024 * 1024
+BODY_CHUNK_SIZE: int = 64 * 1024
+## Longest `--expect-regex` match guaranteed to be found across a chunk boundary
+EXPECT_REGEX_WINDOW: int = 4096
+
+## Fields of each `--output` record, in order
+RESULT_FIELDS: tuple[str, ...] = (
+    "time",
+    "site",
+    "method",
+    "status",
+    "reason",
+    "classification",
+    "attempts",
+    "redirects",
+    "total_ms",
+    "ttfb_ms",
+    "dns_ms",
+    "connect_ms",
+    "tls_ms",
+    "cert_expires",
+    "cert_issuer",
+    "failed_expectations",
+    "error",
+)
+## Upper bounds (seconds) of the `--metrics-port` check duration histogram buckets
+METRICS_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+DEFAULT_METRICS_HOST: str = "127.0.0.1"
+
+## Methods a check can use
+HTTP_METHODS: tuple[str, ...] = ("GET", "POST", "PUT", "HEAD", "DELETE")
+## Checks with `HEAD`, falling back to a ranged `GET` for hosts answering `HEAD` with `HEAD_FALLBACK_CODES`
+AUTO_METHOD: str = "AUTO"
+HEAD_FALLBACK_CODES: frozenset[int] = frozenset({405, 501})
+## Asks for a single byte of the resource, to keep fallback `GET`s about as cheap as a `HEAD`
+RANGE_FALLBACK_HEADER: dict[str, str] = {"Range": "bytes=0-0"}
+## Connection-only checks a `--probe` can run instead of an HTTP request
+PROBES: tuple[str, ...] = ("tcp", "tls")
+
+## Settings a `--config` check (or its `defaults`) may set, and the types each accepts
+CONFIG_CHECK_SETTINGS: dict[str, tuple[type, ...]] = {
+    "url": (str,),
+    "method": (str,),
+    "headers": (dict,),
+    "body": (dict, list, str),
+    "success_codes": (list, str, int),
+    "failure_codes": (list, str, int),
+    "connect_timeout": (int, float),
+    "read_timeout": (int, float),
+    "deadline": (int, float),
+    "retries": (int,),
+    "max_redirects": (int,),
+    "max_body_bytes": (int,),
+    "interval": (int, float),
+    "probe": (str,),
+    "expect_text": (list,),
+    "expect_regex": (list,),
+    "expect_json_path": (list,),
+}
+## `--config` settings passed through to `check_site()` for that check only
+CONFIG_CHECK_OPTIONS: tuple[str, ...] = (
+    "connect_timeout",
+    "read_timeout",
+    "deadline",
+    "retries",
+    "max_redirects",
+    "max_body_bytes",
+    "probe",
+)
+DEFAULT_TLS_SESSION_CACHE_SIZE: int = 1024
+DEFAULT_VALIDATOR_CACHE_SIZE: int = 4096
+DEFAULT_DNS_TTL: float = 300.0
+DEFAULT_DNS_NEGATIVE_TTL: float = 60.0
+DEFAULT_SUMMARY_TOP: int = 5
+
+TLS_VERSIONS: dict[str, ssl.TLSVersion] = {
+    "1.2": ssl.TLSVersion.TLSv1_2,
+    "1.3": ssl.TLSVersion.TLSv1_3,
+}
+
+## getaddrinfo() errors meaning the name does not exist, which are safe to cache
+_DNS_NEGATIVE_ERRNOS: frozenset[int] = frozenset(
+    errno
+    for errno in (getattr(socket, "EAI_NONAME", None), getattr(socket, "EAI_NODATA", None))
+    if errno is not None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a check runs out of time before it could finish."""
+
+
+class RedirectError(Exception):
+    """Raised when a site's redirects can't be followed to a final response."""
+
+
+class TooManyRedirects(RedirectError):
+    """Raised when a check follows more than `max_redirects` redirects."""
+
+
+class RedirectLoop(RedirectError):
+    """Raised when a redirect points back to a URL already requested during the check."""
+
+
+class ConfigError(ValueError):
+    """Raised when a `--config` file can't be read, or one of its checks is invalid."""
+
+
+class StatusCodes:
+    """A set of HTTP status codes, stored as a lookup table indexed by status code.
+
+    Description:
+        Built from specs like `200`, `2xx`, `500-599` or `!404` (comma or space separated).
+        Exclusions are applied after every inclusion, so `5xx !503` is every `5xx` code but
+        `503`. Raises `ValueError` for specs outside `100-599`.
+    """
+
+    SIZE: int = 600
+
+    _SPEC: re.Pattern[str] = re.compile(r"(\d)xx|(\d+)-(\d+)|(\d+)", re.IGNORECASE)
+
+    def __init__(self, *specs: int | str) -> None:
+        self._table: bytearray = bytearray(self.SIZE)
+
+        excluded: list[range] = []
+        for spec in specs:
+            for part in str(spec).replace(",", " ").split():
+                if part.startswith("!"):
+                    excluded.append(self._parse_range(part[1:]))
+                    continue
+
+                for code in self._parse_range(part):
+                    self._table[code] = 1
+
+        for codes in excluded:
+            for code in codes:
+                self._table[code] = 0
+
+    @classmethod
+    def _parse_range(cls, part: str) -> range:
+        match: re.Match[str] | None = cls._SPEC.fullmatch(part)
+        if match is None:
+            raise ValueError(f"Invalid status code spec: {part!r}")
+
+        status_class, first, last, code = match.groups()
+        if status_class is not None:
+            codes: range = range(int(status_class) * 100, int(status_class) * 100 + 100)
+        elif code is not None:
+            codes = range(int(code), int(code) + 1)
+        else:
+            codes = range(int(first), int(last) + 1)
+
+        if not codes or codes.start < 100 or codes.stop > cls.SIZE:
+            raise ValueError(f"Status codes must be within 100-599, got: {part!r}")
+
+        return codes
+
+    def __contains__(self, status_code: object) -> bool:
+        return (
+            isinstance(status_code, int)
+            and 0 <= status_code < self.SIZE
+            and bool(self._table[status_code])
+        )
+
+    def __iter__(self) -> t.Iterator[int]:
+        return (code for code in range(self.SIZE) if self._table[code])
+
+    def __len__(self) -> int:
+        return sum(self._table)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(str(code) for code in self)})"
+
+
+REDIRECT_CODES: StatusCodes = StatusCodes(301, 302, 303, 307, 308)
+
+
+class StatusClassifier:
+    """Classify status codes as `success`, `failure` or `unexpected` with a single table lookup.
+
+    Description:
+        The table is computed once per run from the success & failure `StatusCodes`, and
+        shared by every check. Codes in both count as a `success`.
+    """
+
+    def __init__(self, success_codes: StatusCodes, failure_codes: StatusCodes) -> None:
+        self.success_codes: StatusCodes = success_codes
+        self.failure_codes: StatusCodes = failure_codes
+
+        self._table: tuple[str, ...] = tuple(
+            "success"
+            if code in success_codes
+            else "failure"
+            if code in failure_codes
+            else "unexpected"
+            for code in range(StatusCodes.SIZE)
+        )
+
+    @classmethod
+    def from_specs(
+        cls, success: t.Iterable[int | str], failure: t.Iterable[int | str]
+    ) -> StatusClassifier:
+        return cls(StatusCodes(*success), StatusCodes(*failure))
+
+    def classify(self, status_code: int) -> str:
+        if 0 <= status_code < StatusCodes.SIZE:
+            return self._table[status_code]
+
+        return "unexpected"
+
+
+class ExitCode(enum.IntEnum):
+    """Process exit codes, one per check classification (`2` is argparse's usage error)."""
+
+    SUCCESS = 0
+    FAILURE = 1
+    UNEXPECTED = 3
+    CONNECTION_ERROR = 4
+    TIMEOUT = 5
+
+
+@dataclass
+class Timings:
+    """Milliseconds spent in each phase of a request, measured on a monotonic clock.
+
+    Description:
+        `dns_ms`, `connect_ms` & `tls_ms` are `None` when the phase didn't happen, i.e. a
+        pooled connection was reused or the site is plain `http://`. `ttfb_ms` runs from
+        sending the final request to receiving its response headers. `total_ms` covers the
+        whole check, including retries & redirects.
+    """
+
+    dns_ms: float | None = field(default=None)
+    connect_ms: float | None = field(default=None)
+    tls_ms: float | None = field(default=None)
+    ttfb_ms: float | None = field(default=None)
+    total_ms: float | None = field(default=None)
+
+    def __str__(self) -> str:
+        return " ".join(
+            f"{name.removesuffix('_ms')}={value:.1f}ms"
+            for name, value in (
+                ("total_ms", self.total_ms),
+                ("ttfb_ms", self.ttfb_ms),
+                ("dns_ms", self.dns_ms),
+                ("connect_ms", self.connect_ms),
+                ("tls_ms", self.tls_ms),
+            )
+            if value is not None
+        )
+
+
+@dataclass
+class HTTPResponse:
+    """Custom class to store the response from a request."""
+
+    status_code: int
+    reason: str | None = field(default=None)
+    headers: list[tuple[str, str]] | None = field(default=None)
+    timings: Timings | None = field(default=None)
+    ## URLs followed to reach this response, in order
+    redirects: list[str] = field(default_factory=list)
+    ## Bytes of the body read, at most `max_body_bytes`
+    body_bytes: int = field(default=0)
+    ## Descriptions of the body expectations the response didn't meet
+    failed_expectations: list[str] = field(default_factory=list)
+    ## The verified certificate of an HTTPS response's connection
+    certificate: CertificateInfo | None = field(default=None)
+    ## A `304 Not Modified` answering a conditional request, i.e. the cached resource is current
+    revalidated: bool = field(default=False)
+    ## Answers the ranged `GET` of a `--method auto` check, so `206`/`416` mean the resource exists
+    ranged: bool = field(default=False)
+    ## The status a `--method auto` check's rejected `HEAD` got, before its ranged `GET`
+    head_status: int | None = field(default=None)
+
+
+@dataclass(frozen=True)
+class CertificateInfo:
+    """The parts of a verified TLS certificate worth reporting, parsed from `getpeercert()`."""
+
+    not_after: datetime.datetime
+    issuer: str
+    ## Names the certificate is valid for, i.e. `("example.com", "www.example.com")`
+    subject_alt_names: tuple[str, ...] = ()
+
+    ## Short names of the issuer's attributes, as in `openssl x509 -issuer`
+    _ISSUER_KEYS: t.ClassVar[dict[str, str]] = {
+        "commonName": "CN",
+        "organizationName": "O",
+        "organizationalUnitName": "OU",
+        "countryName": "C",
+    }
+
+    @classmethod
+    def from_peercert(cls, cert: dict[str, t.Any] | None) -> CertificateInfo | None:
+        """Parse a `getpeercert()` dict, `None` if the certificate wasn't verified."""
+        if not cert or "notAfter" not in cert:
+            return None
+
+        return cls(
+            not_after=datetime.datetime.fromtimestamp(
+                ssl.cert_time_to_seconds(cert["notAfter"]), datetime.timezone.utc
+            ),
+            issuer=", ".join(
+                f"{cls._ISSUER_KEYS.get(key, key)}={value}"
+                for rdn in cert.get("issuer", ())
+                for key, value in rdn
+            ),
+            subject_alt_names=tuple(value for _, value in cert.get("subjectAltName", ())),
+        )
+
+    def days_left(self, now: datetime.datetime | None = None) -> float:
+        """Days until the certificate expires, negative once it has."""
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+
+        return (self.not_after - now).total_seconds() / 86400
+
+
+@dataclass
+class ProbeResponse:
+    """Outcome of a `tcp`/`tls` probe that connected, without sending an HTTP request."""
+
+    timings: Timings
+    ## The verified certificate, `None` for TCP probes
+    certificate: CertificateInfo | None = field(default=None)
+
+
+@dataclass
+class CheckResult:
+    """Outcome of a single site check, holding either a response or the error raised."""
+
+    site: str
+    response: HTTPResponse | None = field(default=None)
+    error: Exception | None = field(default=None)
+    method: str | None = field(default=None)
+    ## Requests made for the check, not counting redirects
+    attempts: int = field(default=0)
+    ## The compiled check that was run
+    spec: CheckSpec | None = field(default=None, repr=False)
+    ## Set instead of `response` when the check was a `tcp`/`tls` probe
+    probe: ProbeResponse | None = field(default=None)
+
+
+def _result_timings(result: CheckResult) -> Timings | None:
+    """The timings of a check's response or probe, `None` if it got neither."""
+    if result.response is not None:
+        return result.response.timings
+    if result.probe is not None:
+        return result.probe.timings
+
+    return None
+
+
+def _result_certificate(result: CheckResult) -> CertificateInfo | None:
+    """The TLS certificate a check's response or probe was served with, if any."""
+    if result.response is not None:
+        return result.response.certificate
+    if result.probe is not None:
+        return result.probe.certificate
+
+    return None
+
+
+def _parse_site_url(url: str, logger: logging.Logger = log) -> urllib.parse.ParseResult:
+    """Parse a site's URL, assuming `http://` when it has no scheme."""
+    parsed: urllib.parse.ParseResult = urllib.parse.urlparse(url)
+    if not parsed.scheme:
+        logger.warning(f"No schema provided for URL: {url}. Assuming 'http://'")
+        parsed = urllib.parse.urlparse(f"http://{url}")
+
+    return parsed
+
+
+def _encode_body(body: t.Union[dict, str, bytes] | None) -> bytes | None:
+    """Encode a request body, serializing dicts & lists as JSON."""
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body).encode(encoding="utf-8")
+    elif isinstance(body, str):
+        body = body.encode(encoding="utf-8")
+    return body
+
+
+def _url_target(url: urllib.parse.ParseResult) -> str:
+    """The path & query string to request, i.e. `/status?verbose=1`."""
+    target: str = url.path or "/"
+
+    return f"{target}?{url.query}" if url.query else target
+
+
+def _url_key(url: urllib.parse.ParseResult | t.Any) -> tuple[str, str]:
+    """The `(scheme, netloc)` a URL's connections are keyed by, i.e. in a `ConnectionPool`."""
+    return (url.scheme, url.netloc)
+
+
+class CheckSpec:
+    """A check of one site, compiled once and executed any number of times.
+
+    Description:
+        Holds everything about a request that doesn't change between runs: the parsed URL,
+        the encoded body, and the request line & header lines serialized to bytes, so that
+        repeated checks (i.e. every round of `--watch`) skip parsing & encoding. Instances
+        are immutable and shared between threads.
+
+        Headers are sent the way `http.client` would send them: `Host` and
+        `Accept-Encoding: identity` unless given, and `Content-Length` for a body (or an
+        empty `POST`/`PUT`/`PATCH`). Raises `ValueError` for headers that can't be sent.
+
+        `interval` & `options` are a check's own settings (i.e. from `--config`): its
+        `watch_sites()` interval, and `check_site()` args that take precedence over the run's
+        when checked by `check_sites()`, `watch_sites()` or `check_sites_async()`.
+    """
+
+    __slots__ = (
+        "site",
+        "method",
+        "url",
+        "connection_key",
+        "target",
+        "headers",
+        "body",
+        "header_lines",
+        "request_head",
+        "classifier",
+        "interval",
+        "options",
+    )
+
+    def __init__(
+        self,
+        site: str,
+        method: str = "HEAD",
+        headers: dict | None = None,
+        body: t.Union[dict, str, bytes] | None = None,
+        classifier: StatusClassifier | None = None,
+        interval: float | None = None,
+        options: t.Mapping[str, t.Any] | None = None,
+    ) -> None:
+        url: urllib.parse.ParseResult = _parse_site_url(site)
+        encoded_body: bytes | None = _encode_body(body)
+        target: str = _url_target(url)
+        headers = dict(headers or {})
+
+        given: set[str] = {key.lower() for key in headers}
+        defaults: dict[str, str] = {}
+        if "host" not in given:
+            defaults["Host"] = url.netloc.rpartition("@")[2]
+        if "accept-encoding" not in given:
+            defaults["Accept-Encoding"] = "identity"
+        if "content-length" not in given and "transfer-encoding" not in given:
+            if encoded_body is not None:
+                defaults["Content-Length"] = str(len(encoded_body))
+            elif method in ("POST", "PUT", "PATCH"):
+                defaults["Content-Length"] = "0"
+
+        header_lines: list[bytes] = []
+        for key, value in {**defaults, **headers}.items():
+            line: str = f"{key}: {value}"
+            if "\r" in line or "\n" in line:
+                raise ValueError(f"Invalid header for {site}: {line!r}")
+            header_lines.append(line.encode("latin-1"))
+
+        request_line: bytes = f"{method} {target} HTTP/1.1".encode("latin-1")
+
+        for name, value in (
+            ("site", site),
+            ("method", method),
+            ("url", url),
+            ("connection_key", _url_key(url)),
+            ("target", target),
+            ("headers", headers),
+            ("body", encoded_body),
+            ("header_lines", tuple(header_lines)),
+            ("request_head", b"\r\n".join([request_line, *header_lines, b"", b""])),
+            ("classifier", classifier),
+            ("interval", interval),
+            ("options", types.MappingProxyType(dict(options or {}))),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: t.Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        ## Recompile when unpickled (i.e. in a `--workers` process) instead of setting slots
+        return (
+            type(self),
+            (
+                self.site,
+                self.method,
+                self.headers,
+                self.body,
+                self.classifier,
+                self.interval,
+                dict(self.options),
+            ),
+        )
+
+    def __str__(self) -> str:
+        return self.site
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.method} {self.site})"
+
+
+class _BaseConnectionManager:
+    """URL & body preparation shared by the blocking and asyncio connection managers."""
+
+    def __init__(
+        self,
+        url: str | None = None,
+        headers: dict | None = None,
+        body: t.Union[dict, str] | None = None,
+        connect_timeout: float | None = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float | None = DEFAULT_READ_TIMEOUT,
+        deadline: float | None = None,
+        retry_policy: RetryPolicy | None = None,
+        max_redirects: int = DEFAULT_MAX_REDIRECTS,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        expect: t.Sequence[BodyMatcher] | None = None,
+        spec: CheckSpec | None = None,
+        validators: ValidatorCache | None = None,
+    ) -> None:
+        self.logger: logging.Logger = log.getChild(type(self).__name__)
+
+        ## A compiled check replaces `url`, `headers` & `body`, and is sent pre-serialized
+        self.spec: CheckSpec | None = spec
+        if spec is not None:
+            self.parsed_url: urllib.parse.ParseResult | t.Any = spec.url
+            self.headers: dict = spec.headers
+            self.body: bytes = spec.body
+        elif url is not None:
+            self.parsed_url = self._ensure_schema(url)
+            self.headers = headers or {}
+            self.body = self._prepare_body(body)
+        else:
+            raise ValueError("Either a url or a spec is required")
+
+        self.connect_timeout: float | None = connect_timeout
+        self.read_timeout: float | None = read_timeout
+        self.deadline: float | None = deadline
+        self.retry_policy: RetryPolicy | None = retry_policy
+        self.max_redirects: int = max_redirects
+        self.max_body_bytes: int = max_body_bytes
+        ## Assertions the final response's body must meet
+        self.expect: t.Sequence[BodyMatcher] = expect or ()
+        ## Validators of earlier responses, to make `GET`s conditional with
+        self.validators: ValidatorCache | None = validators
+        ## Whether the current connection can carry another request
+        self._reusable: bool = False
+        ## Attempts made by the last `send_request()`, not counting redirects
+        self.attempts: int = 0
+        ## The method the last `send_request()` started with, i.e. `HEAD` or `GET` for `AUTO`
+        self.sent_method: str | None = None
+        ## Whether the last `send_request()` fell back to a ranged `GET`
+        self.ranged: bool = False
+        ## The status of the `HEAD` an `AUTO` check fell back from, if any
+        self.head_status: int | None = None
+        ## Hosts known to reject `HEAD`, for `AUTO` checks to skip it
+        self.methods: MethodMemo = METHOD_MEMO
+
+        self.trace = None
+
+    def _ensure_schema(self, url) -> urllib.parse.ParseResult | t.Any:
+        return _parse_site_url(url, self.logger)
+
+    def _prepare_body(self, body: t.Union[dict, str] | None) -> bytes | None:
+        return _encode_body(body)
+
+    def _prepared(self, method: str) -> CheckSpec | None:
+        """The compiled check, if the request about to be sent is still the one it describes."""
+        if (
+            self.spec is not None
+            and method == self.spec.method
+            and self.parsed_url is self.spec.url
+        ):
+            return self.spec
+
+        return None
+
+    def _redirect(
+        self,
+        status_code: int,
+        method: str,
+        location: str,
+        redirects: list[str],
+        visited: set[tuple[str, str]],
+    ) -> str:
+        """Point the manager at a redirect's target, returning the method to request it with.
+
+        Description:
+            Relative `Location`s are resolved against the current URL. Like browsers, a `303`
+            (or a `301`/`302` answering a `POST`) is followed with a `GET` and no body.
+            Raises `TooManyRedirects` past `max_redirects`, and `RedirectLoop` when the
+            target was already requested with the same method.
+        """
+        target: str = urllib.parse.urljoin(self.parsed_url.geturl(), location)
+
+        if len(redirects) >= self.max_redirects:
+            raise TooManyRedirects(
+                f"Stopped following redirects from {self.parsed_url.geturl()} after {self.max_redirects} hops"
+            )
+
+        if (status_code == 303 and method != "HEAD") or (
+            status_code in (301, 302) and method == "POST"
+        ):
+            method = "GET"
+            self.body = None
+
+        if (method, target) in visited:
+            raise RedirectLoop(
+                f"Redirect loop: {self.parsed_url.geturl()} redirects back to {target}"
+            )
+
+        log.info(f"Following redirect to: {target}")
+        visited.add((method, target))
+        redirects.append(target)
+        self.parsed_url = urllib.parse.urlparse(target)
+
+        return method
+
+    def _request_target(self) -> str:
+        """The path & query string to request, i.e. `/status?verbose=1`."""
+        return _url_target(self.parsed_url)
+
+    def _connection_key_of(
+        self, url: urllib.parse.ParseResult | t.Any
+    ) -> tuple[str, str]:
+        """`url`'s connection key, precompiled in the spec when `url` is the spec's own."""
+        if self.spec is not None and url is self.spec.url:
+            return self.spec.connection_key
+
+        return _url_key(url)
+
+    def _start_auto(self, url: urllib.parse.ParseResult | t.Any) -> str:
+        """Start an `AUTO` check of `url`, returning the method to send first.
+
+        Hosts known to reject `HEAD` go straight to a ranged `GET`.
+        """
+        if self.methods.rejects_head(self._connection_key_of(url)):
+            self._prepare_ranged_get(url)
+            return "GET"
+
+        self.sent_method = "HEAD"
+        return "HEAD"
+
+    def _head_rejected(
+        self, res: dict[str, t.Any], url: urllib.parse.ParseResult | t.Any
+    ) -> bool:
+        """Whether an `AUTO` check of `url` got its `HEAD` rejected, preparing the ranged `GET` if so."""
+        if res["status_code"] not in HEAD_FALLBACK_CODES:
+            return False
+
+        log.info(
+            f"{self.parsed_url.netloc} answered HEAD with {res['status_code']}, falling back to a ranged GET"
+        )
+        ## Keyed by the checked site's host, even if `HEAD` was rejected after a redirect
+        self.methods.remember_rejected(self._connection_key_of(url))
+        self.head_status = res["status_code"]
+        self._prepare_ranged_get(url)
+
+        return True
+
+    def _prepare_ranged_get(self, url: urllib.parse.ParseResult | t.Any) -> None:
+        """Point the manager (back) at `url`, to request it with a ranged `GET` instead of a `HEAD`."""
+        self.parsed_url = url
+        self.headers = {**self.headers, **RANGE_FALLBACK_HEADER}
+        self.sent_method = "GET"
+        self.ranged = True
+
+    def _conditional_headers(self, method: str) -> dict[str, str]:
+        """`If-None-Match`/`If-Modified-Since` headers for a `GET` of the current URL.
+
+        Checks with body expectations need the whole body every time, so are never conditional.
+        """
+        if self.validators is None or method != "GET" or self.expect:
+            return {}
+
+        return self.validators.get(self.parsed_url.geturl())
+
+    def _remember_validators(
+        self, method: str, status_code: int, headers: list[tuple[str, str]]
+    ) -> None:
+        """Keep a successful `GET`'s validators for the next check of the current URL."""
+        if self.validators is not None and method == "GET" and 200 <= status_code < 300:
+            self.validators.update(self.parsed_url.geturl(), headers)
+
+    def _deadline_at(self) -> float | None:
+        """The `time.monotonic()` reading a check starting now must finish by."""
+        return time.monotonic() + self.deadline if self.deadline is not None else None
+
+    def _policy(self, sleep: float) -> RetryPolicy:
+        """The retry policy for this check, backing off from `sleep` if none was given."""
+        return self.retry_policy or RetryPolicy(base_delay=sleep)
+
+    def _retry_delay(
+        self,
+        policy: RetryPolicy,
+        attempt: int,
+        deadline_at: float | None,
+        retry_after: float | None = None,
+    ) -> float | None:
+        """Seconds to wait before retrying a response, or `None` if there is no time or budget left."""
+        delay: float = policy.delay(attempt, retry_after)
+
+        if deadline_at is not None and deadline_at - time.monotonic() <= delay:
+            return None
+        if not policy.allow_retry():
+            log.warning(f"Retry budget exhausted, not retrying {self.parsed_url.geturl()}")
+            return None
+
+        return delay
+
+    def _check_deadline(self, deadline_at: float | None, wait: float = 0) -> None:
+        """Raise `DeadlineExceeded` if the deadline passes within the next `wait` seconds."""
+        if deadline_at is not None and deadline_at - time.monotonic() <= wait:
+            raise DeadlineExceeded(
+                f"Check of {self.parsed_url.geturl()} did not finish within its {self.deadline}s deadline"
+            )
+
+    def _error_delay(
+        self, policy: RetryPolicy, attempt: int, deadline_at: float | None
+    ) -> float | None:
+        """Seconds to wait before retrying a failed (0-based) `attempt`, `None` if the budget is used up.
+
+        Raises `DeadlineExceeded` if the deadline would pass before the next attempt.
+        """
+        delay: float = policy.delay(attempt)
+        self._check_deadline(deadline_at, wait=delay)
+        if not policy.allow_retry():
+            log.warning(f"Retry budget exhausted, not retrying {self.parsed_url.geturl()}")
+            return None
+
+        return delay
+
+    def _probe_address(self, tls: bool) -> tuple[str, int]:
+        """The host & port a probe connects to. TLS probes default to port `443`, even for `http://` sites."""
+        default_port: int = 443 if tls or self.parsed_url.scheme == "https" else 80
+
+        return self.parsed_url.hostname, self.parsed_url.port or default_port
+
+
+class RetryBudget:
+    """Thread-safe cap on the number of retries across a whole run, shared by every check.
+
+    Description:
+        Starts with `max_retries` tokens and spends one per retry. With `refill_per_second`,
+        tokens are slowly given back (up to `max_retries`), so long-running watch mode
+        recovers once an outage is over.
+    """
+
+    def __init__(self, max_retries: int, refill_per_second: float = 0.0) -> None:
+        if max_retries < 0:
+            raise ValueError(f"max_retries can't be negative, got: {max_retries}")
+
+        self.max_retries: int = max_retries
+        self.refill_per_second: float = refill_per_second
+
+        self._tokens: float = float(max_retries)
+        self._updated_at: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Spend one retry from the budget, returning `False` if it is used up."""
+        with self._lock:
+            now: float = time.monotonic()
+            self._tokens = min(
+                float(self.max_retries),
+                self._tokens + (now - self._updated_at) * self.refill_per_second,
+            )
+            self._updated_at = now
+
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+            return True
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How long to wait between attempts, and which responses are worth retrying.
+
+    Description:
+        Delays grow exponentially from `base_delay` by `multiplier`, capped at `max_delay`.
+        With `jitter`, the actual delay is picked uniformly between 0 and that value ("full
+        jitter"), so checks failing together don't retry together. A `Retry-After` header on
+        a response in `retry_statuses` is honored instead (still capped at `max_delay`).
+    """
+
+    base_delay: float = DEFAULT_RETRY_BASE_DELAY
+    max_delay: float = DEFAULT_RETRY_MAX_DELAY
+    multiplier: float = 2.0
+    jitter: bool = True
+    retry_statuses: frozenset[int] = field(default=frozenset({429, 503}))
+    budget: RetryBudget | None = field(default=None, compare=False)
+
+    @classmethod
+    def constant(cls, delay: float, **kwargs: t.Any) -> RetryPolicy:
+        """A policy waiting the same `delay` between every attempt."""
+        kwargs.setdefault("max_delay", delay)
+
+        return cls(base_delay=delay, multiplier=1.0, jitter=False, **kwargs)
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait after the (0-based) `attempt` failed."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+
+        ceiling: float = min(self.max_delay, self.base_delay * self.multiplier**attempt)
+
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+    def allow_retry(self) -> bool:
+        """Spend a retry from the shared budget, if there is one."""
+        return self.budget is None or self.budget.try_acquire()
+
+
+def _get_header(headers: list[tuple[str, str]], name: str) -> str | None:
+    """Case-insensitive lookup of the first header called `name`."""
+    name = name.lower()
+
+    return next((value for key, value in headers if key.lower() == name), None)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header (delay in seconds or an HTTP date) into seconds from now."""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at: datetime.datetime = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+    return max(
+        (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0
+    )
+
+
+class BodyMatcher(abc.ABC):
+    """Base for assertions on a response body, checked chunk by chunk as the body is read.
+
+    Description:
+        Matchers hold the state of one scan, so every response is scanned by a `fresh()`
+        copy. `feed()` returns `True` as soon as the body is known to match, letting the
+        reader stop early; `finish()` gives the verdict once no more chunks will come.
+    """
+
+    def __init__(self) -> None:
+        self.matched: bool = False
+
+    @abc.abstractmethod
+    def __str__(self) -> str: ...
+
+    @abc.abstractmethod
+    def fresh(self) -> BodyMatcher:
+        """An unstarted matcher with the same expectation."""
+
+    @abc.abstractmethod
+    def feed(self, chunk: bytes | memoryview) -> bool: ...
+
+    def finish(self) -> bool:
+        return self.matched
+
+
+class TextMatcher(BodyMatcher):
+    """Match bodies containing `text`, encoded as UTF-8."""
+
+    def __init__(self, text: str) -> None:
+        super().__init__()
+
+        self.text: str = text
+        self._needle: bytes = text.encode("utf-8")
+        ## End of the previous chunks, long enough to hold all but the last byte of a match
+        self._tail: bytes = b""
+
+    def __str__(self) -> str:
+        return f"text {self.text!r}"
+
+    def fresh(self) -> TextMatcher:
+        return TextMatcher(self.text)
+
+    def feed(self, chunk: bytes | memoryview) -> bool:
+        if not self.matched:
+            window: bytes = self._tail + chunk
+            self.matched = self._needle in window
+            self._tail = window[max(len(window) - len(self._needle) + 1, 0) :]
+
+        return self.matched
+
+
+class RegexMatcher(BodyMatcher):
+    """Match bodies where `pattern` is found, searching the raw bytes.
+
+    Description:
+        Only the last `EXPECT_REGEX_WINDOW` bytes are carried over between chunks, so a longer
+        match spanning two chunks can be missed.
+    """
+
+    def __init__(self, pattern: str) -> None:
+        super().__init__()
+
+        self.pattern: str = pattern
+        self._regex: re.Pattern[bytes] = re.compile(pattern.encode("utf-8"))
+        self._tail: bytes = b""
+
+    def __str__(self) -> str:
+        return f"regex {self.pattern!r}"
+
+    def fresh(self) -> RegexMatcher:
+        return RegexMatcher(self.pattern)
+
+    def feed(self, chunk: bytes | memoryview) -> bool:
+        if not self.matched:
+            window: bytes = self._tail + chunk
+            self.matched = self._regex.search(window) is not None
+            self._tail = window[-EXPECT_REGEX_WINDOW:]
+
+        return self.matched
+
+
+class JSONPathMatcher(BodyMatcher):
+    """Match JSON bodies containing `path`, optionally with a given value.
+
+    Description:
+        Paths are dotted keys with `[index]` for list items, optionally prefixed with `$.`,
+        i.e. `$.items[0].id`. The expectation `path=value` also compares the value, parsing
+        `value` as JSON if it's valid JSON (i.e. `true`, `3`) or as a string otherwise.
+
+        JSON can't be judged before the document ends, so the body (bounded by
+        `max_body_bytes`) is collected and parsed in `finish()`.
+    """
+
+    _SEGMENT: re.Pattern[str] = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+
+    def __init__(self, expectation: str) -> None:
+        super().__init__()
+
+        self.expectation: str = expectation
+        path, has_value, value = expectation.partition("=")
+        self.path: list[str | int] = self.parse_path(path)
+        self.value: t.Any = None
+        self.has_value: bool = bool(has_value)
+        if self.has_value:
+            try:
+                self.value = json.loads(value)
+            except ValueError:
+                self.value = value
+
+        self._body: bytearray = bytearray()
+
+    @classmethod
+    def parse_path(cls, path: str) -> list[str | int]:
+        """Split a path like `$.items[0].id` into `["items", 0, "id"]`."""
+        path = path.strip().removeprefix("$").removeprefix(".")
+        segments: list[str | int] = []
+
+        position: int = 0
+        while position < len(path):
+            match: re.Match[str] | None = cls._SEGMENT.match(path, position)
+            if match is None:
+                raise ValueError(f"Invalid JSON path: {path!r}")
+
+            key, index = match.groups()
+            segments.append(int(index) if index is not None else key)
+            position = match.end()
+            ## Keys are separated by dots, list indexes follow their key directly
+            if path[position : position + 1] == "." and position + 1 < len(path):
+                position += 1
+
+        if not segments:
+            raise ValueError(f"Empty JSON path: {path!r}")
+
+        return segments
+
+    def __str__(self) -> str:
+        return f"JSON path {self.expectation!r}"
+
+    def fresh(self) -> JSONPathMatcher:
+        return JSONPathMatcher(self.expectation)
+
+    def feed(self, chunk: bytes | memoryview) -> bool:
+        self._body += chunk
+
+        return False
+
+    def finish(self) -> bool:
+        try:
+            node: t.Any = json.loads(self._body)
+        except ValueError:
+            return False
+
+        for segment in self.path:
+            try:
+                node = node[segment]
+            except (KeyError, IndexError, TypeError):
+                return False
+
+        self.matched = node == self.value if self.has_value else True
+
+        return self.matched
+
+
+def _cap_timeout(timeout: float | None, deadline_at: float | None) -> float | None:
+    """Shorten `timeout` so it can't run past `deadline_at` (a `time.monotonic()` reading)."""
+    if deadline_at is None:
+        return timeout
+
+    ## Never 0, which would make sockets non-blocking instead of timing out
+    remaining: float = max(deadline_at - time.monotonic(), 0.001)
+
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _elapsed_ms(started: float, ended: float | None = None) -> float:
+    """Milliseconds between two `time.perf_counter()` readings (`ended` defaults to now)."""
+    return ((time.perf_counter() if ended is None else ended) - started) * 1000
+
+
+## One read buffer per thread, shared by every check the thread runs
+_BODY_BUFFERS: threading.local = threading.local()
+
+
+def _body_buffer() -> memoryview:
+    """The calling thread's reusable `BODY_CHUNK_SIZE` buffer, to read response bodies into."""
+    buffer: memoryview | None = getattr(_BODY_BUFFERS, "buffer", None)
+    if buffer is None:
+        buffer = _BODY_BUFFERS.buffer = memoryview(bytearray(BODY_CHUNK_SIZE))
+
+    return buffer
+
+
+def _connect_socket(
+    addrinfo: list[tuple],
+    timeout: t.Any = None,
+    source_address: tuple[str, int] | None = None,
+) -> socket.socket:
+    """Connect to the first reachable address from `getaddrinfo()` results."""
+    errors: list[OSError] = []
+
+    for family, sock_type, proto, _canonname, sockaddr in addrinfo:
+        sock: socket.socket | None = None
+        try:
+            sock = socket.socket(family, sock_type, proto)
+            ## http.client passes a sentinel object when no timeout was set
+            if timeout is None or isinstance(timeout, (int, float)):
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sockaddr)
+
+            return sock
+        except OSError as exc:
+            errors.append(exc)
+            if sock is not None:
+                sock.close()
+
+    raise errors[0] if errors else OSError("getaddrinfo returned no addresses")
+
+
+class DNSCache:
+    """Thread-safe, TTL-bounded cache of `getaddrinfo()` results.
+
+    Description:
+        Hostnames that don't exist (NXDOMAIN) are cached for `negative_ttl` seconds, so
+        checks of an invalid site fail fast with the same `gaierror` instead of asking
+        the resolver again.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_DNS_TTL,
+        negative_ttl: float = DEFAULT_DNS_NEGATIVE_TTL,
+    ) -> None:
+        self.ttl: float = ttl
+        self.negative_ttl: float = negative_ttl
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        ## (host, port) -> (expires_at, addrinfo list or (errno, strerror) of a failed lookup)
+        self._entries: dict[tuple[str, int], tuple[float, t.Any]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> list[tuple]:
+        """Return `socket.getaddrinfo()` results for a TCP connection to `host:port`."""
+        key: tuple[str, int] = (host, port)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                cached = entry[1]
+            else:
+                self.misses += 1
+                cached = None
+
+        if isinstance(cached, tuple):
+            raise gaierror(*cached)
+        if cached is not None:
+            return cached
+
+        try:
+            addrinfo: list[tuple] = socket.getaddrinfo(
+                host, port, 0, socket.SOCK_STREAM
+            )
+        except gaierror as exc:
+            ## Only cache "does not exist" answers, temporary resolver failures are retried
+            if exc.errno in _DNS_NEGATIVE_ERRNOS:
+                with self._lock:
+                    self._entries[key] = (
+                        time.monotonic() + self.negative_ttl,
+                        (exc.errno, exc.strerror),
+                    )
+            raise
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, addrinfo)
+
+        return addrinfo
+
+
+class _HTTPConnection(http.client.HTTPConnection):
+    """`HTTPConnection` that times each connection phase, resolving through a `DNSCache` if given.
+
+    Description:
+        `connect_timeout` bounds opening the socket (and the TLS handshake), `read_timeout`
+        bounds every socket operation after that. `None` waits indefinitely.
+    """
+
+    def __init__(
+        self, host: str, *, dns_cache: DNSCache | None = None, **kwargs: t.Any
+    ) -> None:
+        super().__init__(host, **kwargs)
+
+        self.dns_cache: DNSCache | None = dns_cache
+        ## Milliseconds spent in each phase of the last connect, i.e. {"dns": 1.2, "connect": 0.4}
+        self.phase_ms: dict[str, float] = {}
+        ## The server's verified certificate, for HTTPS connections
+        self.certificate: CertificateInfo | None = None
+
+        self.connect_timeout: float | None = None
+        self.read_timeout: float | None = None
+
+        self._create_connection = self._open_socket
+
+    def set_timeouts(self, connect: float | None, read: float | None) -> None:
+        """Set the timeouts for the next request, applying `read` now if already connected."""
+        self.connect_timeout = connect
+        self.read_timeout = read
+
+        if self.sock is not None:
+            self.sock.settimeout(read)
+
+    def send_prepared(self, spec: CheckSpec, headers: dict[str, str] | None = None) -> None:
+        """Send `spec`'s request, using its pre-serialized header lines plus any extra `headers`."""
+        self.putrequest(
+            spec.method, spec.target, skip_host=True, skip_accept_encoding=True
+        )
+        self._buffer.extend(spec.header_lines)
+        for key, value in (headers or {}).items():
+            self.putheader(key, value)
+        self.endheaders(spec.body)
+
+    def connect(self) -> None:
+        super().connect()
+
+        if self.sock is not None:
+            self.sock.settimeout(self.read_timeout)
+
+    def _open_socket(
+        self,
+        address: tuple[str, int],
+        timeout: t.Any = None,
+        source_address: tuple[str, int] | None = None,
+    ) -> socket.socket:
+        host, port = address
+        if self.connect_timeout is not None:
+            timeout = self.connect_timeout
+
+        started: float = time.perf_counter()
+        if self.dns_cache is not None:
+            addrinfo: list[tuple] = self.dns_cache.resolve(host, port)
+        else:
+            addrinfo = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        resolved: float = time.perf_counter()
+
+        sock: socket.socket = _connect_socket(addrinfo, timeout, source_address)
+        self.phase_ms = {
+            "dns": _elapsed_ms(started, resolved),
+            "connect": _elapsed_ms(resolved),
+        }
+
+        return sock
+
+
+@functools.lru_cache(maxsize=None)
+def get_ssl_context(
+    cafile: str | None = None, min_tls_version: str | None = None
+) -> ssl.SSLContext:
+    """Return the SSL context shared by every HTTPS check with this configuration.
+
+    Description:
+        Building a context loads the CA bundle, so it is only done once per distinct
+        `cafile`/`min_tls_version` pair for the life of the process.
+    """
+    context: ssl.SSLContext = ssl.create_default_context(cafile=cafile)
+    if min_tls_version:
+        context.minimum_version = TLS_VERSIONS[min_tls_version]
+
+    return context
+
+
+class TLSSessionCache:
+    """Thread-safe LRU store of the latest TLS session per host, used to resume handshakes."""
+
+    def __init__(self, max_size: int = DEFAULT_TLS_SESSION_CACHE_SIZE) -> None:
+        self.max_size: int = max_size
+        ## Number of handshakes that resumed a cached session
+        self.resumed: int = 0
+
+        self._sessions: collections.OrderedDict[t.Hashable, ssl.SSLSession] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: t.Hashable) -> ssl.SSLSession | None:
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+
+            return session
+
+    def put(
+        self, key: t.Hashable, session: ssl.SSLSession | None, resumed: bool = False
+    ) -> None:
+        """Store `session` as the host's latest, counting it in `resumed` if the handshake resumed one."""
+        with self._lock:
+            if resumed:
+                self.resumed += 1
+            if session is None:
+                return
+
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+
+
+## Process-wide TLS session cache, shared by every HTTPS connection by default
+TLS_SESSION_CACHE: TLSSessionCache = TLSSessionCache()
+
+
+class CertificateCache:
+    """Thread-safe cache of parsed TLS certificates per `(host, port)`, kept until each expires.
+
+    Description:
+        A cached certificate is only reused while the host presents the same one (compared
+        in DER form, which is cheap to fetch), so renewals are picked up on the next
+        handshake. Repeated checks of a host, i.e. every round of `--watch`, skip decoding
+        its certificate again. `hits`/`misses` count reused vs. parsed certificates.
+    """
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._entries: dict[t.Hashable, tuple[bytes, CertificateInfo]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, key: t.Hashable, tls: ssl.SSLSocket | ssl.SSLObject
+    ) -> CertificateInfo | None:
+        """The certificate presented on the `tls` connection to `key`, parsing it on first contact."""
+        der: bytes | None = tls.getpeercert(binary_form=True)
+        if not der:
+            return None
+
+        with self._lock:
+            entry: tuple[bytes, CertificateInfo] | None = self._entries.get(key)
+            if (
+                entry is not None
+                and entry[0] == der
+                and entry[1].not_after > datetime.datetime.now(datetime.timezone.utc)
+            ):
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+
+        certificate: CertificateInfo | None = CertificateInfo.from_peercert(
+            tls.getpeercert()
+        )
+        with self._lock:
+            if certificate is None:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = (der, certificate)
+
+        return certificate
+
+
+## Process-wide certificate cache, shared by every HTTPS connection & TLS probe by default
+CERTIFICATE_CACHE: CertificateCache = CertificateCache()
+
+
+class ValidatorCache:
+    """Thread-safe LRU store of the latest `ETag`/`Last-Modified` validators per URL.
+
+    Description:
+        Checks sharing a cache send them back as `If-None-Match`/`If-Modified-Since`, so a
+        server whose resource didn't change answers `304 Not Modified` without a body.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_VALIDATOR_CACHE_SIZE) -> None:
+        self.max_size: int = max_size
+
+        ## URL -> conditional request headers
+        self._validators: collections.OrderedDict[str, dict[str, str]] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> dict[str, str]:
+        """The conditional request headers for `url`, empty if it has no validators."""
+        with self._lock:
+            validators = self._validators.get(url)
+            if validators is None:
+                return {}
+
+            self._validators.move_to_end(url)
+            return validators
+
+    def update(self, url: str, headers: list[tuple[str, str]]) -> None:
+        """Remember the validators of a response from `url`, forgetting them if it had none."""
+        validators: dict[str, str] = {}
+        etag: str | None = _get_header(headers, "ETag")
+        if etag:
+            validators["If-None-Match"] = etag
+        last_modified: str | None = _get_header(headers, "Last-Modified")
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+
+        with self._lock:
+            if not validators:
+                self._validators.pop(url, None)
+                return
+
+            self._validators[url] = validators
+            self._validators.move_to_end(url)
+
+            while len(self._validators) > self.max_size:
+                self._validators.popitem(last=False)
+
+
+class MethodMemo:
+    """Thread-safe set of the hosts that reject `HEAD`, keyed by `(scheme, netloc)`.
+
+    Description:
+        `--method auto` checks of these hosts go straight to a ranged `GET`, instead of
+        having their `HEAD` rejected first on every check.
+    """
+
+    def __init__(self) -> None:
+        self._rejects_head: set[tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def rejects_head(self, key: tuple[str, str]) -> bool:
+        with self._lock:
+            return key in self._rejects_head
+
+    def remember_rejected(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            self._rejects_head.add(key)
+
+
+## Process-wide memo, shared by every `--method auto` check by default
+METHOD_MEMO: MethodMemo = MethodMemo()
+
+
+class _HTTPSConnection(_HTTPConnection, http.client.HTTPSConnection):
+    """`HTTPSConnection` that resumes TLS sessions from a `TLSSessionCache`, and keeps the server's certificate."""
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        context: ssl.SSLContext,
+        session_cache: TLSSessionCache | None = None,
+        cert_cache: CertificateCache | None = None,
+        **kwargs: t.Any,
+    ) -> None:
+        super().__init__(host, context=context, **kwargs)
+
+        self.session_cache: TLSSessionCache | None = session_cache
+        self.cert_cache: CertificateCache | None = cert_cache
+
+    @property
+    def _session_key(self) -> tuple[int, str, int]:
+        ## Sessions can only be resumed with the context that created them
+        return (id(self._context), self.host, self.port)
+
+    def connect(self) -> None:
+        http.client.HTTPConnection.connect(self)
+
+        server_hostname: str = self._tunnel_host or self.host
+        session = (
+            self.session_cache.get(self._session_key) if self.session_cache else None
+        )
+
+        handshake_started: float = time.perf_counter()
+        self.sock = self._context.wrap_socket(
+            self.sock, server_hostname=server_hostname, session=session
+        )
+        self.phase_ms["tls"] = _elapsed_ms(handshake_started)
+
+        self.certificate = (
+            self.cert_cache.lookup((self.host, self.port), self.sock)
+            if self.cert_cache is not None
+            else CertificateInfo.from_peercert(self.sock.getpeercert())
+        )
+
+        if self.session_cache is not None:
+            self.session_cache.put(
+                self._session_key, self.sock.session, resumed=self.sock.session_reused
+            )
+
+        self.sock.settimeout(self.read_timeout)
+
+    def close(self) -> None:
+        ## TLS 1.3 session tickets arrive after the handshake, keep the newest one for next time
+        if self.session_cache is not None and isinstance(self.sock, ssl.SSLSocket):
+            try:
+                self.session_cache.put(self._session_key, self.sock.session)
+            except (OSError, ValueError):
+                pass
+
+        super().close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of idle keep-alive connections, keyed by `(scheme, netloc)`.
+
+    Description:
+        `ConnectionManager` borrows a connection with `acquire()` and hands it back with
+        `release()` once the response has been fully read, so repeated checks of the same
+        host skip the TCP (and TLS) handshake. `hits`/`misses` count reused vs. new connections.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+    ) -> None:
+        if max_per_host < 1:
+            raise ValueError(f"max_per_host must be at least 1, got: {max_per_host}")
+
+        self.max_per_host: int = max_per_host
+        self.idle_timeout: float = idle_timeout
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._idle: dict[
+            tuple[str, str],
+            collections.deque[tuple[http.client.HTTPConnection, float]],
+        ] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self, key: tuple[str, str]
+    ) -> http.client.HTTPSConnection | http.client.HTTPConnection | None:
+        """Return a healthy idle connection for `key`, or `None` if the caller should open one."""
+        stale: list[http.client.HTTPConnection] = []
+
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = None
+
+            while idle:
+                ## Most recently used first, it is the least likely to have been dropped
+                candidate, released_at = idle.pop()
+                if (
+                    time.monotonic() - released_at <= self.idle_timeout
+                    and self._is_healthy(candidate)
+                ):
+                    connection = candidate
+                    break
+
+                stale.append(candidate)
+
+            if connection is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        for candidate in stale:
+            candidate.close()
+
+        return connection
+
+    def release(
+        self,
+        key: tuple[str, str],
+        connection: http.client.HTTPSConnection | http.client.HTTPConnection,
+    ) -> None:
+        """Return a connection to the pool, closing it if it is unusable or the pool is full."""
+        if connection.sock is None:
+            connection.close()
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(key, collections.deque())
+            if len(idle) < self.max_per_host:
+                idle.append((connection, time.monotonic()))
+                return
+
+        connection.close()
+
+    def close(self) -> None:
+        """Close every idle connection in the pool."""
+        with self._lock:
+            idle_connections = [c for idle in self._idle.values() for c, _ in idle]
+            self._idle.clear()
+
+        for connection in idle_connections:
+            connection.close()
+
+    @staticmethod
+    def _is_healthy(connection: http.client.HTTPConnection) -> bool:
+        """Check an idle connection's socket was not closed by the server while pooled."""
+        sock = connection.sock
+        if sock is None:
+            return False
+
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+
+        ## Nothing to read on an idle keep-alive socket means it is still open
+        if not readable:
+            return True
+
+        timeout = sock.gettimeout()
+        try:
+            sock.setblocking(False)
+            ## EOF or unsolicited data both mean the connection can't be reused
+            sock.recv(1)
+            return False
+        except (ssl.SSLWantReadError, BlockingIOError):
+            ## Only TLS housekeeping (i.e. session tickets) was pending
+            return True
+        except OSError:
+            return False
+        finally:
+            try:
+                sock.settimeout(timeout)
+            except OSError:
+                pass
+
+
+class ConnectionManager(_BaseConnectionManager):
+    """Custom context manager for HTTP/HTTPS connections.
+
+    Description:
+        When a `ConnectionPool` is given, connections are borrowed from & returned to the pool
+        instead of being opened and closed for every request. HTTPS connections share one
+        `ssl.SSLContext` and resume TLS sessions through `TLS_SESSION_CACHE`. Hostnames are
+        resolved through `dns_cache`, if given.
+
+        `deadline` caps the whole `send_request()` call, including retries & redirects, by
+        shortening socket timeouts to the time remaining and raising `DeadlineExceeded`.
+
+        Retries wait according to `retry_policy`, defaulting to exponential backoff with full
+        jitter starting from `send_request()`'s `sleep`.
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        headers: dict | None = None,
+        body: t.Union[dict, str] | None = None,
+        pool: ConnectionPool | None = None,
+        ssl_context: ssl.SSLContext | None = None,
+        dns_cache: DNSCache | None = None,
+        connect_timeout: float | None = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float | None = DEFAULT_READ_TIMEOUT,
+        deadline: float | None = None,
+        retry_policy: RetryPolicy | None = None,
+        max_redirects: int = DEFAULT_MAX_REDIRECTS,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        expect: t.Sequence[BodyMatcher] | None = None,
+        spec: CheckSpec | None = None,
+        validators: ValidatorCache | None = None,
+    ) -> None:
+        super().__init__(
+            url=url,
+            headers=headers,
+            body=body,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            deadline=deadline,
+            retry_policy=retry_policy,
+            max_redirects=max_redirects,
+            max_body_bytes=max_body_bytes,
+            expect=expect,
+            spec=spec,
+            validators=validators,
+        )
+
+        self.pool: ConnectionPool | None = pool
+        self.dns_cache: DNSCache | None = dns_cache
+        self.ssl_context: ssl.SSLContext = ssl_context or get_ssl_context()
+        self.tls_sessions: TLSSessionCache = TLS_SESSION_CACHE
+        self.certificates: CertificateCache = CERTIFICATE_CACHE
+
+        self.connection = None
+        ## Pool key of the current connection, and whether it came from the pool
+        self._connection_key: tuple[str, str] | None = None
+        self._reused: bool = False
+
+    def __enter__(self) -> http.client.HTTPSConnection | http.client.HTTPConnection:
+        return self._acquire_connection()
+
+    def _acquire_connection(
+        self,
+    ) -> http.client.HTTPSConnection | http.client.HTTPConnection:
+        """Borrow a connection to the current URL's host from the pool, or open a new one."""
+        self._connection_key = self._connection_key_of(self.parsed_url)
+        self._reusable = False
+        self._reused = False
+
+        if self.pool is not None:
+            self.connection = self.pool.acquire(self._connection_key)
+            self._reused = self.connection is not None
+
+        if self.connection is None:
+            if self.parsed_url.scheme == "https":
+                self.connection = _HTTPSConnection(
+                    self.parsed_url.netloc,
+                    context=self.ssl_context,
+                    session_cache=self.tls_sessions,
+                    cert_cache=self.certificates,
+                    dns_cache=self.dns_cache,
+                )
+            else:
+                self.connection = _HTTPConnection(
+                    self.parsed_url.netloc, dns_cache=self.dns_cache
+                )
+        return self.connection
+
+    def __exit__(self, exc_type, exc_val, traceback) -> bool:
+        self._release_connection()
+
+        if exc_val:
+            msg = f"({exc_type}) {exc_val}"
+            log.error(msg)
+
+            self.trace = traceback
+
+            return False
+
+        return True
+
+    def _release_connection(self) -> None:
+        """Hand the connection back to the pool if it can be reused, otherwise close it."""
+        if self.connection:
+            if self.pool is not None and self._reusable:
+                self.pool.release(self._connection_key, self.connection)
+            else:
+                self.connection.close()
+
+        self.connection = None
+        self._reusable = False
+
+    def _send(
+        self, method: str, conditional: dict[str, str] | None = None
+    ) -> http.client.HTTPResponse:
+        """Send the request & return the response, replacing a pooled connection the server dropped."""
+        try:
+            prepared: CheckSpec | None = self._prepared(method)
+            if prepared is not None:
+                self.connection.send_prepared(prepared, conditional)
+            else:
+                self.connection.request(
+                    method=method,
+                    url=self._request_target(),
+                    body=self.body,
+                    headers={**self.headers, **conditional}
+                    if conditional
+                    else self.headers,
+                )
+            return self.connection.getresponse()
+        except (
+            http.client.RemoteDisconnected,
+            ConnectionResetError,
+            BrokenPipeError,
+        ):
+            if not self._reused:
+                raise
+
+            ## The server closed the pooled connection while it sat idle, try once more on a new socket
+            self.logger.debug(
+                f"Pooled connection to {self.parsed_url.netloc} was closed, reconnecting"
+            )
+            self._reused = False
+            self.connection.close()
+
+            return self._send(method, conditional)
+
+    def _read_body(
+        self,
+        response: http.client.HTTPResponse,
+        matchers: t.Sequence[BodyMatcher] = (),
+    ) -> int:
+        """Read the response body in chunks, up to `max_body_bytes`, returning the bytes read.
+
+        Description:
+            Chunks are read into this thread's reusable buffer and fed to `matchers`, so memory
+            use doesn't grow with the size of the page. Reading stops early once every matcher
+            matched. The connection is marked reusable only when the whole body was read and
+            the server didn't ask to close it.
+        """
+        buffer: memoryview = _body_buffer()
+        read: int = 0
+        pending: list[BodyMatcher] = list(matchers)
+
+        while read < self.max_body_bytes:
+            count: int = response.readinto(
+                buffer[: min(len(buffer), self.max_body_bytes - read)]
+            )
+            if not count:
+                break
+            read += count
+
+            if matchers:
+                pending = [matcher for matcher in pending if not matcher.feed(buffer[:count])]
+                if not pending:
+                    break
+
+        ## `http.client` silently ends a body the server cut short, leaving `length` unread
+        if response.isclosed() and response.length:
+            raise http.client.IncompleteRead(b"", response.length)
+
+        ## A response is closed once its body was read to the end
+        self._reusable = response.isclosed() and not response.will_close
+        if not response.isclosed():
+            self.logger.debug(
+                f"Stopped reading {self.parsed_url.geturl()} after {read} bytes, closing the connection"
+            )
+
+        return read
+
+    def send_request(
+        self, method: str, sleep: float, retries: int
+    ) -> dict[str, t.Any]:
+        if method == AUTO_METHOD:
+            return self._send_auto(self._policy(sleep), retries, self._deadline_at())
+
+        self.sent_method = method
+        return self._send_request(
+            method, self._policy(sleep), retries, self._deadline_at()
+        )
+
+    def _send_auto(
+        self, policy: RetryPolicy, retries: int, deadline_at: float | None
+    ) -> dict[str, t.Any]:
+        """Send a `HEAD`, falling back to a ranged `GET` if the host rejects it, or is known to."""
+        url: urllib.parse.ParseResult | t.Any = self.parsed_url
+        ## One start time, so `total_ms` covers a rejected `HEAD` too
+        check_started: float = time.perf_counter()
+
+        if self._start_auto(url) == "HEAD":
+            res: dict[str, t.Any] = self._send_request(
+                "HEAD", policy, retries, deadline_at, check_started
+            )
+            if not self._head_rejected(res, url):
+                return res
+
+        return self._send_request("GET", policy, retries, deadline_at, check_started)
+
+    def _send_request(
+        self,
+        method: str,
+        policy: RetryPolicy,
+        retries: int,
+        deadline_at: float | None,
+        check_started: float | None = None,
+    ) -> dict[str, t.Any]:
+        log.info(f"Sending {method} request to URL: {self.parsed_url.geturl()}")
+        if check_started is None:
+            check_started = time.perf_counter()
+
+        ## URLs followed so far, and (method, URL) pairs requested, to catch redirect loops
+        redirects: list[str] = []
+        visited: set[tuple[str, str]] = {(method, self.parsed_url.geturl())}
+        attempt: int = 0
+        ## Kept as the cause of the final error, i.e. to tell timeouts from refused connections
+        last_error: Exception | None = None
+
+        with (
+            self
+        ):  # Use the context manager to open and automatically close the connection
+            while attempt < retries:
+                self.attempts = attempt + 1
+                try:
+                    self._check_deadline(deadline_at)
+                    self.connection.set_timeouts(
+                        connect=_cap_timeout(self.connect_timeout, deadline_at),
+                        read=_cap_timeout(self.read_timeout, deadline_at),
+                    )
+
+                    ## Phases left unset by this request (i.e. reused connection) stay None
+                    self.connection.phase_ms = {}
+                    ## Connect up front (`http.client` would inside `request()`), to keep it out of the TTFB
+                    if self.connection.sock is None:
+                        self.connection.connect()
+                    request_started: float = time.perf_counter()
+
+                    # Send the request with the specified method (HEAD, GET, etc.)
+                    conditional: dict[str, str] = self._conditional_headers(method)
+                    response: http.client.HTTPResponse = self._send(method, conditional)
+                    ttfb_ms: float = _elapsed_ms(request_started)
+                    log.info(f"Response: [{response.status}]")
+
+                    # Extract the HTTP status code, reason phrase, and headers
+                    status_code: int = response.status
+                    reason: str = response.reason
+                    headers: list[tuple[str, str]] = response.getheaders()
+                    location: str | None = response.getheader("Location")
+                    will_redirect: bool = (
+                        status_code in REDIRECT_CODES
+                        and location is not None
+                        and self.max_redirects > 0
+                    )
+
+                    ## A connection can only be reused once the response is fully read
+                    body_bytes: int = 0
+                    failed_expectations: list[str] = []
+                    self._reusable = False
+                    if self.expect and not will_redirect:
+                        matchers: list[BodyMatcher] = [
+                            matcher.fresh() for matcher in self.expect
+                        ]
+                        body_bytes = self._read_body(response, matchers)
+                        failed_expectations = [
+                            str(matcher) for matcher in matchers if not matcher.finish()
+                        ]
+                    elif self.pool is not None or will_redirect:
+                        body_bytes = self._read_body(response)
+
+                    phase_ms: dict[str, float] = self.connection.phase_ms
+                    timings = Timings(
+                        dns_ms=phase_ms.get("dns"),
+                        connect_ms=phase_ms.get("connect"),
+                        tls_ms=phase_ms.get("tls"),
+                        ttfb_ms=ttfb_ms,
+                        total_ms=_elapsed_ms(check_started),
+                    )
+
+                    ## Back off & retry rate-limited/overloaded responses, if time & budget allow
+                    if status_code in policy.retry_statuses and attempt < retries - 1:
+                        retry_delay: float | None = self._retry_delay(
+                            policy,
+                            attempt,
+                            deadline_at,
+                            retry_after=parse_retry_after(
+                                response.getheader("Retry-After")
+                            ),
+                        )
+                        if retry_delay is not None:
+                            log.info(
+                                f"Got {status_code} {reason}, retrying in {retry_delay:.2f} seconds..."
+                            )
+                            if not self._reusable:
+                                self.connection.close()
+                            attempt += 1
+                            time.sleep(retry_delay)
+                            continue
+
+                    # Handle redirects (301, 302, 303, 307, 308)
+                    if will_redirect:
+                        log.info(f"Redirected: {status_code} {reason}")
+                        previous_key: tuple[str, str] = self._connection_key
+                        method = self._redirect(
+                            status_code, method, location, redirects, visited
+                        )
+
+                        ## Keep using the connection if the redirect stays on the same host
+                        if self._connection_key_of(self.parsed_url) != previous_key:
+                            self._release_connection()
+                            self._acquire_connection()
+                        elif not self._reusable:
+                            self.connection.close()
+                        continue
+
+                    self._remember_validators(method, status_code, headers)
+
+                    return {
+                        "status_code": status_code,
+                        "reason": reason,
+                        "headers": headers,
+                        "timings": timings,
+                        "redirects": redirects,
+                        "body_bytes": body_bytes,
+                        "failed_expectations": failed_expectations,
+                        "certificate": self.connection.certificate,
+                        "revalidated": status_code == 304 and bool(conditional),
+                    }
+
+                except (DeadlineExceeded, RedirectError):
+                    raise
+
+                except gaierror as invalid_site:
+                    msg = f"({type(invalid_site)}) Invalid site address: '{self.parsed_url.geturl()}'."
+                    log.error(msg)
+                    raise invalid_site
+
+                except Exception as exc:
+                    msg = f"({type(exc)}) Error connecting to URL: {self.parsed_url.geturl()}. Attempt {attempt + 1}/{retries} failed. Details: {exc}"
+                    log.error(msg)
+                    last_error = exc
+
+                    ## Don't reuse a connection in an unknown state, the next attempt reconnects
+                    self._reusable = False
+                    self.connection.close()
+
+                    # If this was not the last attempt, back off before trying again
+                    attempt += 1
+                    if attempt < retries:
+                        delay: float | None = self._error_delay(
+                            policy, attempt - 1, deadline_at
+                        )
+                        if delay is None:
+                            break
+
+                        log.info(f"Retrying in {delay:.2f} seconds...")
+                        time.sleep(delay)
+
+            # If all retries failed, raise an exception
+            raise Exception(
+                f"Failed to connect to {self.parsed_url.geturl()} after {retries} attempts."
+            ) from last_error
+
+    def probe(self, tls: bool, sleep: float, retries: int) -> dict[str, t.Any]:
+        """Connect to the site (completing a TLS handshake with `tls`) without sending a request.
+
+        Description:
+            Returns the connect `timings`, and for TLS the verified `certificate`. TLS probes never resume a cached session, so every probe verifies
+            the certificate. Retries, timeouts & the deadline work as in `send_request()`.
+        """
+        policy: RetryPolicy = self._policy(sleep)
+        deadline_at: float | None = self._deadline_at()
+        host, port = self._probe_address(tls)
+        log.info(f"Probing {'TLS' if tls else 'TCP'} connection to {host}:{port}")
+        check_started: float = time.perf_counter()
+
+        attempt: int = 0
+        last_error: Exception | None = None
+
+        while attempt < retries:
+            self.attempts = attempt + 1
+            self._check_deadline(deadline_at)
+
+            connection: _HTTPConnection = (
+                _HTTPSConnection(
+                    host,
+                    port=port,
+                    context=self.ssl_context,
+                    cert_cache=self.certificates,
+                    dns_cache=self.dns_cache,
+                )
+                if tls
+                else _HTTPConnection(host, port=port, dns_cache=self.dns_cache)
+            )
+            connection.set_timeouts(
+                connect=_cap_timeout(self.connect_timeout, deadline_at),
+                read=_cap_timeout(self.read_timeout, deadline_at),
+            )
+
+            try:
+                connection.connect()
+                connection.close()
+
+                return {
+                    "timings": Timings(
+                        dns_ms=connection.phase_ms.get("dns"),
+                        connect_ms=connection.phase_ms.get("connect"),
+                        tls_ms=connection.phase_ms.get("tls"),
+                        total_ms=_elapsed_ms(check_started),
+                    ),
+                    "certificate": connection.certificate,
+                }
+
+            except gaierror as invalid_site:
+                connection.close()
+                msg = f"({type(invalid_site)}) Invalid site address: '{self.parsed_url.geturl()}'."
+                log.error(msg)
+                raise invalid_site
+
+            except Exception as exc:
+                connection.close()
+                msg = f"({type(exc)}) Error probing {host}:{port}. Attempt {attempt + 1}/{retries} failed. Details: {exc}"
+                log.error(msg)
+                last_error = exc
+
+                attempt += 1
+                if attempt < retries:
+                    delay: float | None = self._error_delay(policy, attempt - 1, deadline_at)
+                    if delay is None:
+                        break
+
+                    log.info(f"Retrying in {delay:.2f} seconds...")
+                    time.sleep(delay)
+
+        raise Exception(
+            f"Failed to connect to {host}:{port} after {retries} attempts."
+        ) from last_error
+
+
+class AsyncConnectionManager(_BaseConnectionManager):
+    """Asyncio counterpart of `ConnectionManager`, built on `asyncio` streams.
+
+    Description:
+        Speaks just enough HTTP/1.1 to check availability, so many checks can share one
+        event loop. `send_request()` returns the same dict as `ConnectionManager.send_request()`.
+        `connect_timeout` bounds connecting (and the TLS handshake), `read_timeout` bounds
+        sending the request & reading the response headers.
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        headers: dict | None = None,
+        body: t.Union[dict, str] | None = None,
+        ssl_context: ssl.SSLContext | None = None,
+        dns_cache: DNSCache | None = None,
+        connect_timeout: float | None = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float | None = DEFAULT_READ_TIMEOUT,
+        deadline: float | None = None,
+        retry_policy: RetryPolicy | None = None,
+        max_redirects: int = DEFAULT_MAX_REDIRECTS,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        expect: t.Sequence[BodyMatcher] | None = None,
+        spec: CheckSpec | None = None,
+        validators: ValidatorCache | None = None,
+    ) -> None:
+        super().__init__(
+            url=url,
+            headers=headers,
+            body=body,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            deadline=deadline,
+            retry_policy=retry_policy,
+            max_redirects=max_redirects,
+            max_body_bytes=max_body_bytes,
+            expect=expect,
+            spec=spec,
+            validators=validators,
+        )
+
+        self.ssl_context: ssl.SSLContext = ssl_context or get_ssl_context()
+        self.dns_cache: DNSCache | None = dns_cache
+        self.certificates: CertificateCache = CERTIFICATE_CACHE
+
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        ## Whether the last response was HTTP/1.0, which closes connections by default
+        self._http10: bool = False
+        ## Milliseconds spent in each phase of the last connect, i.e. {"dns": 1.2, "connect": 0.4}
+        self.phase_ms: dict[str, float] = {}
+        ## The server's verified certificate, for HTTPS connections
+        self.certificate: CertificateInfo | None = None
+
+    async def __aenter__(self) -> AsyncConnectionManager:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, traceback) -> bool:
+        await self._close()
+
+        if exc_val:
+            msg = f"({exc_type}) {exc_val}"
+            log.error(msg)
+
+            self.trace = traceback
+
+            return False
+
+        return True
+
+    async def _connect(self, tls: bool | None = None, port: int | None = None) -> None:
+        """Open a connection, with TLS if `tls` (default: for `https://` sites), to `port` (default: the site's)."""
+        is_https: bool = self.parsed_url.scheme == "https" if tls is None else tls
+        host: str = self.parsed_url.hostname
+        port = port or self.parsed_url.port or (443 if is_https else 80)
+        self.certificate = None
+
+        started: float = time.perf_counter()
+        if self.dns_cache is not None:
+            ## Cache misses call the blocking resolver, keep it off the event loop
+            addrinfo: list[tuple] = await asyncio.get_running_loop().run_in_executor(
+                None, self.dns_cache.resolve, host, port
+            )
+        else:
+            addrinfo = await asyncio.get_running_loop().getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+        resolved: float = time.perf_counter()
+
+        errors: list[OSError] = []
+        for *_, sockaddr in addrinfo:
+            try:
+                self.reader, self.writer = await asyncio.open_connection(
+                    sockaddr[0], port
+                )
+                break
+            except OSError as exc:
+                errors.append(exc)
+        else:
+            raise errors[0] if errors else OSError("getaddrinfo returned no addresses")
+
+        self.phase_ms = {
+            "dns": _elapsed_ms(started, resolved),
+            "connect": _elapsed_ms(resolved),
+        }
+
+        if is_https:
+            handshake_started: float = time.perf_counter()
+            try:
+                await self.writer.start_tls(self.ssl_context, server_hostname=host)
+            except BaseException:
+                ## The stream is never told a failed (or timed out) handshake closed it, so
+                #  `wait_closed()` would hang: drop the socket instead
+                self.writer.transport.abort()
+                self.reader = None
+                self.writer = None
+                raise
+            self.phase_ms["tls"] = _elapsed_ms(handshake_started)
+
+            self.certificate = self.certificates.lookup(
+                (host, port), self.writer.get_extra_info("ssl_object")
+            )
+
+    async def _close(self) -> None:
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                ## The peer may already have dropped the connection
+                pass
+
+        self.reader = None
+        self.writer = None
+        self._reusable = False
+
+    def _build_request(
+        self, method: str, conditional: dict[str, str] | None = None
+    ) -> bytes:
+        """Serialize the request (plus any `conditional` headers) the same way `http.client` would."""
+        prepared: CheckSpec | None = self._prepared(method)
+        if prepared is not None:
+            if not conditional:
+                return prepared.request_head + (prepared.body or b"")
+
+            ## Insert the extra header lines before the blank line ending the head
+            extra: bytes = "".join(
+                f"{key}: {value}\r\n" for key, value in conditional.items()
+            ).encode("latin-1")
+
+            return prepared.request_head[:-2] + extra + b"\r\n" + (prepared.body or b"")
+
+        headers: dict[str, str] = {
+            "Host": self.parsed_url.netloc,
+            "Accept-Encoding": "identity",
+        }
+        headers.update(self.headers)
+        headers.update(conditional or {})
+
+        if self.body is not None:
+            headers["Content-Length"] = str(len(self.body))
+        elif method in ("POST", "PUT", "PATCH"):
+            headers["Content-Length"] = "0"
+
+        lines: list[str] = [f"{method} {self._request_target()} HTTP/1.1"]
+        lines.extend(f"{key}: {value}" for key, value in headers.items())
+
+        request: bytes = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        return request + (self.body or b"")
+
+    async def _read_response_head(self) -> tuple[int, str, list[tuple[str, str]]]:
+        """Read the status line & headers, skipping any interim `1xx` responses."""
+        while True:
+            status_line: str = (await self.reader.readline()).decode("latin-1")
+            if not status_line:
+                raise http.client.RemoteDisconnected(
+                    "Remote end closed connection without response"
+                )
+
+            try:
+                version, status, *reason = status_line.strip().split(" ", 2)
+                status_code: int = int(status)
+            except ValueError:
+                raise http.client.BadStatusLine(status_line)
+            self._http10 = version == "HTTP/1.0"
+
+            headers: list[tuple[str, str]] = []
+            while True:
+                line: str = (await self.reader.readline()).decode("latin-1")
+                if line in ("\r\n", "\n", ""):
+                    break
+
+                key, _, value = line.partition(":")
+                headers.append((key.strip(), value.strip()))
+
+            if status_code >= 200 or status_code == 101:
+                return status_code, (reason[0] if reason else ""), headers
+
+    async def _exchange(
+        self, method: str, conditional: dict[str, str] | None = None
+    ) -> tuple[int, str, list[tuple[str, str]]]:
+        """Send the request and read the response's status line & headers."""
+        self.writer.write(self._build_request(method, conditional))
+        await self.writer.drain()
+
+        return await self._read_response_head()
+
+    async def _iter_body(
+        self, chunked: bool, length: int | None, limit: int
+    ) -> t.AsyncIterator[bytes]:
+        """Yield the response body in chunks of at most `BODY_CHUNK_SIZE`, stopping after `limit` bytes.
+
+        Description:
+            A body that's neither `chunked` nor has a `length` ends when the server closes
+            the connection.
+        """
+        if chunked:
+            while True:
+                size: int = int((await self.reader.readline()).split(b";", 1)[0], 16)
+                if size == 0:
+                    ## Skip any trailers, up to the blank line ending the body
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+
+                while size:
+                    chunk: bytes = await self.reader.read(
+                        min(size, BODY_CHUNK_SIZE, limit)
+                    )
+                    if not chunk:
+                        raise asyncio.IncompleteReadError(b"", size)
+                    size -= len(chunk)
+                    limit -= len(chunk)
+                    yield chunk
+
+                ## Each chunk's data ends with a CRLF
+                await self.reader.readexactly(2)
+
+        while length is None or length > 0:
+            chunk = await self.reader.read(
+                min(BODY_CHUNK_SIZE, limit, length if length is not None else limit)
+            )
+            if not chunk:
+                if length is None:
+                    return
+                raise asyncio.IncompleteReadError(b"", length)
+
+            if length is not None:
+                length -= len(chunk)
+            limit -= len(chunk)
+            yield chunk
+
+    async def _read_body(
+        self,
+        method: str,
+        status_code: int,
+        headers: list[tuple[str, str]],
+        matchers: t.Sequence[BodyMatcher] = (),
+    ) -> int:
+        """Read the response body in chunks, up to `max_body_bytes`, returning the bytes read.
+
+        Description:
+            Chunks are fed to `matchers` and discarded as they're read, stopping early once
+            every matcher matched. The connection is marked reusable only when the whole body
+            was read and the server didn't ask to close it.
+        """
+        connection: str = (_get_header(headers, "Connection") or "").lower()
+        keep_alive: bool = (
+            connection == "keep-alive" if self._http10 else connection != "close"
+        )
+        self._reusable = False
+
+        if method == "HEAD" or status_code in (204, 304):
+            self._reusable = keep_alive
+            return 0
+
+        chunked: bool = (
+            "chunked" in (_get_header(headers, "Transfer-Encoding") or "").lower()
+        )
+        content_length: str | None = _get_header(headers, "Content-Length")
+        length: int | None = (
+            int(content_length) if content_length is not None and not chunked else None
+        )
+
+        read: int = 0
+        pending: list[BodyMatcher] = list(matchers)
+        if self.max_body_bytes > 0:
+            async for chunk in self._iter_body(chunked, length, self.max_body_bytes):
+                read += len(chunk)
+                if matchers:
+                    pending = [matcher for matcher in pending if not matcher.feed(chunk)]
+                    if not pending:
+                        break
+                if read >= self.max_body_bytes:
+                    break
+            else:
+                ## A body without a length only ends when the connection closes
+                self._reusable = keep_alive and (chunked or length is not None)
+
+        if not self._reusable:
+            self.logger.debug(
+                f"Stopped reading {self.parsed_url.geturl()} after {read} bytes, closing the connection"
+            )
+
+        return read
+
+    async def send_request(
+        self, method: str, sleep: float, retries: int
+    ) -> dict[str, t.Any]:
+        if method == AUTO_METHOD:
+            return await self._send_auto(
+                self._policy(sleep), retries, self._deadline_at()
+            )
+
+        self.sent_method = method
+        return await self._send_request(
+            method, self._policy(sleep), retries, self._deadline_at()
+        )
+
+    async def _send_auto(
+        self, policy: RetryPolicy, retries: int, deadline_at: float | None
+    ) -> dict[str, t.Any]:
+        """Asyncio version of `ConnectionManager._send_auto()`."""
+        url: urllib.parse.ParseResult | t.Any = self.parsed_url
+        ## One start time, so `total_ms` covers a rejected `HEAD` too
+        check_started: float = time.perf_counter()
+
+        if self._start_auto(url) == "HEAD":
+            res: dict[str, t.Any] = await self._send_request(
+                "HEAD", policy, retries, deadline_at, check_started
+            )
+            if not self._head_rejected(res, url):
+                return res
+
+        return await self._send_request(
+            "GET", policy, retries, deadline_at, check_started
+        )
+
+    async def _send_request(
+        self,
+        method: str,
+        policy: RetryPolicy,
+        retries: int,
+        deadline_at: float | None,
+        check_started: float | None = None,
+    ) -> dict[str, t.Any]:
+        log.info(f"Sending {method} request to URL: {self.parsed_url.geturl()}")
+        if check_started is None:
+            check_started = time.perf_counter()
+
+        ## URLs followed so far, and (method, URL) pairs requested, to catch redirect loops
+        redirects: list[str] = []
+        visited: set[tuple[str, str]] = {(method, self.parsed_url.geturl())}
+        attempt: int = 0
+        ## Kept as the cause of the final error, i.e. to tell timeouts from refused connections
+        last_error: Exception | None = None
+
+        async with self:  # Close the connection when the request finishes
+            while attempt < retries:
+                self.attempts = attempt + 1
+                try:
+                    self._check_deadline(deadline_at)
+
+                    self.phase_ms = {}
+                    if self.writer is None:
+                        await asyncio.wait_for(
+                            self._connect(),
+                            _cap_timeout(self.connect_timeout, deadline_at),
+                        )
+
+                    request_started: float = time.perf_counter()
+                    conditional: dict[str, str] = self._conditional_headers(method)
+                    status_code, reason, headers = await asyncio.wait_for(
+                        self._exchange(method, conditional),
+                        _cap_timeout(self.read_timeout, deadline_at),
+                    )
+                    ttfb_ms: float = _elapsed_ms(request_started)
+                    log.info(f"Response: [{status_code}]")
+
+                    timings = Timings(
+                        dns_ms=self.phase_ms.get("dns"),
+                        connect_ms=self.phase_ms.get("connect"),
+                        tls_ms=self.phase_ms.get("tls"),
+                        ttfb_ms=ttfb_ms,
+                        total_ms=_elapsed_ms(check_started),
+                    )
+
+                    ## Back off & retry rate-limited/overloaded responses, if time & budget allow
+                    if status_code in policy.retry_statuses and attempt < retries - 1:
+                        retry_delay: float | None = self._retry_delay(
+                            policy,
+                            attempt,
+                            deadline_at,
+                            retry_after=parse_retry_after(
+                                _get_header(headers, "Retry-After")
+                            ),
+                        )
+                        if retry_delay is not None:
+                            log.info(
+                                f"Got {status_code} {reason}, retrying in {retry_delay:.2f} seconds..."
+                            )
+                            await self._close()
+                            attempt += 1
+                            await asyncio.sleep(retry_delay)
+                            continue
+
+                    # Handle redirects (301, 302, 303, 307, 308)
+                    location: str | None = _get_header(headers, "Location")
+                    if (
+                        status_code in REDIRECT_CODES
+                        and location is not None
+                        and self.max_redirects > 0
+                    ):
+                        log.info(f"Redirected: {status_code} {reason}")
+                        ## Read the redirect's body so the connection can carry the next hop
+                        await asyncio.wait_for(
+                            self._read_body(method, status_code, headers),
+                            _cap_timeout(self.read_timeout, deadline_at),
+                        )
+                        previous_url: urllib.parse.ParseResult = self.parsed_url
+                        method = self._redirect(
+                            status_code, method, location, redirects, visited
+                        )
+
+                        ## Keep using the connection if the redirect stays on the same host
+                        if not self._reusable or self._connection_key_of(
+                            self.parsed_url
+                        ) != self._connection_key_of(previous_url):
+                            await self._close()
+                        continue
+
+                    ## The connection closes with the check, so the final body is only read to check it
+                    body_bytes: int = 0
+                    failed_expectations: list[str] = []
+                    if self.expect:
+                        matchers: list[BodyMatcher] = [
+                            matcher.fresh() for matcher in self.expect
+                        ]
+                        body_bytes = await asyncio.wait_for(
+                            self._read_body(method, status_code, headers, matchers),
+                            _cap_timeout(self.read_timeout, deadline_at),
+                        )
+                        failed_expectations = [
+                            str(matcher) for matcher in matchers if not matcher.finish()
+                        ]
+                        timings.total_ms = _elapsed_ms(check_started)
+
+                    self._remember_validators(method, status_code, headers)
+
+                    return {
+                        "status_code": status_code,
+                        "reason": reason,
+                        "headers": headers,
+                        "timings": timings,
+                        "redirects": redirects,
+                        "body_bytes": body_bytes,
+                        "failed_expectations": failed_expectations,
+                        "certificate": self.certificate,
+                        "revalidated": status_code == 304 and bool(conditional),
+                    }
+
+                except (DeadlineExceeded, RedirectError):
+                    raise
+
+                except gaierror as invalid_site:
+                    msg = f"({type(invalid_site)}) Invalid site address: '{self.parsed_url.geturl()}'."
+                    log.error(msg)
+                    raise invalid_site
+
+                except Exception as exc:
+                    msg = f"({type(exc)}) Error connecting to URL: {self.parsed_url.geturl()}. Attempt {attempt + 1}/{retries} failed. Details: {exc}"
+                    log.error(msg)
+                    last_error = exc
+
+                    ## Drop the (possibly half-used) connection so the next attempt starts fresh
+                    await self._close()
+
+                    # If this was not the last attempt, back off before trying again
+                    attempt += 1
+                    if attempt < retries:
+                        delay: float | None = self._error_delay(
+                            policy, attempt - 1, deadline_at
+                        )
+                        if delay is None:
+                            break
+
+                        log.info(f"Retrying in {delay:.2f} seconds...")
+                        await asyncio.sleep(delay)
+
+            # If all retries failed, raise an exception
+            raise Exception(
+                f"Failed to connect to {self.parsed_url.geturl()} after {retries} attempts."
+            ) from last_error
+
+    async def probe(self, tls: bool, sleep: float, retries: int) -> dict[str, t.Any]:
+        """Asyncio version of `ConnectionManager.probe()`."""
+        policy: RetryPolicy = self._policy(sleep)
+        deadline_at: float | None = self._deadline_at()
+        host, port = self._probe_address(tls)
+        log.info(f"Probing {'TLS' if tls else 'TCP'} connection to {host}:{port}")
+        check_started: float = time.perf_counter()
+
+        attempt: int = 0
+        last_error: Exception | None = None
+
+        async with self:  # Close the connection when the probe finishes
+            while attempt < retries:
+                self.attempts = attempt + 1
+                try:
+                    self._check_deadline(deadline_at)
+
+                    self.phase_ms = {}
+                    await asyncio.wait_for(
+                        self._connect(tls=tls, port=port),
+                        _cap_timeout(self.connect_timeout, deadline_at),
+                    )
+
+                    return {
+                        "timings": Timings(
+                            dns_ms=self.phase_ms.get("dns"),
+                            connect_ms=self.phase_ms.get("connect"),
+                            tls_ms=self.phase_ms.get("tls"),
+                            total_ms=_elapsed_ms(check_started),
+                        ),
+                        "certificate": self.certificate,
+                    }
+
+                except DeadlineExceeded:
+                    raise
+
+                except gaierror as invalid_site:
+                    msg = f"({type(invalid_site)}) Invalid site address: '{self.parsed_url.geturl()}'."
+                    log.error(msg)
+                    raise invalid_site
+
+                except Exception as exc:
+                    msg = f"({type(exc)}) Error probing {host}:{port}. Attempt {attempt + 1}/{retries} failed. Details: {exc}"
+                    log.error(msg)
+                    last_error = exc
+
+                    await self._close()
+
+                    attempt += 1
+                    if attempt < retries:
+                        delay: float | None = self._error_delay(
+                            policy, attempt - 1, deadline_at
+                        )
+                        if delay is None:
+                            break
+
+                        log.info(f"Retrying in {delay:.2f} seconds...")
+                        await asyncio.sleep(delay)
+
+            raise Exception(
+                f"Failed to connect to {host}:{port} after {retries} attempts."
+            ) from last_error
+
+
+def compile_check(
+    site: str | CheckSpec,
+    method: str = "HEAD",
+    headers: dict | None = None,
+    body: t.Union[dict, str] | None = None,
+    classifier: StatusClassifier | None = None,
+) -> CheckSpec:
+    """Compile a site into a `CheckSpec`, passing through sites that already are one."""
+    if isinstance(site, CheckSpec):
+        return site
+
+    return CheckSpec(
+        site, method=method, headers=headers, body=body, classifier=classifier
+    )
+
+
+def _check_kwargs_for(
+    site: str | CheckSpec, check_kwargs: dict[str, t.Any]
+) -> dict[str, t.Any]:
+    """The run's `check_kwargs`, overridden by a `CheckSpec`'s own `options`."""
+    if isinstance(site, CheckSpec) and site.options:
+        return {**check_kwargs, **site.options}
+
+    return check_kwargs
+
+
+def _check_result(
+    spec: CheckSpec,
+    connection_manager: _BaseConnectionManager,
+    probe: str | None,
+    res: dict[str, t.Any] | None = None,
+    error: Exception | None = None,
+) -> CheckResult:
+    """Build a check's result from what either engine's request or probe returned (or raised)."""
+    ## Probes are reported by their kind, i.e. `TLS`, instead of the request method
+    result = CheckResult(
+        site=spec.site,
+        error=error,
+        method=connection_manager.sent_method
+        or (probe.upper() if probe else spec.method),
+        attempts=connection_manager.attempts,
+        spec=spec,
+    )
+    if res is None:
+        return result
+
+    if probe:
+        result.probe = ProbeResponse(
+            timings=res["timings"], certificate=res["certificate"]
+        )
+    else:
+        result.response = HTTPResponse(
+            status_code=res["status_code"],
+            reason=res["reason"],
+            headers=res["headers"],
+            timings=res["timings"],
+            redirects=res["redirects"],
+            body_bytes=res["body_bytes"],
+            failed_expectations=res["failed_expectations"],
+            certificate=res["certificate"],
+            revalidated=res["revalidated"],
+            ranged=connection_manager.ranged,
+            head_status=connection_manager.head_status,
+        )
+
+    return result
+
+
+def check_site(
+    site: str | CheckSpec,
+    method: str = "HEAD",
+    headers: dict | None = None,
+    body: t.Union[dict, str] | None = None,
+    sleep: float = DEFAULT_RETRY_BASE_DELAY,
+    retries: int = 1,
+    pool: ConnectionPool | None = None,
+    ssl_context: ssl.SSLContext | None = None,
+    dns_cache: DNSCache | None = None,
+    connect_timeout: float | None = DEFAULT_CONNECT_TIMEOUT,
+    read_timeout: float | None = DEFAULT_READ_TIMEOUT,
+    deadline: float | None = None,
+    retry_policy: RetryPolicy | None = None,
+    max_redirects: int = DEFAULT_MAX_REDIRECTS,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    expect: t.Sequence[BodyMatcher] | None = None,
+    probe: str | None = None,
+    validators: ValidatorCache | None = None,
+) -> CheckResult:
+    """Check a single site, capturing any error on the result instead of raising.
+
+    A `CheckSpec` passed as `site` brings its own method, headers & body, which take
+    precedence over those args. With a `probe` (`tcp` or `tls`), the site is only connected
+    to instead of requested, see `ConnectionManager.probe()`. With `validators`, `GET`s of a
+    URL seen before are sent as conditional requests.
+    """
+    try:
+        spec: CheckSpec = compile_check(site, method=method, headers=headers, body=body)
+    except ValueError as exc:
+        return CheckResult(site=str(site), error=exc, method=method)
+
+    connection_manager = ConnectionManager(
+        spec=spec,
+        pool=pool,
+        ssl_context=ssl_context,
+        dns_cache=dns_cache,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        deadline=deadline,
+        retry_policy=retry_policy,
+        max_redirects=max_redirects,
+        max_body_bytes=max_body_bytes,
+        expect=expect,
+        validators=validators,
+    )
+
+    try:
+        if probe:
+            res: dict[str, t.Any] = connection_manager.probe(
+                tls=probe == "tls", sleep=sleep, retries=retries
+            )
+        else:
+            res = connection_manager.send_request(
+                method=spec.method, sleep=sleep, retries=retries
+            )
+    except Exception as exc:
+        return _check_result(spec, connection_manager, probe, error=exc)
+
+    return _check_result(spec, connection_manager, probe, res=res)
+
+
+def check_sites(
+    sites: t.Iterable[str | CheckSpec],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    **check_kwargs: t.Any,
+) -> t.Iterator[CheckResult]:
+    """Check many sites concurrently, yielding one result per site as each check completes.
+
+    Params:
+        sites (Iterable[str | CheckSpec]): The site URLs (or compiled checks) to check.
+        concurrency (int): Maximum number of checks running at the same time.
+        check_kwargs: Passed through to `check_site()` for every site.
+
+    Returns:
+        (Iterator[CheckResult]): Results in order of completion, not input order.
+
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got: {concurrency}")
+
+    remaining: t.Iterator[str | CheckSpec] = iter(sites)
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="sitecheck"
+    ) as executor:
+        ## Only queue a few checks ahead of the workers, so finished results (and sites
+        #  read lazily) don't pile up in memory on runs over thousands of sites
+        def _submit(site: str | CheckSpec) -> Future:
+            return executor.submit(
+                check_site, site, **_check_kwargs_for(site, check_kwargs)
+            )
+
+        pending: set[Future] = {
+            _submit(site) for site in itertools.islice(remaining, concurrency * 2)
+        }
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            pending.update(
+                _submit(site) for site in itertools.islice(remaining, len(done))
+            )
+
+            for future in done:
+                yield future.result()
+
+
+def watch_sites(
+    sites: t.Iterable[str | CheckSpec],
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    jitter: bool = True,
+    **check_kwargs: t.Any,
+) -> t.Iterator[CheckResult]:
+    """Check sites repeatedly every `interval` seconds, yielding results as checks complete.
+
+    Description:
+        Upcoming checks are kept in a heap ordered by their due time on the monotonic clock.
+        With `jitter`, each site's first check is offset by a random fraction of the interval
+        so many sites don't fire at the same moment. A site whose previous check is still
+        running skips that round instead of piling up. Runs until the consumer stops iterating.
+
+    Params:
+        sites (Iterable[str | CheckSpec]): The site URLs (or compiled checks) to check.
+        interval (float): Seconds between the start of consecutive checks of a site, unless
+            its `CheckSpec` sets its own `interval`.
+        concurrency (int): Maximum number of checks running at the same time.
+        jitter (bool): Randomly spread the first round of checks over one interval.
+        check_kwargs: Passed through to `check_site()` for every check. `method`, `headers` &
+            `body` are compiled into a `CheckSpec` per site once, before the first round.
+
+    Returns:
+        (Iterator[CheckResult]): Results in order of completion, indefinitely.
+
+    """
+    if interval <= 0:
+        raise ValueError(f"interval must be greater than 0, got: {interval}")
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got: {concurrency}")
+
+    ## Compile every site once, instead of on every round
+    compile_kwargs: dict[str, t.Any] = {
+        key: check_kwargs.pop(key)
+        for key in ("method", "headers", "body")
+        if key in check_kwargs
+    }
+    specs: list[CheckSpec] = [compile_check(site, **compile_kwargs) for site in sites]
+
+    start: float = time.monotonic()
+    ## (due, index, spec); the index keeps duplicate sites apart & breaks ties
+    schedule: list[tuple[float, int, CheckSpec]] = [
+        (
+            start + (random.uniform(0, spec.interval or interval) if jitter else 0),
+            index,
+            spec,
+        )
+        for index, spec in enumerate(specs)
+    ]
+    heapq.heapify(schedule)
+
+    if not schedule:
+        return
+
+    completed: queue.Queue[tuple[int, CheckResult]] = queue.Queue()
+    in_flight: set[int] = set()
+
+    def _on_done(index: int, future: Future) -> None:
+        completed.put((index, future.result()))
+
+    executor = ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="sitecheck"
+    )
+
+    try:
+        while True:
+            now: float = time.monotonic()
+
+            while schedule[0][0] <= now:
+                due, index, spec = heapq.heappop(schedule)
+
+                if index in in_flight:
+                    log.warning(
+                        f"Previous check of {spec} is still running, skipping this round"
+                    )
+                else:
+                    in_flight.add(index)
+                    executor.submit(
+                        check_site, spec, **_check_kwargs_for(spec, check_kwargs)
+                    ).add_done_callback(functools.partial(_on_done, index))
+
+                ## Keep a fixed rate, skipping any rounds that were missed entirely
+                spec_interval: float = spec.interval or interval
+                next_due: float = due + spec_interval
+                if next_due <= now:
+                    next_due += ((now - next_due) // spec_interval + 1) * spec_interval
+
+                heapq.heappush(schedule, (next_due, index, spec))
+
+            try:
+                index, result = completed.get(
+                    timeout=max(0.0, schedule[0][0] - time.monotonic())
+                )
+            except queue.Empty:
+                continue
+
+            in_flight.discard(index)
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def check_site_async(
+    site: str | CheckSpec,
+    method: str = "HEAD",
+    headers: dict | None = None,
+    body: t.Union[dict, str] | None = None,
+    sleep: float = DEFAULT_RETRY_BASE_DELAY,
+    retries: int = 1,
+    ssl_context: ssl.SSLContext | None = None,
+    dns_cache: DNSCache | None = None,
+    connect_timeout: float | None = DEFAULT_CONNECT_TIMEOUT,
+    read_timeout: float | None = DEFAULT_READ_TIMEOUT,
+    deadline: float | None = None,
+    retry_policy: RetryPolicy | None = None,
+    max_redirects: int = DEFAULT_MAX_REDIRECTS,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    expect: t.Sequence[BodyMatcher] | None = None,
+    probe: str | None = None,
+    validators: ValidatorCache | None = None,
+) -> CheckResult:
+    """Asyncio version of `check_site()`, using an `AsyncConnectionManager`."""
+    try:
+        spec: CheckSpec = compile_check(site, method=method, headers=headers, body=body)
+    except ValueError as exc:
+        return CheckResult(site=str(site), error=exc, method=method)
+
+    connection_manager = AsyncConnectionManager(
+        spec=spec,
+        ssl_context=ssl_context,
+        dns_cache=dns_cache,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        deadline=deadline,
+        retry_policy=retry_policy,
+        max_redirects=max_redirects,
+        max_body_bytes=max_body_bytes,
+        expect=expect,
+        validators=validators,
+    )
+
+    try:
+        if probe:
+            res: dict[str, t.Any] = await connection_manager.probe(
+                tls=probe == "tls", sleep=sleep, retries=retries
+            )
+        else:
+            res = await connection_manager.send_request(
+                method=spec.method, sleep=sleep, retries=retries
+            )
+    except Exception as exc:
+        return _check_result(spec, connection_manager, probe, error=exc)
+
+    return _check_result(spec, connection_manager, probe, res=res)
+
+
+async def check_sites_async(
+    sites: t.Iterable[str | CheckSpec],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    **check_kwargs: t.Any,
+) -> t.AsyncIterator[CheckResult]:
+    """Asyncio version of `check_sites()`, multiplexing every check on the running event loop.
+
+    Params:
+        sites (Iterable[str | CheckSpec]): The site URLs (or compiled checks) to check.
+        concurrency (int): Maximum number of checks running at the same time.
+        check_kwargs: Passed through to `check_site_async()` for every site.
+
+    Returns:
+        (AsyncIterator[CheckResult]): Results in order of completion, not input order.
+
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got: {concurrency}")
+
+    remaining: t.Iterator[str | CheckSpec] = iter(sites)
+    ## Only `concurrency` checks exist at a time, so results don't pile up in memory
+    pending: set[asyncio.Task] = set()
+
+    def _start_checks() -> None:
+        for site in itertools.islice(remaining, concurrency - len(pending)):
+            pending.add(
+                asyncio.ensure_future(
+                    check_site_async(site, **_check_kwargs_for(site, check_kwargs))
+                )
+            )
+
+    try:
+        _start_checks()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            _start_checks()
+
+            for task in done:
+                yield task.result()
+    finally:
+        ## Don't leave checks running if the consumer stops early
+        for task in pending:
+            task.cancel()
+
+
+def _check_shard(
+    number: int,
+    shard: list[tuple[int, CheckSpec]],
+    results: t.Any,
+    engine: str,
+    pool_size: int,
+    pool_idle_timeout: float,
+    setup: t.Callable[[], dict[str, t.Any]] | None,
+    check_kwargs: dict[str, t.Any],
+) -> None:
+    """Run one `check_sites_sharded()` worker's checks, putting each result on `results`.
+
+    Results are put as pickled `(index, result, causes)`: the check's index in the parent's
+    sites, the result without its `spec` (the parent has it), and the chain of errors the
+    result's error was raised from, which pickling would otherwise drop. The worker's
+    `number` marks the end of the shard.
+    """
+
+    def _put(result: CheckResult) -> None:
+        index: int = indexes[id(result.spec)]
+        result.spec = None
+
+        causes: list[BaseException] = []
+        cause: BaseException | None = result.error.__cause__ if result.error else None
+        while cause is not None:
+            causes.append(cause)
+            cause = cause.__cause__
+
+        try:
+            payload: bytes = pickle.dumps((index, result, causes))
+        except Exception:
+            ## Keep the error's description, if it can't be sent as is
+            result.error = Exception(f"{type(result.error).__name__}: {result.error}")
+            payload = pickle.dumps((index, result, []))
+
+        results.put(payload)
+
+    indexes: dict[int, int] = {id(spec): index for index, spec in shard}
+    specs: list[CheckSpec] = [spec for _, spec in shard]
+
+    try:
+        kwargs: dict[str, t.Any] = {**check_kwargs, **(setup() if setup else {})}
+
+        if engine == "async":
+
+            async def _run_async() -> None:
+                async for result in check_sites_async(specs, **kwargs):
+                    _put(result)
+
+            asyncio.run(_run_async())
+        else:
+            pool: ConnectionPool | None = (
+                ConnectionPool(max_per_host=pool_size, idle_timeout=pool_idle_timeout)
+                if pool_size > 0
+                else None
+            )
+            try:
+                for result in check_sites(specs, pool=pool, **kwargs):
+                    _put(result)
+            finally:
+                if pool is not None:
+                    pool.close()
+    except Exception as exc:
+        msg = f"({type(exc)}) Worker stopped, its unfinished checks are reported as errors. Details: {exc}"
+        log.error(msg)
+    finally:
+        results.put(number)
+
+
+def check_sites_sharded(
+    sites: t.Iterable[str | CheckSpec],
+    workers: int,
+    engine: str = "thread",
+    pool_size: int = DEFAULT_POOL_SIZE,
+    pool_idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+    setup: t.Callable[[], dict[str, t.Any]] | None = None,
+    **check_kwargs: t.Any,
+) -> t.Iterator[CheckResult]:
+    """Shard checks across `workers` processes, yielding results as each check completes.
+
+    Description:
+        Sites are dealt round-robin to the workers, each running its own `engine` (with its
+        own connection pool for the `thread` engine), so TLS handshakes & response parsing
+        use every core instead of one interpreter's. Results are merged back in order of
+        completion, with their `spec` & error chain restored. Checks a worker never finished
+        (i.e. it raised or was killed) get a result with an error, so none go missing.
+
+        Everything passed to the workers must be picklable. Per-process objects (i.e. an
+        `ssl_context`, `dns_cache` or `retry_policy`) are built in each worker by `setup`,
+        a picklable callable returning extra `check_kwargs`.
+
+    Params:
+        sites (Iterable[str | CheckSpec]): The site URLs (or compiled checks) to check.
+        workers (int): Number of worker processes.
+        engine (str): `thread` or `async`, the engine each worker runs.
+        pool_size (int): Idle keep-alive connections kept per host, per worker.
+        pool_idle_timeout (float): Seconds an idle pooled connection can be reused for.
+        setup (Callable[[], dict]): Builds each worker's per-process `check_kwargs`.
+        check_kwargs: Passed through to `check_sites()`/`check_sites_async()` in every worker.
+
+    Returns:
+        (Iterator[CheckResult]): Results in order of completion, not input order.
+
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got: {workers}")
+
+    compile_kwargs: dict[str, t.Any] = {
+        key: check_kwargs.pop(key)
+        for key in ("method", "headers", "body")
+        if key in check_kwargs
+    }
+    specs: list[CheckSpec] = [compile_check(site, **compile_kwargs) for site in sites]
+    shards: list[list[tuple[int, CheckSpec]]] = [
+        list(itertools.islice(enumerate(specs), start, None, workers))
+        for start in range(min(workers, len(specs)))
+    ]
+
+    results: multiprocessing.Queue = multiprocessing.Queue()
+    processes: list[multiprocessing.Process] = [
+        multiprocessing.Process(
+            target=_check_shard,
+            args=(
+                number,
+                shard,
+                results,
+                engine,
+                pool_size,
+                pool_idle_timeout,
+                setup,
+                check_kwargs,
+            ),
+            name=f"sitecheck-worker-{number}",
+            daemon=True,
+        )
+        for number, shard in enumerate(shards)
+    ]
+    for process in processes:
+        process.start()
+
+    ## Indexes of the checks yielded so far, and workers that sent their end marker or died
+    reported: set[int] = set()
+    finished: set[int] = set()
+
+    def _unfinished(number: int, reason: str) -> t.Iterator[CheckResult]:
+        """Error results for the worker's checks it never sent a result for."""
+        finished.add(number)
+        probe: str | None = check_kwargs.get("probe")
+        for index, spec in shards[number]:
+            if index in reported:
+                continue
+            reported.add(index)
+            yield CheckResult(
+                site=spec.site,
+                error=Exception(
+                    f"{processes[number].name} {reason} before checking {spec.site}"
+                ),
+                method=probe.upper() if probe else spec.method,
+                spec=spec,
+            )
+
+    try:
+        while len(finished) < len(processes):
+            try:
+                payload: bytes | int = results.get(timeout=1.0)
+            except queue.Empty:
+                ## A worker that died (i.e. was killed) never sends its end marker
+                for number, process in enumerate(processes):
+                    if number not in finished and process.exitcode not in (None, 0):
+                        log.error(
+                            f"Worker {process.name} exited with code {process.exitcode}, its remaining checks failed"
+                        )
+                        yield from _unfinished(
+                            number, f"exited with code {process.exitcode}"
+                        )
+                continue
+
+            if isinstance(payload, int):
+                yield from _unfinished(payload, "stopped")
+                continue
+
+            index, result, causes = pickle.loads(payload)
+            ## Already reported as unfinished, if its worker seemed dead first
+            if index in reported:
+                continue
+            reported.add(index)
+
+            result.spec = specs[index]
+            error: BaseException | None = result.error
+            for cause in causes:
+                error.__cause__ = cause
+                error = cause
+
+            yield result
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+
+def load_sites(source: str) -> list[str]:
+    """Load site URLs from a file (or stdin when `source` is `-`), one per line.
+
+    Blank lines and lines starting with `#` are ignored.
+    """
+    if source == "-":
+        lines: list[str] = sys.stdin.read().splitlines()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    return [
+        line.strip()
+        for line in lines
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+
+def _config_settings(entry: t.Any, where: str) -> dict[str, t.Any]:
+    """Type-check one `--config` table of check settings, raising a `ConfigError`."""
+    if not isinstance(entry, dict):
+        raise ConfigError(f"{where}: expected a table, got {type(entry).__name__}")
+
+    for key, value in entry.items():
+        expected: tuple[type, ...] | None = CONFIG_CHECK_SETTINGS.get(key)
+        if expected is None:
+            raise ConfigError(f"{where}: unknown setting {key!r}")
+        ## `bool` is an `int`, but `retries = true` is a mistake
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ConfigError(
+                f"{where}.{key}: expected {' or '.join(kind.__name__ for kind in expected)}, got {type(value).__name__}"
+            )
+
+    for key in ("connect_timeout", "read_timeout", "deadline", "interval"):
+        if key in entry and entry[key] <= 0:
+            raise ConfigError(f"{where}.{key}: must be greater than 0")
+    if "retries" in entry and entry["retries"] < 1:
+        raise ConfigError(f"{where}.retries: must be at least 1")
+    for key in ("max_redirects", "max_body_bytes"):
+        if key in entry and entry[key] < 0:
+            raise ConfigError(f"{where}.{key}: must not be negative")
+    if "probe" in entry and entry["probe"] not in PROBES:
+        raise ConfigError(
+            f"{where}.probe: expected one of {', '.join(PROBES)}, got {entry['probe']!r}"
+        )
+
+    if not all(isinstance(value, str) for value in entry.get("headers", {}).values()):
+        raise ConfigError(f"{where}.headers: header values must be strings")
+    for key in ("expect_text", "expect_regex", "expect_json_path"):
+        if not all(isinstance(value, str) for value in entry.get(key, [])):
+            raise ConfigError(f"{where}.{key}: expected a list of strings")
+
+    return entry
+
+
+def load_config(
+    path: str,
+    method: str = "HEAD",
+    headers: dict | None = None,
+    body: t.Union[dict, str] | None = None,
+    success_codes: t.Sequence[int | str] = DEFAULT_HTTP_SUCCESS_CODES,
+    failure_codes: t.Sequence[int | str] = DEFAULT_HTTP_FAILURE_CODES,
+    expect: t.Sequence[BodyMatcher] | None = None,
+    probe: str | None = None,
+) -> list[CheckSpec]:
+    """Load checks from a TOML or JSON `--config` file, compiling each into a `CheckSpec`.
+
+    Description:
+        The file holds a `checks` list of tables, each with a `url` and any per-check
+        settings (see `CONFIG_CHECK_SETTINGS`), and an optional `defaults` table applied to
+        every check. Settings a check doesn't set fall back to `defaults`, then to these
+        args; headers are merged instead of replaced. Every check is validated & compiled
+        before any is returned, so a mistake raises a `ConfigError` before any request.
+
+    Params:
+        path (str): A `.json` file, or a TOML file (any other extension).
+        method, headers, body, success_codes, failure_codes: The run's settings, used for
+            checks that don't set their own.
+        expect (Sequence[BodyMatcher]): The run's body expectations, to validate checks
+            that inherit them.
+        probe (str): The run's `--probe`, to validate checks that inherit it.
+
+    Returns:
+        (list[CheckSpec]): One compiled check per entry of `checks`, in file order.
+
+    """
+    try:
+        with open(path, "rb") as f:
+            data: t.Any = (
+                json.load(f) if path.lower().endswith(".json") else tomllib.load(f)
+            )
+    except (OSError, ValueError) as exc:
+        raise ConfigError(f"Can't load {path}: {exc}") from exc
+
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path}: expected a table with a 'checks' list")
+    unknown: set[str] = set(data) - {"defaults", "checks"}
+    if unknown:
+        raise ConfigError(f"{path}: unknown key(s): {', '.join(sorted(unknown))}")
+
+    defaults: dict[str, t.Any] = _config_settings(
+        data.get("defaults", {}), f"{path}: defaults"
+    )
+    if "url" in defaults:
+        raise ConfigError(f"{path}: defaults can't set a url")
+
+    checks: t.Any = data.get("checks")
+    if not isinstance(checks, list) or not checks:
+        raise ConfigError(f"{path}: expected a non-empty 'checks' list")
+
+    ## Checks with the same codes share one classifier table
+    classifiers: dict[tuple[str, str], StatusClassifier] = {}
+    specs: list[CheckSpec] = []
+
+    for index, entry in enumerate(checks):
+        where: str = f"{path}: checks[{index}]"
+        own: dict[str, t.Any] = _config_settings(entry, where)
+        settings: dict[str, t.Any] = {**defaults, **own}
+        if "url" not in settings:
+            raise ConfigError(f"{where}: missing 'url'")
+
+        check_method: str = settings.get("method", method).upper()
+        if check_method not in (*HTTP_METHODS, AUTO_METHOD):
+            raise ConfigError(
+                f"{where}.method: expected one of {', '.join(HTTP_METHODS)} or {AUTO_METHOD}, got {check_method!r}"
+            )
+
+        check_body: t.Any = settings.get("body", body)
+        check_headers: dict[str, str] = {
+            **(headers or {}),
+            **defaults.get("headers", {}),
+            **own.get("headers", {}),
+        }
+        if (
+            isinstance(settings.get("body"), (dict, list))
+            and "content-type" not in {key.lower() for key in check_headers}
+        ):
+            check_headers["Content-Type"] = "application/json"
+
+        success: t.Any = settings.get("success_codes", success_codes)
+        failure: t.Any = settings.get("failure_codes", failure_codes)
+        codes: tuple[str, str] = (str(success), str(failure))
+        if codes not in classifiers:
+            try:
+                classifiers[codes] = StatusClassifier.from_specs(
+                    success if isinstance(success, (list, tuple)) else [success],
+                    failure if isinstance(failure, (list, tuple)) else [failure],
+                )
+            except ValueError as exc:
+                raise ConfigError(f"{where}: {exc}") from exc
+
+        options: dict[str, t.Any] = {
+            key: settings[key] for key in CONFIG_CHECK_OPTIONS if key in settings
+        }
+        if any(key.startswith("expect_") for key in settings):
+            try:
+                options["expect"] = [
+                    *(TextMatcher(text) for text in settings.get("expect_text", [])),
+                    *(RegexMatcher(text) for text in settings.get("expect_regex", [])),
+                    *(
+                        JSONPathMatcher(json_path)
+                        for json_path in settings.get("expect_json_path", [])
+                    ),
+                ]
+            except (re.error, ValueError) as exc:
+                raise ConfigError(f"{where}: invalid body expectation: {exc}") from exc
+        if options.get("expect", expect) and options.get("probe", probe):
+            raise ConfigError(f"{where}: probes have no response body to check expectations on")
+        if options.get("expect", expect) and check_method in ("HEAD", AUTO_METHOD):
+            raise ConfigError(
+                f"{where}: body expectations need a method with a response body, i.e. GET"
+            )
+
+        try:
+            specs.append(
+                CheckSpec(
+                    settings["url"],
+                    method=check_method,
+                    headers=check_headers,
+                    body=check_body,
+                    classifier=classifiers[codes],
+                    interval=settings.get("interval"),
+                    options=options,
+                )
+            )
+        except ValueError as exc:
+            raise ConfigError(f"{where}: {exc}") from exc
+
+    return specs
+
+
+def _is_timeout(error: BaseException | None) -> bool:
+    """Whether `error`, or any error it was raised from, is a timeout."""
+    while error is not None:
+        if isinstance(error, TimeoutError):
+            return True
+        error = error.__cause__
+
+    return False
+
+
+def classify_result(result: CheckResult, classifier: StatusClassifier) -> str:
+    """Sort a check into `success`, `failure`, `unexpected`, `connection_error` or `timeout`.
 
-log: logging.Logger = logging.getLogger(__name__)
+    Description:
+        A success status whose body didn't meet the check's expectations is a `failure`, a
+        status in neither list is `unexpected`. Checks that got no response at all are a
+        `timeout` if they (or their last attempt) timed out, otherwise a `connection_error`.
+        Each classification has a matching `ExitCode`. The check's own `CheckSpec.classifier`
+        takes precedence over `classifier`. A probe that connected, or a `304` answering a
+        conditional request (see `ValidatorCache`), is a `success`. The `206`/`416` answer to
+        a `--method auto` ranged `GET` is classified as a `200`.
+    """
+    if result.probe is not None:
+        return "success"
 
-DEFAULT_HTTP_SUCCESS_CODES: list[int] = [200, 201, 202]
-DEFAULT_HTTP_FAILURE_CODES: list[int] = [400, 401, 402, 403, 404, 500, 501, 502]
+    if result.response is None:
+        return "timeout" if _is_timeout(result.error) else "connection_error"
 
+    response: HTTPResponse = result.response
+    if response.revalidated:
+        return "success"
 
-@dataclass
-class HTTPResponse:
-    """Custom class to store the response from a request."""
+    if result.spec is not None and result.spec.classifier is not None:
+        classifier = result.spec.classifier
 
-    status_code: int
-    reason: str | None = field(default=None)
-    headers: list[tuple[str, str]] | None = field(default=None)
+    ## A ranged `GET` gets part of the resource, or none of an empty one, where a plain `GET` gets a `200`
+    status_code: int = (
+        200
+        if response.ranged and response.status_code in (206, 416)
+        else response.status_code
+    )
 
+    # Check if the status code is in success or failure codes
+    classification: str = classifier.classify(status_code)
+    if classification == "success" and response.failed_expectations:
+        return "failure"
 
-class ConnectionManager:
-    """Custom context manager for HTTP/HTTPS connections."""
+    return classification
 
-    def __init__(
-        self,
-        url: str,
-        headers: dict | None = None,
-        body: t.Union[dict, str] | None = None,
-    ) -> None:
-        self.logger: logging.Logger = log.getChild("ConnectionManager")
 
-        self.connection = None
-        self.parsed_url: urllib.parse.ParseResult | t.Any = self._ensure_schema(url)
-        self.headers: dict = headers or {}
-        self.body: bytes = self._prepare_body(body)
+def report_result(
+    result: CheckResult,
+    classifier: StatusClassifier,
+    cert_warn_days: float | None = None,
+) -> str:
+    """Log the outcome of a check against the success & failure codes, returning its classification.
 
-        self.trace = None
+    With `cert_warn_days`, also warns when the site's TLS certificate expires within that many days.
+    """
+    classification: str = classify_result(result, classifier)
 
-    def _ensure_schema(self, url) -> urllib.parse.ParseResult | t.Any:
-        parsed = urllib.parse.urlparse(url)
-        if not parsed.scheme:
-            self.logger.warning(
-                f"No schema provided for URL: {url}. Assuming 'http://'"
+    certificate: CertificateInfo | None = _result_certificate(result)
+    if certificate is not None and cert_warn_days is not None:
+        days_left: float = certificate.days_left()
+        if days_left <= cert_warn_days:
+            log.warning(
+                f"[{result.site}] TLS certificate expires in {days_left:.1f} day(s), on {certificate.not_after:%Y-%m-%d %H:%M} UTC (issuer: {certificate.issuer})"
             )
-            url: str = f"http://{url}"
-            parsed: urllib.parse.ParseResult = urllib.parse.urlparse(url)
-        return parsed
 
-    def _prepare_body(self, body: t.Union[dict, str] | None) -> bytes | None:
-        if isinstance(body, dict):
-            body = json.dumps(body).encode(encoding="utf-8")
-        elif isinstance(body, str):
-            body = body.encode(encoding="utf-8")
-        return body
+    if result.probe is not None:
+        expires: str = (
+            f", certificate expires {certificate.not_after:%Y-%m-%d}"
+            if certificate is not None
+            else ""
+        )
+        log.info(
+            f"[{result.site}] Success: {result.method} connected{expires} ({result.probe.timings})"
+        )
+        return classification
 
-    def __enter__(self) -> http.client.HTTPSConnection | http.client.HTTPConnection:
-        if self.parsed_url.scheme == "https":
-            self.connection = http.client.HTTPSConnection(self.parsed_url.netloc)
+    if result.response is None:
+        log.error(f"Failed to connect to site: {result.site}. Details: {result.error}")
+        return classification
+
+    response: HTTPResponse = result.response
+    status: str = f"{response.status_code} {response.reason}"
+    if response.failed_expectations:
+        status += f", body didn't match {', '.join(response.failed_expectations)}"
+
+    if classification == "success":
+        log.info(f"[{result.site}] Success: {status} ({response.timings})")
+    elif classification == "failure":
+        log.error(f"[{result.site}] Failure: {status} ({response.timings})")
+    else:
+        log.warning(f"[{result.site}] Unexpected status: {status} ({response.timings})")
+
+    return classification
+
+
+def result_record(result: CheckResult, classification: str) -> dict[str, t.Any]:
+    """Flatten a check into an `--output` record with the keys in `RESULT_FIELDS`."""
+    response: HTTPResponse | None = result.response
+    timings: Timings | None = _result_timings(result)
+    certificate: CertificateInfo | None = _result_certificate(result)
+
+    def _ms(value: float | None) -> float | None:
+        return round(value, 3) if value is not None else None
+
+    return {
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "site": result.site,
+        "method": result.method,
+        "status": response.status_code if response else None,
+        "reason": response.reason if response else None,
+        "classification": classification,
+        "attempts": result.attempts,
+        "redirects": response.redirects if response else [],
+        "total_ms": _ms(timings.total_ms) if timings else None,
+        "ttfb_ms": _ms(timings.ttfb_ms) if timings else None,
+        "dns_ms": _ms(timings.dns_ms) if timings else None,
+        "connect_ms": _ms(timings.connect_ms) if timings else None,
+        "tls_ms": _ms(timings.tls_ms) if timings else None,
+        "cert_expires": certificate.not_after.isoformat() if certificate else None,
+        "cert_issuer": certificate.issuer if certificate else None,
+        "failed_expectations": response.failed_expectations if response else [],
+        "error": f"{type(result.error).__name__}: {result.error}"
+        if result.error
+        else None,
+    }
+
+
+class ResultWriter(abc.ABC):
+    """Base for writers streaming `--output` records to `stream` as checks complete.
+
+    Description:
+        Every record is flushed as soon as it's written, so consumers see results while a
+        long batch is still running, and nothing is kept in memory after it's written.
+    """
+
+    def __init__(self, stream: t.TextIO) -> None:
+        self.stream: t.TextIO = stream
+
+    @abc.abstractmethod
+    def write(self, record: dict[str, t.Any]) -> None: ...
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class NDJSONResultWriter(ResultWriter):
+    """Write one JSON object per line."""
+
+    def write(self, record: dict[str, t.Any]) -> None:
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+
+class JSONResultWriter(ResultWriter):
+    """Write a JSON array one element at a time, closing it in `close()`."""
+
+    def __init__(self, stream: t.TextIO) -> None:
+        super().__init__(stream)
+
+        self._written: int = 0
+
+    def write(self, record: dict[str, t.Any]) -> None:
+        self.stream.write(("[\n  " if not self._written else ",\n  ") + json.dumps(record))
+        self.stream.flush()
+        self._written += 1
+
+    def close(self) -> None:
+        self.stream.write("\n]\n" if self._written else "[]\n")
+        super().close()
+
+
+class CSVResultWriter(ResultWriter):
+    """Write a header row, then one row per record. List fields are joined with spaces."""
+
+    def __init__(self, stream: t.TextIO) -> None:
+        super().__init__(stream)
+
+        self._writer = csv.DictWriter(stream, fieldnames=RESULT_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, record: dict[str, t.Any]) -> None:
+        self._writer.writerow(
+            {
+                key: " ".join(value) if isinstance(value, list) else value
+                for key, value in record.items()
+            }
+        )
+        self.stream.flush()
+
+
+RESULT_WRITERS: dict[str, type[ResultWriter]] = {
+    "json": JSONResultWriter,
+    "ndjson": NDJSONResultWriter,
+    "csv": CSVResultWriter,
+}
+
+
+class Summary:
+    """Running totals of a run's checks, updated as each result arrives.
+
+    Description:
+        Counts checks per classification and keeps the `top` slowest sites (by their slowest
+        check, so a site checked every `--watch` round is listed once) in a bounded min-heap,
+        so memory use doesn't grow with the number of checks.
+    """
+
+    def __init__(self, top: int = DEFAULT_SUMMARY_TOP) -> None:
+        self.top: int = top
+        self.counts: collections.Counter[str] = collections.Counter()
+        ## (total_ms, site) of the slowest sites, the fastest of them first
+        self._slowest: list[tuple[float, str]] = []
+        ## The heap's total_ms per site, to keep one entry per site
+        self._slowest_sites: dict[str, float] = {}
+
+    def add(self, result: CheckResult, classification: str) -> None:
+        self.counts[classification] += 1
+
+        timings: Timings | None = _result_timings(result)
+        if timings is None or timings.total_ms is None or self.top < 1:
+            return
+
+        entry: tuple[float, str] = (timings.total_ms, result.site)
+        known: float | None = self._slowest_sites.get(result.site)
+        if known is not None:
+            ## Replace the site's entry if this check was slower (`top` entries at most)
+            if timings.total_ms > known:
+                self._slowest[self._slowest.index((known, result.site))] = entry
+                heapq.heapify(self._slowest)
+                self._slowest_sites[result.site] = timings.total_ms
+            return
+
+        if len(self._slowest) < self.top:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            del self._slowest_sites[heapq.heapreplace(self._slowest, entry)[1]]
         else:
-            self.connection = http.client.HTTPConnection(self.parsed_url.netloc)
-        return self.connection
+            return
+        self._slowest_sites[result.site] = timings.total_ms
 
-    def __exit__(self, exc_type, exc_val, traceback) -> bool:
-        if self.connection:
-            self.connection.close()
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
 
-        if exc_val:
-            msg = f"({exc_type}) {exc_val}"
-            log.error(msg)
+    def slowest(self) -> list[tuple[str, float]]:
+        """The slowest sites & their slowest check's total milliseconds, slowest first."""
+        return [(site, total_ms) for total_ms, site in sorted(self._slowest, reverse=True)]
 
-            self.trace = traceback
+    @property
+    def exit_code(self) -> ExitCode:
+        """The most severe `ExitCode` among the checks, `SUCCESS` if there were none."""
+        return max(
+            (ExitCode[classification.upper()] for classification in self.counts),
+            default=ExitCode.SUCCESS,
+        )
 
-            return False
+    def report(self) -> None:
+        """Log the counts per classification, and the slowest checks."""
+        counts: str = ", ".join(
+            f"{self.counts[code.name.lower()]} {code.name.lower()}"
+            for code in ExitCode
+            if self.counts[code.name.lower()]
+        )
+        log.info(f"Summary: {self.total} check(s), {counts or 'none completed'}")
 
-        return True
+        for site, total_ms in self.slowest():
+            log.info(f"Slowest: {site} ({total_ms:.1f}ms)")
 
-    def send_request(self, method: str, sleep: int, retries: int) -> dict[str, t.Any]:
-        log.info(f"Sending {method} request to URL: {self.parsed_url.geturl()}")
 
-        with (
-            self
-        ):  # Use the context manager to open and automatically close the connection
-            for attempt in range(retries):
-                try:
-                    # Send the request with the specified method (HEAD, GET, etc.)
-                    self.connection.request(
-                        method=method,
-                        url=self.parsed_url.path or "/",
-                        body=self.body,
-                        headers=self.headers,
-                    )
+class _SiteMetrics:
+    """Running totals for one site."""
 
-                    # Get the response
-                    response: http.client.HTTPResponse = self.connection.getresponse()
-                    log.info(f"Response: [{response.status}]")
+    __slots__ = ("buckets", "duration_sum", "checks", "retries", "redirects")
 
-                    # Extract the HTTP status code, reason phrase, and headers
-                    status_code: int = response.status
-                    reason: str = response.reason
-                    headers: list[tuple[str, str]] = response.getheaders()
+    def __init__(self) -> None:
+        ## Non-cumulative counts per `METRICS_BUCKETS` bucket, the last one being `+Inf`
+        self.buckets: list[int] = [0] * (len(METRICS_BUCKETS) + 1)
+        self.duration_sum: float = 0.0
+        self.checks: collections.Counter[str] = collections.Counter()
+        self.retries: int = 0
+        self.redirects: int = 0
 
-                    # Handle redirects (301, 302, 303, 307, 308)
-                    if status_code in {301, 302, 303, 307, 308}:
-                        log.info(f"Redirected: {status_code} {reason}")
-                        location = response.getheader("Location")
-                        if location:
-                            log.info(f"Following redirect to: {location}")
-                            # Update the URL and retry the request
-                            self.parsed_url = urllib.parse.urlparse(location)
-                            self.connection.close()  # Close the previous connection
-                            self.connection = None  # Reset the connection
-                            return self.send_request(method, sleep, retries)
+    def copy(self) -> _SiteMetrics:
+        site = _SiteMetrics()
+        site.buckets = list(self.buckets)
+        site.duration_sum = self.duration_sum
+        site.checks = collections.Counter(self.checks)
+        site.retries = self.retries
+        site.redirects = self.redirects
 
-                    return {
-                        "status_code": status_code,
-                        "reason": reason,
-                        "headers": headers,
-                    }
+        return site
 
-                except gaierror as invalid_site:
-                    msg = f"({type(invalid_site)}) Invalid site address: '{self.parsed_url.geturl()}'."
-                    log.error(msg)
-                    raise invalid_site
 
-                except Exception as exc:
-                    msg = f"({type(exc)}) Error connecting to URL: {self.parsed_url.geturl()}. Attempt {attempt + 1}/{retries} failed. Details: {exc}"
-                    log.error(msg)
+class Metrics:
+    """Per-site metrics of a run's checks, rendered in the Prometheus text format.
 
-                    # If this was not the last attempt, wait for the specified sleep duration
-                    if attempt < retries - 1:
-                        log.info(f"Retrying in {sleep} seconds...")
-                        time.sleep(sleep)
+    Description:
+        Results are recorded under a lock, which a scrape only holds to copy the per-site
+        totals, so a scrape costs O(sites) however many checks have run, and always sees
+        every site's metrics from the same moment. Checks without a response or probe
+        (i.e. connection errors) count towards `up` & the checks counter, not the histogram.
+    """
 
-            # If all retries failed, raise an exception
-            raise Exception(
-                f"Failed to connect to {self.parsed_url.geturl()} after {retries} attempts."
+    def __init__(self) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self._sites: dict[str, _SiteMetrics] = {}
+        ## Last outcome per site
+        self._up: dict[str, int] = {}
+        ## Unix time the site's last seen TLS certificate expires at
+        self._cert_expiry: dict[str, float] = {}
+
+    def observe(self, result: CheckResult, classification: str) -> None:
+        """Record a check's result, with its classification from `classify_result()`."""
+        certificate: CertificateInfo | None = _result_certificate(result)
+        timings: Timings | None = _result_timings(result)
+
+        with self._lock:
+            site: _SiteMetrics | None = self._sites.get(result.site)
+            if site is None:
+                site = self._sites[result.site] = _SiteMetrics()
+
+            self._up[result.site] = int(classification == "success")
+            if certificate is not None:
+                self._cert_expiry[result.site] = certificate.not_after.timestamp()
+            site.checks[classification] += 1
+            site.retries += max(result.attempts - 1, 0)
+
+            if result.response is not None:
+                site.redirects += len(result.response.redirects)
+
+            if timings is not None and timings.total_ms is not None:
+                seconds: float = timings.total_ms / 1000
+                site.buckets[bisect.bisect_left(METRICS_BUCKETS, seconds)] += 1
+                site.duration_sum += seconds
+
+    def _snapshot(
+        self,
+    ) -> tuple[dict[str, _SiteMetrics], dict[str, int], dict[str, float]]:
+        """Copies of the per-site totals, `up` & certificate expiry, taken together."""
+        with self._lock:
+            return (
+                {name: site.copy() for name, site in self._sites.items()},
+                dict(self._up),
+                dict(self._cert_expiry),
+            )
+
+    @staticmethod
+    def _label(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def render(self) -> str:
+        """The current metrics in the Prometheus text exposition format."""
+        merged, up, cert_expiry = self._snapshot()
+        sites: list[str] = sorted(merged)
+        lines: list[str] = [
+            "# HELP sitecheck_up Whether the site's last check was a success.",
+            "# TYPE sitecheck_up gauge",
+        ]
+        lines.extend(
+            f'sitecheck_up{{site="{self._label(site)}"}} {up[site]}'
+            for site in sites
+        )
+
+        lines.extend(
+            [
+                "# HELP sitecheck_checks_total Checks completed, by classification.",
+                "# TYPE sitecheck_checks_total counter",
+            ]
+        )
+        for site in sites:
+            for classification, count in sorted(merged[site].checks.items()):
+                lines.append(
+                    f'sitecheck_checks_total{{site="{self._label(site)}",classification="{classification}"}} {count}'
+                )
+
+        lines.extend(
+            [
+                "# HELP sitecheck_check_duration_seconds Time taken by checks that got a response.",
+                "# TYPE sitecheck_check_duration_seconds histogram",
+            ]
+        )
+        for site in sites:
+            label: str = self._label(site)
+            cumulative: int = 0
+            for bound, count in zip(
+                [*METRICS_BUCKETS, "+Inf"], merged[site].buckets
+            ):
+                cumulative += count
+                lines.append(
+                    f'sitecheck_check_duration_seconds_bucket{{site="{label}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'sitecheck_check_duration_seconds_sum{{site="{label}"}} {merged[site].duration_sum}'
+            )
+            lines.append(
+                f'sitecheck_check_duration_seconds_count{{site="{label}"}} {cumulative}'
             )
 
+        for name, description in (
+            ("retries", "Retries made after a check's first attempt."),
+            ("redirects", "Redirects followed."),
+        ):
+            lines.extend(
+                [
+                    f"# HELP sitecheck_{name}_total {description}",
+                    f"# TYPE sitecheck_{name}_total counter",
+                ]
+            )
+            lines.extend(
+                f'sitecheck_{name}_total{{site="{self._label(site)}"}} {getattr(merged[site], name)}'
+                for site in sites
+            )
+
+        if cert_expiry:
+            lines.extend(
+                [
+                    "# HELP sitecheck_cert_expiry_timestamp_seconds Unix time the site's TLS certificate expires.",
+                    "# TYPE sitecheck_cert_expiry_timestamp_seconds gauge",
+                ]
+            )
+            lines.extend(
+                f'sitecheck_cert_expiry_timestamp_seconds{{site="{self._label(site)}"}} {cert_expiry[site]}'
+                for site in sorted(cert_expiry)
+            )
+
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    """Answer `GET /metrics` with the server's `Metrics`."""
+
+    server: _MetricsHTTPServer
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        payload: bytes = self.server.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        log.debug(f"Metrics request: {format % args}")
+
+
+class _MetricsHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], metrics: Metrics) -> None:
+        self.metrics: Metrics = metrics
+        super().__init__(address, _MetricsHandler)
+
+
+class MetricsServer:
+    """Serve a `Metrics` instance's `render()` at `/metrics`, from a background thread."""
+
+    def __init__(
+        self, metrics: Metrics, host: str = DEFAULT_METRICS_HOST, port: int = 0
+    ) -> None:
+        self.metrics: Metrics = metrics
+        self._server: _MetricsHTTPServer = _MetricsHTTPServer((host, port), metrics)
+        self._thread: threading.Thread = threading.Thread(
+            target=self._server.serve_forever, name="sitecheck-metrics", daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> MetricsServer:
+        self._thread.start()
+        log.info(
+            f"Serving metrics on http://{self._server.server_address[0]}:{self.port}/metrics"
+        )
+
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
 
 def parse_args() -> argparse.Namespace:
     """Parse CLI args passed to the script."""
@@ -175,31 +4026,58 @@ def parse_args() -> argparse.Namespace:
         description="Check a website's status with HEAD request."
     )
 
-    ## Site URL to request
-    parser.add_argument("--site", required=True, help="URL of the site to check.")
+    ## Site URL to request, or a file listing many sites to check in one run
+    sites_group = parser.add_mutually_exclusive_group(required=True)
+    sites_group.add_argument("--site", help="URL of the site to check.")
+    sites_group.add_argument(
+        "--sites-file",
+        help="File with one site URL per line ('-' reads from stdin).",
+    )
+    sites_group.add_argument(
+        "--config",
+        help="TOML (or .json) file listing checks, with per-check settings.",
+    )
     ## Request method
     parser.add_argument(
         "--method",
         default="HEAD",
-        choices=["GET", "POST", "PUT", "HEAD", "DELETE"],
+        choices=[*HTTP_METHODS, AUTO_METHOD],
         type=str.upper,
-        help="HTTP method to use (i.e. GET, POST, HEAD).",
+        help="HTTP method to use (i.e. GET, POST, HEAD), or AUTO for HEAD with a ranged GET fallback.",
+    )
+    ## Revalidate GETs with ETag/Last-Modified instead of downloading them again
+    parser.add_argument(
+        "--conditional",
+        action="store_true",
+        help="Send GETs of sites seen before as conditional requests; 304 Not Modified is a success.",
+    )
+    ## Warn about TLS certificates close to expiry
+    parser.add_argument(
+        "--cert-warn-days",
+        type=float,
+        default=None,
+        help="Warn when an HTTPS site's certificate expires within this many days.",
+    )
+    ## Connection-only checks, skipping HTTP
+    parser.add_argument(
+        "--probe",
+        default=None,
+        choices=PROBES,
+        help="Only open a TCP connection (tcp) or complete a TLS handshake (tls), without an HTTP request.",
     )
     ## List of codes that qualify as a succcessful response
     parser.add_argument(
         "--success-codes",
         nargs="+",
-        type=int,
         default=DEFAULT_HTTP_SUCCESS_CODES,
-        help="List of HTTP success codes.",
+        help="List of HTTP success codes, classes (2xx), ranges (200-299) or exclusions (!204).",
     )
     ## List of codes that qualify as a failure response
     parser.add_argument(
         "--failure-codes",
         nargs="+",
-        type=int,
         default=DEFAULT_HTTP_FAILURE_CODES,
-        help="List of HTTP failure codes.",
+        help="List of HTTP failure codes, classes (5xx), ranges (500-599) or exclusions (!503).",
     )
     ## Headers dict (formatted as a string, i.e. '{"Key-Name": "Key-Value"}')
     parser.add_argument("--headers", type=str, default=None, help="Headers dict")
@@ -209,12 +4087,32 @@ def parse_args() -> argparse.Namespace:
         type=str,
         help="Optional request body as a JSON string.",
     )
-    ## Number of seconds to sleept between requests
+    ## Number of seconds to sleep between requests, the base of the backoff
     parser.add_argument(
         "--sleep",
+        type=float,
+        default=DEFAULT_RETRY_BASE_DELAY,
+        help="Base number of seconds to wait before retrying.",
+    )
+    ## How the wait grows between retries
+    parser.add_argument(
+        "--backoff",
+        default="exponential",
+        choices=["exponential", "constant"],
+        help="Exponential backoff with full jitter, or a constant --sleep between retries.",
+    )
+    parser.add_argument(
+        "--max-delay",
+        type=float,
+        default=DEFAULT_RETRY_MAX_DELAY,
+        help="Maximum seconds to wait between retries.",
+    )
+    ## Cap on retries across every check in the run
+    parser.add_argument(
+        "--retry-budget",
         type=int,
-        default=5,
-        help="Number of seconds to wait before retrying.",
+        default=None,
+        help="Maximum number of retries across the whole run.",
     )
     ## Number of retries when failure
     parser.add_argument(
@@ -223,40 +4121,459 @@ def parse_args() -> argparse.Namespace:
         default=1,
         help="Number of retry attempts for failed requests.",
     )
+    ## Number of sites to check at the same time in batch mode
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum number of concurrent checks when using --sites-file.",
+    )
+    ## Worker processes the checks are sharded across
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Shard checks across this many processes, each running --concurrency checks.",
+    )
+    ## Keep-alive connection pool shared by the thread engine's checks
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help="Idle keep-alive connections kept per host (0 disables pooling).",
+    )
+    parser.add_argument(
+        "--pool-idle-timeout",
+        type=float,
+        default=None,
+        help=f"Seconds an idle pooled connection can be reused for (default: {DEFAULT_POOL_IDLE_TIMEOUT}, or twice --interval with --watch).",
+    )
+    ## TLS settings, applied to the SSL context shared by every HTTPS check
+    parser.add_argument(
+        "--ca-file",
+        type=str,
+        default=None,
+        help="CA bundle used to verify HTTPS certificates.",
+    )
+    parser.add_argument(
+        "--min-tls-version",
+        choices=list(TLS_VERSIONS),
+        default=None,
+        help="Minimum TLS version to accept.",
+    )
+    ## In-process DNS cache, shared by every check in the run
+    parser.add_argument(
+        "--dns-ttl",
+        type=float,
+        default=DEFAULT_DNS_TTL,
+        help="Seconds to cache resolved hostnames for.",
+    )
+    parser.add_argument(
+        "--no-dns-cache",
+        action="store_true",
+        help="Disable the DNS cache, resolving hostnames on every connection.",
+    )
+    ## Timeouts bounding how long a single check can take
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        help="Seconds to wait for a connection & TLS handshake.",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=DEFAULT_READ_TIMEOUT,
+        help="Seconds to wait on each read once connected.",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Maximum total seconds per check, including retries & redirects.",
+    )
+    ## Redirect hop limit
+    parser.add_argument(
+        "--max-redirects",
+        type=int,
+        default=DEFAULT_MAX_REDIRECTS,
+        help="Maximum number of redirects to follow (0 to not follow redirects).",
+    )
+    ## Cap on response body bytes read per request
+    parser.add_argument(
+        "--max-body-bytes",
+        type=int,
+        default=DEFAULT_MAX_BODY_BYTES,
+        help="Maximum bytes of a response body to read before closing the connection.",
+    )
+    ## Body content assertions
+    parser.add_argument(
+        "--expect-text",
+        action="append",
+        default=[],
+        help="Text the response body must contain. Can be repeated.",
+    )
+    parser.add_argument(
+        "--expect-regex",
+        action="append",
+        default=[],
+        help="Regular expression the response body must match. Can be repeated.",
+    )
+    parser.add_argument(
+        "--expect-json-path",
+        action="append",
+        default=[],
+        help="Path (with optional =VALUE) a JSON response body must contain, i.e. 'status=ok'. Can be repeated.",
+    )
+    ## Machine-readable results
+    parser.add_argument(
+        "--output",
+        default=None,
+        choices=list(RESULT_WRITERS),
+        help="Write one record per check to stdout (or --output-file) in this format.",
+    )
+    parser.add_argument(
+        "--output-file",
+        default="-",
+        help="File to write --output records to ('-' for stdout).",
+    )
+    parser.add_argument(
+        "--summary-top",
+        type=int,
+        default=DEFAULT_SUMMARY_TOP,
+        help="Number of slowest sites to list in the end-of-run summary.",
+    )
+    ## Prometheus metrics endpoint
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics of the checks on this port at /metrics.",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        default=DEFAULT_METRICS_HOST,
+        help="Address to serve --metrics-port on (0.0.0.0 for every interface).",
+    )
+    ## Watch mode, keeping the process alive & re-checking sites on an interval
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep checking sites every --interval seconds until interrupted.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help="Seconds between checks of the same site in --watch mode.",
+    )
+    ## Check engine: blocking http.client on a thread pool, or asyncio streams
+    parser.add_argument(
+        "--engine",
+        default="thread",
+        choices=["thread", "async"],
+        help="Run checks on a thread pool or on a single asyncio event loop.",
+    )
 
-    return parser.parse_args()
+    args: argparse.Namespace = parser.parse_args()
 
+    if args.watch and args.engine != "thread":
+        parser.error("--watch is only supported with --engine thread")
+    if args.interval <= 0:
+        parser.error("--interval must be greater than 0")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.watch:
+        parser.error("--workers is not supported with --watch")
+    ## Same bounds as a `--config` check's settings
+    for name in ("connect_timeout", "read_timeout", "deadline"):
+        if getattr(args, name) is not None and getattr(args, name) <= 0:
+            parser.error(f"--{name.replace('_', '-')} must be greater than 0")
+    if args.retries < 1:
+        parser.error("--retries must be at least 1")
+    if args.max_redirects < 0:
+        parser.error("--max-redirects must not be negative")
+    if args.sleep < 0:
+        parser.error("--sleep must not be negative")
+    if args.max_body_bytes < 0:
+        parser.error("--max-body-bytes must not be negative")
+    if args.cert_warn_days is not None and args.cert_warn_days < 0:
+        parser.error("--cert-warn-days must not be negative")
+    if args.summary_top < 0:
+        parser.error("--summary-top must not be negative")
+    if args.metrics_port is not None and not 0 <= args.metrics_port <= 65535:
+        parser.error("--metrics-port must be within 0-65535")
 
-def main() -> None:
-    args: argparse.Namespace = parse_args()
+    ## Parse the request headers & body once, reporting invalid JSON as a usage error
+    try:
+        args.headers = json.loads(args.headers) if args.headers else {}
+        args.body = json.loads(args.body) if args.body else None
+    except json.JSONDecodeError as exc:
+        parser.error(f"--headers & --body must be valid JSON: {exc}")
+    if not isinstance(args.headers, dict) or not all(
+        isinstance(value, str) for value in args.headers.values()
+    ):
+        parser.error("--headers must be a JSON object of strings")
+    ## Bodies from the CLI are JSON, so say so unless the headers already did
+    if args.body is not None and "content-type" not in {
+        key.lower() for key in args.headers
+    }:
+        args.headers["Content-Type"] = "application/json"
 
-    ## Create an instance of ConnectionManager with headers and body
-    headers: dict[str, str] = {"Content-Type": "application/json"}
-    ## Load body from JSON string, if provided
-    body: t.Any | None = json.loads(args.body) if args.body else None
+    try:
+        args.classifier = StatusClassifier.from_specs(
+            args.success_codes, args.failure_codes
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
 
-    connection_manager = ConnectionManager(url=args.site, headers=headers, body=body)
+    ## Compile body expectations up front, so mistakes are reported before any request
+    args.expect = []
+    try:
+        args.expect.extend(TextMatcher(text) for text in args.expect_text)
+        args.expect.extend(RegexMatcher(pattern) for pattern in args.expect_regex)
+        args.expect.extend(JSONPathMatcher(path) for path in args.expect_json_path)
+    except (re.error, ValueError) as exc:
+        parser.error(f"Invalid body expectation: {exc}")
+    ## A `--config` check can set its own method, so it's validated when loaded instead
+    if args.expect and args.probe:
+        parser.error("--expect-* options can't be combined with --probe, which reads no response")
+    if args.expect and args.method in ("HEAD", AUTO_METHOD) and not args.config:
+        parser.error("--expect-* options need a method with a response body, i.e. --method GET")
 
-    ## Make the request with the specified sleep and retries
-    res: dict[str, t.Any] = connection_manager.send_request(
-        method=args.method, sleep=args.sleep, retries=args.retries
-    )
+    return args
 
-    if res is None:
-        log.error(f"Failed to connect to site: {args.site}.")
-        exit(1)
 
-    result: HTTPResponse = HTTPResponse(
-        status_code=res["status_code"], reason=res["reason"], headers=res["headers"]
+def _process_check_kwargs(args: argparse.Namespace, shards: int = 1) -> dict[str, t.Any]:
+    """The `check_kwargs` that can't be shared between processes, built from `args`.
+
+    With `--workers`, each of the `shards` processes builds its own, and gets an equal share
+    of the `--retry-budget`.
+    """
+    budget: RetryBudget | None = (
+        RetryBudget(
+            (args.retry_budget + shards - 1) // shards,
+            ## In watch mode, give the whole budget back once per round
+            refill_per_second=args.retry_budget / args.interval if args.watch else 0.0,
+        )
+        if args.retry_budget is not None
+        else None
+    )
+    retry_policy: RetryPolicy = (
+        RetryPolicy(base_delay=args.sleep, max_delay=args.max_delay, budget=budget)
+        if args.backoff == "exponential"
+        else RetryPolicy.constant(
+            args.sleep, max_delay=max(args.sleep, args.max_delay), budget=budget
+        )
     )
 
-    # Check if the status code is in success or failure codes
-    if result.status_code in args.success_codes:
-        log.info(f"Success: {result.status_code} {result.reason}")
-    elif result.status_code in args.failure_codes:
-        log.error(f"Failure: {result.status_code} {result.reason}")
+    return {
+        "ssl_context": get_ssl_context(
+            cafile=args.ca_file, min_tls_version=args.min_tls_version
+        ),
+        "dns_cache": None if args.no_dns_cache else DNSCache(ttl=args.dns_ttl),
+        "retry_policy": retry_policy,
+        "validators": ValidatorCache() if args.conditional else None,
+    }
+
+
+def _run_checks(
+    args: argparse.Namespace,
+    sites: list[CheckSpec],
+    check_kwargs: dict[str, t.Any],
+    process_kwargs: dict[str, t.Any],
+    report: t.Callable[[CheckResult], None],
+) -> None:
+    """Run the checks on the engine selected by `args`, passing each result to `report`.
+
+    `process_kwargs` are this process's `_process_check_kwargs()`, which workers build their own of.
+    """
+    ## Shard the checks across processes, each building its own SSL context, DNS cache etc.
+    if args.workers > 1:
+
+        results: t.Iterator[CheckResult] = check_sites_sharded(
+            sites,
+            workers=args.workers,
+            engine=args.engine,
+            pool_size=args.pool_size,
+            pool_idle_timeout=args.pool_idle_timeout or DEFAULT_POOL_IDLE_TIMEOUT,
+            setup=functools.partial(_process_check_kwargs, args, args.workers),
+            **check_kwargs,
+        )
+        try:
+            for result in results:
+                report(result)
+        except KeyboardInterrupt:
+            log.info("Interrupted, stopping checks")
+        return
+
+    check_kwargs = {**check_kwargs, **process_kwargs}
+
+    ## Make the requests with the specified sleep and retries
+    if args.engine == "async":
+
+        async def _run_async() -> None:
+            async for result in check_sites_async(sites, **check_kwargs):
+                report(result)
+
+        asyncio.run(_run_async())
+    else:
+        ## In watch mode, keep connections long enough to be reused by the next round
+        pool_idle_timeout: float = args.pool_idle_timeout or (
+            max(DEFAULT_POOL_IDLE_TIMEOUT, args.interval * 2)
+            if args.watch
+            else DEFAULT_POOL_IDLE_TIMEOUT
+        )
+        pool: ConnectionPool | None = (
+            ConnectionPool(max_per_host=args.pool_size, idle_timeout=pool_idle_timeout)
+            if args.pool_size > 0
+            else None
+        )
+
+        results = (
+            watch_sites(sites, interval=args.interval, pool=pool, **check_kwargs)
+            if args.watch
+            else check_sites(sites, pool=pool, **check_kwargs)
+        )
+
+        try:
+            for result in results:
+                report(result)
+        except KeyboardInterrupt:
+            log.info("Interrupted, stopping checks")
+        finally:
+            if pool is not None:
+                log.info(
+                    f"Connection pool: {pool.hits} hit(s), {pool.misses} miss(es)"
+                )
+                pool.close()
+
+
+def main() -> None:
+    args: argparse.Namespace = parse_args()
+
+    ## Compile every check once, so repeated rounds don't re-parse & re-encode them
+    if args.config:
+        try:
+            specs: list[CheckSpec] = load_config(
+                args.config,
+                method=args.method,
+                headers=args.headers,
+                body=args.body,
+                success_codes=args.success_codes,
+                failure_codes=args.failure_codes,
+                expect=args.expect,
+                probe=args.probe,
+            )
+        except ConfigError as exc:
+            log.error(f"Invalid config: {exc}")
+            ## Same exit code as any other invalid argument
+            exit(2)
     else:
-        log.warning(f"Unexpected status: {result.status_code} {result.reason}")
+        try:
+            sites: list[str] = [args.site] if args.site else load_sites(args.sites_file)
+        except OSError as exc:
+            msg = f"({type(exc)}) Can't read sites file '{args.sites_file}'. Details: {exc}"
+            log.error(msg)
+            exit(2)
+        if not sites:
+            log.error(f"No sites found in: {args.sites_file}")
+            exit(2)
+
+        try:
+            specs = [
+                compile_check(
+                    site,
+                    method=args.method,
+                    headers=args.headers,
+                    body=args.body,
+                    classifier=args.classifier,
+                )
+                for site in sites
+            ]
+        except ValueError as exc:
+            log.error(f"Invalid check: {exc}")
+            exit(2)
+
+    check_kwargs: dict[str, t.Any] = {
+        "concurrency": args.concurrency,
+        "sleep": args.sleep,
+        "retries": args.retries,
+        "connect_timeout": args.connect_timeout,
+        "read_timeout": args.read_timeout,
+        "deadline": args.deadline,
+        "max_redirects": args.max_redirects,
+        "max_body_bytes": args.max_body_bytes,
+        "expect": args.expect,
+        "probe": args.probe,
+    }
+
+    ## Built before any output is opened or worker started, so i.e. an invalid `--ca-file` is a usage error
+    try:
+        process_kwargs: dict[str, t.Any] = _process_check_kwargs(args)
+    except OSError as exc:
+        ## Also catches `ssl.SSLError`, i.e. a `--ca-file` that isn't a certificate
+        msg = f"({type(exc)}) Can't load the SSL context. Details: {exc}"
+        log.error(msg)
+        exit(2)
+
+    summary = Summary(top=args.summary_top)
+
+    output_file: t.TextIO | None = None
+    writer: ResultWriter | None = None
+    if args.output:
+        try:
+            output_file = (
+                sys.stdout
+                if args.output_file == "-"
+                else open(args.output_file, "w", encoding="utf-8", newline="")
+            )
+        except OSError as exc:
+            msg = f"({type(exc)}) Can't write output file '{args.output_file}'. Details: {exc}"
+            log.error(msg)
+            exit(2)
+        writer = RESULT_WRITERS[args.output](output_file)
+
+    metrics: Metrics | None = None
+    metrics_server: MetricsServer | None = None
+    if args.metrics_port is not None:
+        metrics = Metrics()
+        try:
+            metrics_server = MetricsServer(
+                metrics, host=args.metrics_host, port=args.metrics_port
+            ).start()
+        except OSError as exc:
+            msg = f"({type(exc)}) Can't serve metrics on {args.metrics_host}:{args.metrics_port}. Details: {exc}"
+            log.error(msg)
+            exit(2)
+
+    def _report(result: CheckResult) -> None:
+        classification: str = report_result(
+            result, classifier=args.classifier, cert_warn_days=args.cert_warn_days
+        )
+        summary.add(result, classification)
+        if metrics is not None:
+            metrics.observe(result, classification)
+        if writer is not None:
+            writer.write(result_record(result, classification))
+
+    try:
+        _run_checks(args, specs, check_kwargs, process_kwargs, _report)
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        ## Finish the output (i.e. close the JSON array) even if the run was interrupted
+        if writer is not None:
+            writer.close()
+        if output_file is not None and output_file is not sys.stdout:
+            output_file.close()
+
+    if len(specs) > 1 or args.watch:
+        summary.report()
+
+    sys.exit(summary.exit_code)
 
 
 if __name__ == "__main__":
@@ -2,4 +2,5 @@ from __future__ import annotations
 
 pytest_plugins: list[str] = [
     "tests.fixtures.connection_manager_fixtures",
+    "tests.fixtures.server_fixtures",
 ]
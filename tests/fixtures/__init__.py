@@ -1,4 +1,10 @@
 from __future__ import annotations
 
-from . import connection_manager_fixtures
+from . import connection_manager_fixtures, server_fixtures
 from .connection_manager_fixtures import retry_times, sleep_time
+from .server_fixtures import (
+    blackhole_server,
+    stub_ca_file,
+    stub_server,
+    stub_tls_server,
+)
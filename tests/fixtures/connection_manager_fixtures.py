@@ -1,11 +1,24 @@
 from __future__ import annotations
 
-import pytest
+import asyncio
+import typing as t
+
+from sitecheck import (
+    CheckResult,
+    CheckSpec,
+    ConnectionManager,
+    StatusClassifier,
+    check_site,
+    check_site_async,
+    get_ssl_context,
+)
 
+import pytest
 
 @pytest.fixture()
 def sleep_time() -> int:
-    return 2
+    ## The stub server never rate limits, so there's no need to wait between retries
+    return 0
 
 
 @pytest.fixture()
@@ -14,5 +27,53 @@ def retry_times() -> int:
 
 
 @pytest.fixture()
-def invalid_site() -> str:
-    return "http://111.222"
+def invalid_site(closed_port_url: str) -> str:
+    ## Refused locally, so the suite runs offline
+    return closed_port_url
+
+
+@pytest.fixture(params=["http", "https"])
+def stub_connection_manager(
+    request: pytest.FixtureRequest,
+) -> t.Callable[[str], ConnectionManager]:
+    """Build `ConnectionManager`s for a path on the stub server, over HTTP & HTTPS."""
+    if request.param == "https":
+        base_url: str = request.getfixturevalue("stub_tls_server")
+        ssl_context = get_ssl_context(cafile=request.getfixturevalue("stub_ca_file"))
+    else:
+        base_url = request.getfixturevalue("stub_server")
+        ssl_context = None
+
+    def _connection_manager(path: str) -> ConnectionManager:
+        return ConnectionManager(url=f"{base_url}{path}", ssl_context=ssl_context)
+
+    return _connection_manager
+
+
+@pytest.fixture()
+def classifier() -> StatusClassifier:
+    ## Matches the stub server's `/200` & `/404` paths
+    return StatusClassifier.from_specs(success=[200], failure=[404])
+
+
+@pytest.fixture(params=["thread", "async"])
+def engine(request: pytest.FixtureRequest) -> str:
+    return request.param
+
+
+@pytest.fixture()
+def run_check(engine: str) -> t.Callable[..., CheckResult]:
+    """Run checks with `check_site()` or `check_site_async()`, per the `engine` fixture.
+
+    Description:
+        Retries don't sleep unless a test passes its own `sleep`.
+    """
+
+    def _run_check(site: str | CheckSpec, **kwargs: t.Any) -> CheckResult:
+        kwargs.setdefault("sleep", 0)
+        if engine == "async":
+            return asyncio.run(check_site_async(site, **kwargs))
+
+        return check_site(site, **kwargs)
+
+    return _run_check
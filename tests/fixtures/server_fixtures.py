@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import re
+import socket
+import ssl
+import threading
+import time
+import typing as t
+import urllib.parse
+
+import pytest
+
+## Self-signed key & certificate for 'localhost'/127.0.0.1, valid until 2126
+STUB_SERVER_PEM: Path = Path(__file__).parent / "stub_server.pem"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Respond with the status code given in the request path, i.e. `/404`.
+
+    Query params:
+        - `delay=<seconds>`: Wait before responding.
+        - `retry_after=<value>`: Send a `Retry-After` header.
+        - `location=<url>`: Send a `Location` header, `self` pointing back at the request path.
+        - `redirects=<n>`: Redirect with the path's status to the same URL with `redirects=<n - 1>`,
+            responding `200` once `n` reaches `0`.
+        - `size=<bytes>`: Respond with a body of `size` bytes instead of the status code.
+        - `body=<text>`: Respond with `text` as the body, after `size` bytes of padding if given.
+        - `chunked=1`: Send the body with chunked transfer encoding.
+        - `succeed_after=<n>&id=<key>`: Respond `200` once `n` requests with the same `id` were answered.
+        - `drop=1`: Close the connection without responding.
+        - `truncate=<bytes>`: Announce the whole body, but close the connection after `truncate` bytes.
+        - `etag=<tag>`: Send an `ETag`, answering `304` when the request's `If-None-Match` matches it.
+        - `last_modified=<date>`: Send a `Last-Modified`, answering `304` when the request's
+            `If-Modified-Since` matches it.
+        - `head_status=<code>`: Respond to `HEAD` requests with `code` instead, i.e. `405`.
+
+    A `Range: bytes=<first>-<last>` request of a `2xx` response is answered `206`, with just those bytes.
+    """
+
+    protocol_version = "HTTP/1.1"
+    ## Headers & body are written separately, which Nagle's algorithm would delay ~40ms
+    disable_nagle_algorithm = True
+
+    ## Requests seen per `id` query param
+    request_counts: dict[str, int] = {}
+    request_counts_lock = threading.Lock()
+
+    def _status_from_path(self) -> int:
+        try:
+            return int(urllib.parse.urlsplit(self.path).path.strip("/") or 200)
+        except ValueError:
+            return 404
+
+    def _respond(self, include_body: bool) -> None:
+        query: dict[str, list[str]] = urllib.parse.parse_qs(
+            urllib.parse.urlsplit(self.path).query
+        )
+        if "delay" in query:
+            time.sleep(float(query["delay"][0]))
+
+        if "drop" in query:
+            self.close_connection = True
+            return
+
+        status: int = self._status_from_path()
+        location: str | None = query.get("location", [None])[0]
+
+        if "redirects" in query:
+            remaining: int = int(query["redirects"][0])
+            if remaining > 0:
+                query["redirects"] = [str(remaining - 1)]
+                path: str = urllib.parse.urlsplit(self.path).path
+                location = f"{path}?{urllib.parse.urlencode(query, doseq=True)}"
+            else:
+                status = 200
+
+        if "succeed_after" in query:
+            key: str = query.get("id", [self.path])[0]
+            with self.request_counts_lock:
+                seen: int = self.request_counts.get(key, 0)
+                self.request_counts[key] = seen + 1
+
+            if seen >= int(query["succeed_after"][0]):
+                status = 200
+
+        if "head_status" in query and self.command == "HEAD":
+            status = int(query["head_status"][0])
+
+        ## Validators of the (never changing) resource
+        validators: dict[str, str] = {}
+        if "etag" in query:
+            validators["ETag"] = f'"{query["etag"][0]}"'
+        if "last_modified" in query:
+            validators["Last-Modified"] = query["last_modified"][0]
+
+        if (
+            "ETag" in validators
+            and self.headers.get("If-None-Match") == validators["ETag"]
+        ) or (
+            "Last-Modified" in validators
+            and self.headers.get("If-Modified-Since") == validators["Last-Modified"]
+        ):
+            self.send_response(304)
+            for key, value in validators.items():
+                self.send_header(key, value)
+            self.end_headers()
+            return
+
+        body: bytes = (
+            b"x" * int(query["size"][0])
+            if "size" in query
+            else f"{status}\n".encode("utf-8")
+        )
+        if "body" in query:
+            body = (body if "size" in query else b"") + query["body"][0].encode("utf-8")
+        chunked: bool = "chunked" in query
+
+        content_range: str | None = None
+        requested = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if requested and 200 <= status < 300 and int(requested[1]) < len(body):
+            first, last = int(requested[1]), min(int(requested[2]), len(body) - 1)
+            content_range = f"bytes {first}-{last}/{len(body)}"
+            body = body[first : last + 1]
+            status = 206
+
+        self.send_response(status)
+        if "retry_after" in query:
+            self.send_header("Retry-After", query["retry_after"][0])
+        if location is not None:
+            self.send_header("Location", self.path if location == "self" else location)
+        for key, value in validators.items():
+            self.send_header(key, value)
+        if content_range is not None:
+            self.send_header("Content-Range", content_range)
+        self.send_header("Content-Type", "text/plain")
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if include_body:
+            if "truncate" in query:
+                body = body[: int(query["truncate"][0])]
+                self.close_connection = True
+            self._write_body(body, chunked)
+
+    def _write_body(self, body: bytes, chunked: bool) -> None:
+        try:
+            if chunked:
+                for start in range(0, len(body), 4096):
+                    chunk: bytes = body[start : start + 4096]
+                    self.wfile.write(
+                        f"{len(chunk):x}\r\n".encode("ascii") + chunk + b"\r\n"
+                    )
+                self.wfile.write(b"0\r\n\r\n")
+            else:
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            ## Clients stop reading long bodies early & drop the connection
+            self.close_connection = True
+
+    def do_HEAD(self) -> None:
+        self._respond(include_body=False)
+
+    def do_GET(self) -> None:
+        self._respond(include_body=True)
+
+    def do_POST(self) -> None:
+        ## Consume the request body so the connection stays usable
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond(include_body=True)
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        pass
+
+
+def _serve(server: ThreadingHTTPServer) -> None:
+    server.daemon_threads = True
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+
+@pytest.fixture(scope="session")
+def stub_server() -> t.Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    _serve(server)
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def closed_port_url() -> str:
+    """A local URL nothing listens on, so connecting to it is refused without any network."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port: int = sock.getsockname()[1]
+    sock.close()
+
+    return f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture(scope="session")
+def stub_ca_file() -> str:
+    return str(STUB_SERVER_PEM)
+
+
+@pytest.fixture(scope="session")
+def stub_tls_server() -> t.Iterator[str]:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(STUB_SERVER_PEM)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    _serve(server)
+
+    yield f"https://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="session")
+def blackhole_server() -> t.Iterator[str]:
+    """A port that accepts connections but never responds."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(128)
+
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    sock.close()
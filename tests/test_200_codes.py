@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import logging
 import typing as t
-import time
 
 log = logging.getLogger(__name__)
 
@@ -21,8 +20,12 @@ logging.basicConfig(
 # 200 #
 #######
 @pytest.mark.xfail
-def test_fail_get_200_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/200")
+def test_fail_get_200_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -32,14 +35,13 @@ def test_fail_get_200_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_200_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/200")
+def test_get_200_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -49,15 +51,14 @@ def test_get_200_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_200_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/200")
+def test_fail_head_200_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -67,14 +68,13 @@ def test_fail_head_200_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_200_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/200")
+def test_head_200_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -84,18 +84,17 @@ def test_head_200_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 201 #
 #######
 @pytest.mark.xfail
-def test_fail_get_201_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/201")
+def test_fail_get_201_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/201")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -105,14 +104,13 @@ def test_fail_get_201_response(sleep_time: int, retry_times: int):
         f"Expected 201 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_201_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/201")
+def test_get_201_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/201")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -122,15 +120,14 @@ def test_get_201_response(sleep_time: int, retry_times: int):
         f"Expected 201 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_201_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/201")
+def test_fail_head_201_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/201")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -140,14 +137,13 @@ def test_fail_head_201_response(sleep_time: int, retry_times: int):
         f"Expected 201 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_head_201_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/201")
+def test_get_head_201_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/201")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -157,18 +153,17 @@ def test_get_head_201_response(sleep_time: int, retry_times: int):
         f"Expected 201 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 202 #
 #######
 @pytest.mark.xfail
-def test_fail_get_202_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/202")
+def test_fail_get_202_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/202")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -178,14 +173,13 @@ def test_fail_get_202_response(sleep_time: int, retry_times: int):
         f"Expected 202 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_202_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/202")
+def test_get_202_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/202")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -195,15 +189,14 @@ def test_get_202_response(sleep_time: int, retry_times: int):
         f"Expected 202 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_202_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/202")
+def test_fail_head_202_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/202")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -213,14 +206,13 @@ def test_fail_head_202_response(sleep_time: int, retry_times: int):
         f"Expected 202 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_head_202_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/202")
+def test_get_head_202_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/202")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -229,8 +221,3 @@ def test_get_head_202_response(sleep_time: int, retry_times: int):
     assert res["status_code"] == 202, ValueError(
         f"Expected 202 response code, got: {res['status_code']}"
     )
-
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import logging
 import typing as t
-import time
 
 log = logging.getLogger(__name__)
 
@@ -21,8 +20,12 @@ logging.basicConfig(
 # 300 #
 #######
 @pytest.mark.xfail
-def test_fail_get_300_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/300")
+def test_fail_get_300_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/300")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -32,14 +35,13 @@ def test_fail_get_300_response(sleep_time: int, retry_times: int):
         f"Expected 300 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_300_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/300")
+def test_get_300_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/300")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -49,15 +51,14 @@ def test_get_300_response(sleep_time: int, retry_times: int):
         f"Expected 300 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_300_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/300")
+def test_fail_head_300_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/300")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -67,14 +68,13 @@ def test_fail_head_300_response(sleep_time: int, retry_times: int):
         f"Expected 300 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_head_300_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/300")
+def test_head_300_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/300")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -84,18 +84,17 @@ def test_head_300_response(sleep_time: int, retry_times: int):
         f"Expected 300 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 301 #
 #######
 @pytest.mark.xfail
-def test_fail_get_301_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/301")
+def test_fail_get_301_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/301?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -105,14 +104,13 @@ def test_fail_get_301_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_301_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/301")
+def test_get_301_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/301?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -122,15 +120,14 @@ def test_get_301_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_301_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/301")
+def test_fail_head_301_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/301?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -140,14 +137,13 @@ def test_fail_head_301_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_301_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/301")
+def test_head_301_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/301?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -157,18 +153,17 @@ def test_head_301_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 302 #
 #######
 @pytest.mark.xfail
-def test_fail_get_302_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/302")
+def test_fail_get_302_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/302?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -178,14 +173,13 @@ def test_fail_get_302_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_302_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/302")
+def test_get_302_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/302?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -195,15 +189,14 @@ def test_get_302_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_302_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/302")
+def test_fail_head_302_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/302?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -213,14 +206,13 @@ def test_fail_head_302_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_302_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/302")
+def test_head_302_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/302?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -230,18 +222,17 @@ def test_head_302_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 303 #
 #######
 @pytest.mark.xfail
-def test_fail_get_303_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/303")
+def test_fail_get_303_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/303?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -251,14 +242,13 @@ def test_fail_get_303_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_303_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/303")
+def test_get_303_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/303?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -268,15 +258,14 @@ def test_get_303_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_303_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/303")
+def test_fail_head_303_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/303?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -286,14 +275,13 @@ def test_fail_head_303_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_head_303_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/303")
+def test_head_303_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/303?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -303,18 +291,17 @@ def test_head_303_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 304 #
 #######
 @pytest.mark.xfail
-def test_fail_get_304_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/304")
+def test_fail_get_304_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/304")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -324,14 +311,13 @@ def test_fail_get_304_response(sleep_time: int, retry_times: int):
         f"Expected 304 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_304_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/304")
+def test_get_304_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/304")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -341,15 +327,14 @@ def test_get_304_response(sleep_time: int, retry_times: int):
         f"Expected 304 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_304_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/304")
+def test_fail_head_304_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/304")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -359,14 +344,13 @@ def test_fail_head_304_response(sleep_time: int, retry_times: int):
         f"Expected 304 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_head_304_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/304")
+def test_head_304_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/304")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -376,18 +360,17 @@ def test_head_304_response(sleep_time: int, retry_times: int):
         f"Expected 304 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 307 #
 #######
 @pytest.mark.xfail
-def test_fail_get_307_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/307")
+def test_fail_get_307_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/307?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -397,14 +380,13 @@ def test_fail_get_307_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_307_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/307")
+def test_get_307_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/307?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -414,15 +396,14 @@ def test_get_307_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_307_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/307")
+def test_fail_head_307_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/307?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -432,14 +413,13 @@ def test_fail_head_307_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_307_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/307")
+def test_head_307_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/307?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -449,18 +429,17 @@ def test_head_307_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 308 #
 #######
 @pytest.mark.xfail
-def test_fail_get_308_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/308")
+def test_fail_get_308_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/308?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -470,14 +449,13 @@ def test_fail_get_308_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_308_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/308")
+def test_get_308_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/308?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -487,15 +465,14 @@ def test_get_308_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_308_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/308")
+def test_fail_head_308_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/308?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -505,14 +482,13 @@ def test_fail_head_308_response(sleep_time: int, retry_times: int):
         f"Expected 200 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_308_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/308")
+def test_head_308_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/308?location=/200")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -521,8 +497,3 @@ def test_head_308_response(sleep_time: int, retry_times: int):
     assert res["status_code"] == 200, ValueError(
         f"Expected 200 response code, got: {res['status_code']}"
     )
-
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import logging
 import typing as t
-import time
 
 log = logging.getLogger(__name__)
 
@@ -21,8 +20,12 @@ logging.basicConfig(
 # 400 #
 #######
 @pytest.mark.xfail
-def test_fail_get_400_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/400")
+def test_fail_get_400_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/400")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -32,14 +35,13 @@ def test_fail_get_400_response(sleep_time: int, retry_times: int):
         f"Expected 400 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_400_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/400")
+def test_get_400_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/400")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -49,15 +51,14 @@ def test_get_400_response(sleep_time: int, retry_times: int):
         f"Expected 400 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_400_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/400")
+def test_fail_head_400_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/400")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -67,14 +68,13 @@ def test_fail_head_400_response(sleep_time: int, retry_times: int):
         f"Expected 400 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_400_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/400")
+def test_head_400_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/400")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -84,18 +84,17 @@ def test_head_400_response(sleep_time: int, retry_times: int):
         f"Expected 400 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 401 #
 #######
 @pytest.mark.xfail
-def test_fail_get_401_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/401")
+def test_fail_get_401_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/401")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -105,14 +104,13 @@ def test_fail_get_401_response(sleep_time: int, retry_times: int):
         f"Expected 401 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_401_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/401")
+def test_get_401_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/401")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -122,15 +120,14 @@ def test_get_401_response(sleep_time: int, retry_times: int):
         f"Expected 401 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_401_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/401")
+def test_fail_head_401_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/401")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -140,14 +137,13 @@ def test_fail_head_401_response(sleep_time: int, retry_times: int):
         f"Expected 401 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_head_401_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/401")
+def test_head_401_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/401")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -157,18 +153,17 @@ def test_head_401_response(sleep_time: int, retry_times: int):
         f"Expected 401 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 402 #
 #######
 @pytest.mark.xfail
-def test_fail_get_402_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/402")
+def test_fail_get_402_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/402")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -178,14 +173,13 @@ def test_fail_get_402_response(sleep_time: int, retry_times: int):
         f"Expected 402 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_402_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/402")
+def test_get_402_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/402")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -195,15 +189,14 @@ def test_get_402_response(sleep_time: int, retry_times: int):
         f"Expected 402 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_402_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/402")
+def test_fail_head_402_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/402")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -213,14 +206,13 @@ def test_fail_head_402_response(sleep_time: int, retry_times: int):
         f"Expected 402 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_402_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/402")
+def test_head_402_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/402")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -230,18 +222,17 @@ def test_head_402_response(sleep_time: int, retry_times: int):
         f"Expected 402 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 404 #
 #######
 @pytest.mark.xfail
-def test_fail_get_404_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/404")
+def test_fail_get_404_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/404")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -251,14 +242,13 @@ def test_fail_get_404_response(sleep_time: int, retry_times: int):
         f"Expected 404 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_404_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/404")
+def test_get_404_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/404")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -268,15 +258,14 @@ def test_get_404_response(sleep_time: int, retry_times: int):
         f"Expected 404 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_404_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/404")
+def test_fail_head_404_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/404")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -286,14 +275,13 @@ def test_fail_head_404_response(sleep_time: int, retry_times: int):
         f"Expected 404 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_head_404_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/404")
+def test_head_404_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/404")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -303,18 +291,17 @@ def test_head_404_response(sleep_time: int, retry_times: int):
         f"Expected 404 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 405 #
 #######
 @pytest.mark.xfail
-def test_fail_get_405_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/405")
+def test_fail_get_405_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/405")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -324,14 +311,13 @@ def test_fail_get_405_response(sleep_time: int, retry_times: int):
         f"Expected 405 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_405_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/405")
+def test_get_405_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/405")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -341,15 +327,14 @@ def test_get_405_response(sleep_time: int, retry_times: int):
         f"Expected 405 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_405_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/405")
+def test_fail_head_405_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/405")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -359,14 +344,13 @@ def test_fail_head_405_response(sleep_time: int, retry_times: int):
         f"Expected 405 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_405_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/405")
+def test_head_405_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/405")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -376,18 +360,17 @@ def test_head_405_response(sleep_time: int, retry_times: int):
         f"Expected 405 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 406 #
 #######
 @pytest.mark.xfail
-def test_fail_get_406_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/406")
+def test_fail_get_406_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/406")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -397,14 +380,13 @@ def test_fail_get_406_response(sleep_time: int, retry_times: int):
         f"Expected 406 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_406_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/406")
+def test_get_406_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/406")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -414,15 +396,14 @@ def test_get_406_response(sleep_time: int, retry_times: int):
         f"Expected 406 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_406_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/406")
+def test_fail_head_406_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/406")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -432,14 +413,13 @@ def test_fail_head_406_response(sleep_time: int, retry_times: int):
         f"Expected 406 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_head_406_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/406")
+def test_head_406_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/406")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -449,18 +429,17 @@ def test_head_406_response(sleep_time: int, retry_times: int):
         f"Expected 406 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 407 #
 #######
 @pytest.mark.xfail
-def test_fail_get_407_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/407")
+def test_fail_get_407_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/407")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -470,14 +449,13 @@ def test_fail_get_407_response(sleep_time: int, retry_times: int):
         f"Expected 407 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_407_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/407")
+def test_get_407_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/407")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -487,15 +465,14 @@ def test_get_407_response(sleep_time: int, retry_times: int):
         f"Expected 407 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_407_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/407")
+def test_fail_head_407_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/407")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -505,14 +482,13 @@ def test_fail_head_407_response(sleep_time: int, retry_times: int):
         f"Expected 407 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_407_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/407")
+def test_head_407_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/407")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -522,18 +498,17 @@ def test_head_407_response(sleep_time: int, retry_times: int):
         f"Expected 407 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 408 #
 #######
 @pytest.mark.xfail
-def test_fail_get_408_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/408")
+def test_fail_get_408_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/408")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -543,14 +518,13 @@ def test_fail_get_408_response(sleep_time: int, retry_times: int):
         f"Expected 408 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_408_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/408")
+def test_get_408_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/408")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -560,15 +534,14 @@ def test_get_408_response(sleep_time: int, retry_times: int):
         f"Expected 408 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_408_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/408")
+def test_fail_head_408_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/408")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -578,14 +551,13 @@ def test_fail_head_408_response(sleep_time: int, retry_times: int):
         f"Expected 408 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_408_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/408")
+def test_head_408_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/408")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -595,18 +567,17 @@ def test_head_408_response(sleep_time: int, retry_times: int):
         f"Expected 408 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 409 #
 #######
 @pytest.mark.xfail
-def test_fail_get_409_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/409")
+def test_fail_get_409_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/409")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -616,14 +587,13 @@ def test_fail_get_409_response(sleep_time: int, retry_times: int):
         f"Expected 409 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_409_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/409")
+def test_get_409_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/409")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -633,15 +603,14 @@ def test_get_409_response(sleep_time: int, retry_times: int):
         f"Expected 409 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_409_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/409")
+def test_fail_head_409_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/409")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -651,14 +620,13 @@ def test_fail_head_409_response(sleep_time: int, retry_times: int):
         f"Expected 409 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_409_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/409")
+def test_head_409_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/409")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -668,18 +636,17 @@ def test_head_409_response(sleep_time: int, retry_times: int):
         f"Expected 409 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 410 #
 #######
 @pytest.mark.xfail
-def test_fail_get_410_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/410")
+def test_fail_get_410_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/410")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -689,14 +656,13 @@ def test_fail_get_410_response(sleep_time: int, retry_times: int):
         f"Expected 410 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_410_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/410")
+def test_get_410_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/410")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -706,15 +672,14 @@ def test_get_410_response(sleep_time: int, retry_times: int):
         f"Expected 410 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_410_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/410")
+def test_fail_head_410_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/410")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -724,14 +689,13 @@ def test_fail_head_410_response(sleep_time: int, retry_times: int):
         f"Expected 410 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_410_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/410")
+def test_head_410_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/410")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -741,18 +705,17 @@ def test_head_410_response(sleep_time: int, retry_times: int):
         f"Expected 410 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 415 #
 #######
 @pytest.mark.xfail
-def test_fail_get_415_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/415")
+def test_fail_get_415_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/415")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -762,14 +725,13 @@ def test_fail_get_415_response(sleep_time: int, retry_times: int):
         f"Expected 415 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_415_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/415")
+def test_get_415_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/415")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -779,15 +741,14 @@ def test_get_415_response(sleep_time: int, retry_times: int):
         f"Expected 415 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_415_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/415")
+def test_fail_head_415_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/415")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -797,14 +758,13 @@ def test_fail_head_415_response(sleep_time: int, retry_times: int):
         f"Expected 415 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_head_415_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/415")
+def test_head_415_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/415")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -813,8 +773,3 @@ def test_head_415_response(sleep_time: int, retry_times: int):
     assert res["status_code"] == 415, ValueError(
         f"Expected 415 response code, got: {res['status_code']}"
     )
-
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
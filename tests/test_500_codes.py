@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import logging
 import typing as t
-import time
 
 log = logging.getLogger(__name__)
 
@@ -21,8 +20,12 @@ logging.basicConfig(
 # 500 #
 #######
 @pytest.mark.xfail
-def test_fail_get_500_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/500")
+def test_fail_get_500_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/500")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -32,14 +35,13 @@ def test_fail_get_500_response(sleep_time: int, retry_times: int):
         f"Expected 500 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_500_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/500")
+def test_get_500_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/500")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -49,15 +51,14 @@ def test_get_500_response(sleep_time: int, retry_times: int):
         f"Expected 500 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_500_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/500")
+def test_fail_head_500_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/500")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -67,14 +68,13 @@ def test_fail_head_500_response(sleep_time: int, retry_times: int):
         f"Expected 500 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_500_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/500")
+def test_head_500_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/500")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -84,18 +84,17 @@ def test_head_500_response(sleep_time: int, retry_times: int):
         f"Expected 500 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 501 #
 #######
 @pytest.mark.xfail
-def test_fail_get_501_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/501")
+def test_fail_get_501_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/501")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -105,14 +104,13 @@ def test_fail_get_501_response(sleep_time: int, retry_times: int):
         f"Expected 501 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_501_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/501")
+def test_get_501_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/501")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -122,15 +120,14 @@ def test_get_501_response(sleep_time: int, retry_times: int):
         f"Expected 501 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_501_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/501")
+def test_fail_head_501_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/501")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -140,14 +137,13 @@ def test_fail_head_501_response(sleep_time: int, retry_times: int):
         f"Expected 501 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_head_501_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/501")
+def test_head_501_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/501")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -157,18 +153,17 @@ def test_head_501_response(sleep_time: int, retry_times: int):
         f"Expected 501 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 502 #
 #######
 @pytest.mark.xfail
-def test_fail_get_502_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/502")
+def test_fail_get_502_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/502")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -178,14 +173,13 @@ def test_fail_get_502_response(sleep_time: int, retry_times: int):
         f"Expected 502 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_502_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/502")
+def test_get_502_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/502")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -195,15 +189,14 @@ def test_get_502_response(sleep_time: int, retry_times: int):
         f"Expected 502 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_502_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/502")
+def test_fail_head_502_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/502")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -213,14 +206,13 @@ def test_fail_head_502_response(sleep_time: int, retry_times: int):
         f"Expected 502 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_502_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/502")
+def test_head_502_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/502")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -230,18 +222,17 @@ def test_head_502_response(sleep_time: int, retry_times: int):
         f"Expected 502 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 503 #
 #######
 @pytest.mark.xfail
-def test_fail_get_503_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/503")
+def test_fail_get_503_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/503")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -251,14 +242,13 @@ def test_fail_get_503_response(sleep_time: int, retry_times: int):
         f"Expected 503 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_get_503_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/503")
+def test_get_503_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/503")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -268,15 +258,14 @@ def test_get_503_response(sleep_time: int, retry_times: int):
         f"Expected 503 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_503_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/503")
+def test_fail_head_503_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/503")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -286,14 +275,13 @@ def test_fail_head_503_response(sleep_time: int, retry_times: int):
         f"Expected 503 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_503_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/503")
+def test_head_503_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/503")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -303,18 +291,17 @@ def test_head_503_response(sleep_time: int, retry_times: int):
         f"Expected 503 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 504 #
 #######
 @pytest.mark.xfail
-def test_fail_get_504_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/504")
+def test_fail_get_504_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/504")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -324,14 +311,13 @@ def test_fail_get_504_response(sleep_time: int, retry_times: int):
         f"Expected 504 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_504_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/504")
+def test_get_504_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/504")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -341,15 +327,14 @@ def test_get_504_response(sleep_time: int, retry_times: int):
         f"Expected 504 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_504_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/504")
+def test_fail_head_504_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/504")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -359,14 +344,13 @@ def test_fail_head_504_response(sleep_time: int, retry_times: int):
         f"Expected 504 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
 
-
-def test_head_504_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/504")
+def test_head_504_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/504")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -376,18 +360,17 @@ def test_head_504_response(sleep_time: int, retry_times: int):
         f"Expected 504 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 #######
 # 511 #
 #######
 @pytest.mark.xfail
-def test_fail_get_511_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/511")
+def test_fail_get_511_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/511")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -397,14 +380,13 @@ def test_fail_get_511_response(sleep_time: int, retry_times: int):
         f"Expected 511 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_get_511_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/511")
+def test_get_511_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/511")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="GET", sleep=sleep_time, retries=retry_times
@@ -414,15 +396,14 @@ def test_get_511_response(sleep_time: int, retry_times: int):
         f"Expected 511 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
 @pytest.mark.xfail
-def test_fail_head_511_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/511")
+def test_fail_head_511_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/511")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -432,14 +413,13 @@ def test_fail_head_511_response(sleep_time: int, retry_times: int):
         f"Expected 511 response code, got: {res['status_code']}"
     )
 
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
-
 
-def test_head_511_response(sleep_time: int, retry_times: int):
-    connection_manager = ConnectionManager(url="https://http.codes/511")
+def test_head_511_response(
+    stub_connection_manager: t.Callable[[str], ConnectionManager],
+    sleep_time: int,
+    retry_times: int,
+):
+    connection_manager = stub_connection_manager("/511")
 
     res: dict[str, t.Any] = connection_manager.send_request(
         method="HEAD", sleep=sleep_time, retries=retry_times
@@ -448,8 +428,3 @@ def test_head_511_response(sleep_time: int, retry_times: int):
     assert res["status_code"] == 511, ValueError(
         f"Expected 511 response code, got: {res['status_code']}"
     )
-
-    # print(
-    #     f"Sleep for {sleep_time} second(s) after request to avoid spamming http.codes/ site."
-    # )
-    # time.sleep(sleep_time)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import AsyncConnectionManager, CheckResult, check_sites_async
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+@pytest.mark.parametrize("method", ["HEAD", "GET"])
+@pytest.mark.parametrize("code", [200, 404, 500])
+def test_async_send_request(stub_server: str, method: str, code: int):
+    connection_manager = AsyncConnectionManager(url=f"{stub_server}/{code}")
+
+    res: dict[str, t.Any] = asyncio.run(
+        connection_manager.send_request(method=method, sleep=0, retries=1)
+    )
+
+    assert res["status_code"] == code
+    assert ("Content-Type", "text/plain") in res["headers"]
+
+
+def test_async_send_request_with_body(stub_server: str):
+    connection_manager = AsyncConnectionManager(
+        url=f"{stub_server}/201", body={"someKey": "someValue"}
+    )
+
+    res: dict[str, t.Any] = asyncio.run(
+        connection_manager.send_request(method="POST", sleep=0, retries=1)
+    )
+
+    assert res["status_code"] == 201
+
+
+def test_async_build_request_matches_body():
+    connection_manager = AsyncConnectionManager(
+        url="example.com/path", body={"someKey": "someValue"}
+    )
+
+    request: bytes = connection_manager._build_request("POST")
+
+    assert request.startswith(b"POST /path HTTP/1.1\r\nHost: example.com\r\n")
+    assert request.endswith(b'\r\n\r\n{"someKey": "someValue"}')
+    assert b"Content-Length: 24\r\n" in request
+
+
+def test_async_invalid_site(invalid_site: str):
+    connection_manager = AsyncConnectionManager(url=invalid_site)
+
+    with pytest.raises(Exception):
+        asyncio.run(connection_manager.send_request(method="GET", sleep=0, retries=2))
+
+
+def test_check_sites_async(stub_server: str):
+    sites: list[str] = [f"{stub_server}/{code}" for code in (200, 302, 404)] * 10
+
+    async def _collect() -> list[CheckResult]:
+        return [r async for r in check_sites_async(sites, concurrency=5, sleep=0)]
+
+    results: list[CheckResult] = asyncio.run(_collect())
+
+    assert sorted(r.site for r in results) == sorted(sites)
+    assert all(r.error is None for r in results)
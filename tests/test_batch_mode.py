@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+import sys
+
+log = logging.getLogger(__name__)
+
+from sitecheck import CheckResult, check_sites, load_sites, main
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def test_load_sites_skips_blanks_and_comments(tmp_path: Path):
+    sites_file: Path = tmp_path / "sites.txt"
+    sites_file.write_text(
+        "# monitored sites\nhttps://example.com\n\n  http://example.org  \n"
+    )
+
+    assert load_sites(str(sites_file)) == ["https://example.com", "http://example.org"]
+
+
+def test_check_sites_returns_one_result_per_site(stub_server: str):
+    sites: list[str] = [f"{stub_server}/{code}" for code in (200, 201, 404, 500)] * 5
+
+    results: list[CheckResult] = list(
+        check_sites(sites, concurrency=4, method="HEAD", sleep=0, retries=1)
+    )
+
+    assert sorted(r.site for r in results) == sorted(sites)
+    for result in results:
+        assert result.error is None
+        assert result.response.status_code == int(result.site.rsplit("/", 1)[1])
+
+
+def test_check_sites_captures_errors(stub_server: str, invalid_site: str):
+    results: list[CheckResult] = list(
+        check_sites(
+            [f"{stub_server}/200", invalid_site], concurrency=2, sleep=0, retries=1
+        )
+    )
+
+    by_site: dict[str, CheckResult] = {r.site: r for r in results}
+    assert by_site[f"{stub_server}/200"].response.status_code == 200
+    assert by_site[invalid_site].response is None
+    assert by_site[invalid_site].error is not None
+
+
+def test_check_sites_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        list(check_sites(["http://127.0.0.1"], concurrency=0))
+
+
+def test_main_rejects_invalid_concurrency(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        sys, "argv", ["sitecheck.py", "--site", "example.com", "--concurrency", "0"]
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == 2
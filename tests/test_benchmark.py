@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import logging
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from benchmarks.benchmark import compare, run_benchmarks
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def _metrics(**overrides: t.Any) -> dict[str, t.Any]:
+    return {
+        "errors": 0,
+        "checks_per_second": 1000.0,
+        "p95_ms": 2.0,
+        "peak_memory_kib": 1024.0,
+        **overrides,
+    }
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(checks=20, concurrency=[2], engines=["thread", "async"])
+
+    assert list(results) == ["thread-c2", "async-c2"]
+    assert results["thread-c2"]["errors"] == 0
+    ## The thread engine reuses pooled connections, the async engine doesn't
+    assert results["thread-c2"]["handshakes_per_check"] < 1
+    assert results["async-c2"]["handshakes_per_check"] == 1
+    assert results["async-c2"]["checks_per_second"] > 0
+
+
+@pytest.mark.parametrize(
+    "after, regressed",
+    [
+        (_metrics(), []),
+        (_metrics(checks_per_second=950.0, p95_ms=2.1), []),
+        (_metrics(checks_per_second=800.0), ["checks_per_second"]),
+        (_metrics(p95_ms=3.0, peak_memory_kib=2048.0), ["p95_ms", "peak_memory_kib"]),
+        (_metrics(errors=3), ["failed"]),
+    ],
+)
+def test_compare(after: dict[str, t.Any], regressed: list[str]):
+    regressions: list[str] = compare(
+        {"thread-c1": after, "new-scenario": after}, {"thread-c1": _metrics()}
+    )
+
+    assert len(regressions) == len(regressed)
+    for regression, metric in zip(regressions, regressed):
+        assert metric in regression
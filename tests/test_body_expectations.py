@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+import urllib.parse
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    BODY_CHUNK_SIZE,
+    BodyMatcher,
+    ConnectionPool,
+    JSONPathMatcher,
+    RegexMatcher,
+    TextMatcher,
+    check_site,
+    check_site_async,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def _url(server: str, body: str, **query: t.Any) -> str:
+    return f"{server}/200?" + urllib.parse.urlencode({"body": body, **query})
+
+
+def _feed_split(matcher, body: bytes, at: int) -> bool:
+    matcher.feed(memoryview(body[:at]))
+    matcher.feed(memoryview(body[at:]))
+
+    return matcher.finish()
+
+
+@pytest.mark.parametrize("at", range(1, 12))
+def test_text_matches_across_chunks(at: int):
+    assert _feed_split(TextMatcher("status: ok"), b"xstatus: okx", at)
+
+
+def test_text_mismatch():
+    assert not _feed_split(TextMatcher("status: ok"), b"status: down", 5)
+
+
+@pytest.mark.parametrize("at", range(1, 16))
+def test_regex_matches_across_chunks(at: int):
+    assert _feed_split(RegexMatcher(r"version \d+\.\d+"), b"app version 12.3", at)
+
+
+@pytest.mark.parametrize(
+    "expectation, matched",
+    [
+        ("status", True),
+        ("status=ok", True),
+        ("status=down", False),
+        ("$.checks[1].healthy=true", True),
+        ("checks[0].latency=3", True),
+        ("checks[2]", False),
+        ("missing", False),
+    ],
+)
+def test_json_path(expectation: str, matched: bool):
+    body: bytes = (
+        b'{"status": "ok", "checks": [{"latency": 3}, {"healthy": true}]}'
+    )
+
+    assert _feed_split(JSONPathMatcher(expectation), body, 10) is matched
+
+
+@pytest.mark.parametrize("path", ["a..b", "a[x]", "", "$."])
+def test_json_path_rejects_invalid_paths(path: str):
+    with pytest.raises(ValueError):
+        JSONPathMatcher(path)
+
+
+def test_fresh_matchers_dont_share_state():
+    matcher = TextMatcher("ok")
+    matcher.feed(b"ok")
+
+    assert not matcher.fresh().matched
+
+
+def test_incomplete_matchers_cant_be_created():
+    class _NoFeed(BodyMatcher):
+        def __str__(self) -> str:
+            return "no feed"
+
+        def fresh(self) -> _NoFeed:
+            return _NoFeed()
+
+    with pytest.raises(TypeError):
+        _NoFeed()
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_check_with_expectations(stub_server: str, chunked: bool):
+    query: dict[str, t.Any] = {"size": BODY_CHUNK_SIZE * 3}
+    if chunked:
+        query["chunked"] = 1
+
+    result = check_site(
+        _url(stub_server, "<p>All systems operational</p>", **query),
+        method="GET",
+        expect=[TextMatcher("operational"), RegexMatcher(r"<p>All \w+")],
+    )
+
+    assert result.response.status_code == 200
+    assert result.response.failed_expectations == []
+
+
+def test_check_reports_failed_expectations(stub_server: str):
+    result = check_site(
+        _url(stub_server, '{"status": "down"}'),
+        method="GET",
+        expect=[TextMatcher("down"), JSONPathMatcher("status=ok")],
+    )
+
+    assert result.response.status_code == 200
+    assert result.response.failed_expectations == ["JSON path 'status=ok'"]
+
+
+def test_check_stops_reading_once_matched(stub_server: str):
+    pool = ConnectionPool()
+
+    result = check_site(
+        _url(stub_server, "", size=BODY_CHUNK_SIZE * 10),
+        method="GET",
+        pool=pool,
+        expect=[TextMatcher("xxx")],
+    )
+
+    assert result.response.failed_expectations == []
+    assert result.response.body_bytes < BODY_CHUNK_SIZE * 10
+
+    pool.close()
+
+
+def test_expectations_apply_after_redirects(stub_server: str):
+    location: str = "/200?" + urllib.parse.urlencode({"body": "final page"})
+
+    result = check_site(
+        f"{stub_server}/302?" + urllib.parse.urlencode({"location": location}),
+        method="GET",
+        expect=[TextMatcher("final page")],
+    )
+
+    assert result.response.failed_expectations == []
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_async_check_with_expectations(stub_server: str, chunked: bool):
+    query: dict[str, t.Any] = {"size": BODY_CHUNK_SIZE + 7}
+    if chunked:
+        query["chunked"] = 1
+
+    result = asyncio.run(
+        check_site_async(
+            _url(stub_server, '{"status": "ok"}', **query),
+            method="GET",
+            expect=[TextMatcher('"ok"'), JSONPathMatcher("status=ok")],
+        )
+    )
+
+    assert result.response.status_code == 200
+    ## The padding before the JSON makes it invalid
+    assert result.response.failed_expectations == ["JSON path 'status=ok'"]
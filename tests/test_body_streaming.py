@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+import urllib.parse
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    BODY_CHUNK_SIZE,
+    AsyncConnectionManager,
+    ConnectionPool,
+    _body_buffer,
+    check_site,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+class CountingAsyncConnectionManager(AsyncConnectionManager):
+    connects: int = 0
+
+    async def _connect(self) -> None:
+        self.connects += 1
+        await super()._connect()
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_body_is_read_for_reuse(stub_server: str, chunked: bool):
+    pool = ConnectionPool()
+    size: int = BODY_CHUNK_SIZE * 2 + 100
+    url: str = f"{stub_server}/200?size={size}" + ("&chunked=1" if chunked else "")
+
+    for _ in range(3):
+        result = check_site(url, method="GET", pool=pool)
+
+        assert result.response.status_code == 200
+        assert result.response.body_bytes == size
+
+    assert pool.misses == 1
+    assert pool.hits == 2
+
+    pool.close()
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_max_body_bytes_stops_reading(stub_server: str, chunked: bool):
+    pool = ConnectionPool()
+    url: str = f"{stub_server}/200?size=500000" + ("&chunked=1" if chunked else "")
+
+    for _ in range(2):
+        result = check_site(url, method="GET", pool=pool, max_body_bytes=1000)
+
+        assert result.response.status_code == 200
+        assert result.response.body_bytes == 1000
+
+    ## The unread rest of the body makes the connection unusable, so it's never pooled
+    assert pool.hits == 0
+    assert pool.misses == 2
+
+    pool.close()
+
+
+def test_head_has_no_body(stub_server: str):
+    pool = ConnectionPool()
+
+    for _ in range(2):
+        result = check_site(f"{stub_server}/200?size=1000", method="HEAD", pool=pool)
+
+        assert result.response.body_bytes == 0
+
+    assert pool.hits == 1
+
+    pool.close()
+
+
+def test_body_buffer_is_reused():
+    assert _body_buffer() is _body_buffer()
+    assert len(_body_buffer()) == BODY_CHUNK_SIZE
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_async_redirect_reuses_connection(stub_server: str, chunked: bool):
+    hop: str = "/200?size=100" + ("&chunked=1" if chunked else "")
+    location: str = urllib.parse.quote(hop, safe="")
+    connection_manager = CountingAsyncConnectionManager(
+        url=f"{stub_server}/302?size={BODY_CHUNK_SIZE + 1}&location={location}"
+        + ("&chunked=1" if chunked else "")
+    )
+
+    res = asyncio.run(connection_manager.send_request(method="GET", sleep=0, retries=1))
+
+    assert res["status_code"] == 200
+    assert connection_manager.connects == 1
+
+
+def test_async_redirect_with_long_body_reconnects(stub_server: str):
+    connection_manager = CountingAsyncConnectionManager(
+        url=f"{stub_server}/302?size=500000&location=%2F200", max_body_bytes=1000
+    )
+
+    res = asyncio.run(connection_manager.send_request(method="GET", sleep=0, retries=1))
+
+    assert res["status_code"] == 200
+    assert connection_manager.connects == 2
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    ConnectionPool,
+    StatusClassifier,
+    TextMatcher,
+    check_site,
+    check_site_async,
+    classify_result,
+    get_ssl_context,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+@pytest.mark.parametrize("method", ["HEAD", "GET"])
+def test_dropped_connection(
+    stub_server: str, method: str, classifier: StatusClassifier
+):
+    result = check_site(f"{stub_server}/200?drop=1", method=method, retries=2, sleep=0)
+
+    assert result.attempts == 2
+    assert classify_result(result, classifier) == "connection_error"
+
+
+def test_async_dropped_connection(stub_server: str, classifier: StatusClassifier):
+    result = asyncio.run(
+        check_site_async(f"{stub_server}/200?drop=1", method="GET", retries=2, sleep=0)
+    )
+
+    assert result.attempts == 2
+    assert classify_result(result, classifier) == "connection_error"
+
+
+def test_dropped_connection_over_tls(
+    stub_tls_server: str, stub_ca_file: str, classifier: StatusClassifier
+):
+    result = check_site(
+        f"{stub_tls_server}/200?drop=1",
+        retries=1,
+        ssl_context=get_ssl_context(cafile=stub_ca_file),
+    )
+
+    assert classify_result(result, classifier) == "connection_error"
+
+
+@pytest.mark.parametrize("read_by", ["pool", "expect"])
+def test_truncated_body(stub_server: str, read_by: str, classifier: StatusClassifier):
+    ## The body is only read to reuse the connection, or until expectations match
+    pool = ConnectionPool()
+    kwargs: dict[str, t.Any] = (
+        {"pool": pool} if read_by == "pool" else {"expect": [TextMatcher("missing")]}
+    )
+
+    result = check_site(
+        f"{stub_server}/200?size=1000&truncate=10",
+        method="GET",
+        retries=2,
+        sleep=0,
+        **kwargs,
+    )
+
+    assert result.attempts == 2
+    assert classify_result(result, classifier) == "connection_error"
+
+    pool.close()
+
+
+def test_async_truncated_body(stub_server: str, classifier: StatusClassifier):
+    ## Expectations make the async engine read the body
+    result = asyncio.run(
+        check_site_async(
+            f"{stub_server}/200?size=1000&truncate=10",
+            method="GET",
+            retries=1,
+            expect=[TextMatcher("missing")],
+        )
+    )
+
+    assert classify_result(result, classifier) == "connection_error"
+
+
+@pytest.mark.parametrize("broken", ["drop=1", "size=1000&truncate=10"])
+def test_broken_connections_arent_pooled(stub_server: str, broken: str):
+    pool = ConnectionPool()
+
+    assert check_site(f"{stub_server}/200", method="GET", pool=pool).error is None
+    assert check_site(
+        f"{stub_server}/200?{broken}", method="GET", pool=pool, retries=1
+    ).error
+    assert check_site(f"{stub_server}/200", method="GET", pool=pool).error is None
+
+    pool.close()
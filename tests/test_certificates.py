@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import datetime
+import logging
+import typing as t
+
+log = logging.getLogger(__name__)
+
+import sitecheck
+from sitecheck import (
+    CertificateCache,
+    CertificateInfo,
+    CheckResult,
+    ConnectionPool,
+    Metrics,
+    StatusClassifier,
+    check_site,
+    get_ssl_context,
+    report_result,
+    result_record,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+PEERCERT: dict[str, t.Any] = {
+    "issuer": (
+        (("countryName", "US"),),
+        (("organizationName", "Let's Encrypt"),),
+        (("commonName", "R3"),),
+    ),
+    "notAfter": "Jan  1 00:00:00 2030 GMT",
+    "subjectAltName": (("DNS", "example.com"), ("DNS", "www.example.com")),
+}
+
+
+@pytest.fixture
+def cert_cache(monkeypatch: pytest.MonkeyPatch) -> CertificateCache:
+    """A fresh process-wide certificate cache, so counts aren't shared between tests."""
+    cache = CertificateCache()
+    monkeypatch.setattr(sitecheck, "CERTIFICATE_CACHE", cache)
+
+    return cache
+
+
+def test_certificate_from_peercert():
+    certificate = CertificateInfo.from_peercert(PEERCERT)
+
+    assert certificate.not_after == datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc)
+    assert certificate.issuer == "C=US, O=Let's Encrypt, CN=R3"
+    assert certificate.subject_alt_names == ("example.com", "www.example.com")
+    assert certificate.days_left(
+        datetime.datetime(2029, 12, 31, 12, tzinfo=datetime.timezone.utc)
+    ) == pytest.approx(0.5)
+
+
+def test_unverified_certificate():
+    assert CertificateInfo.from_peercert({}) is None
+
+
+class _FakeTLS:
+    def __init__(self, der: bytes, cert: dict[str, t.Any]) -> None:
+        self.der: bytes = der
+        self.cert: dict[str, t.Any] = cert
+        self.parsed: int = 0
+
+    def getpeercert(self, binary_form: bool = False) -> t.Any:
+        if binary_form:
+            return self.der
+
+        self.parsed += 1
+        return self.cert
+
+
+def test_cache_parses_once_per_certificate():
+    cache = CertificateCache()
+    tls = _FakeTLS(b"cert-1", PEERCERT)
+
+    first = cache.lookup(("example.com", 443), tls)
+    again = cache.lookup(("example.com", 443), tls)
+
+    assert first is again
+    assert tls.parsed == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    ## A renewed certificate is parsed again
+    renewed = _FakeTLS(b"cert-2", {**PEERCERT, "notAfter": "Jan  1 00:00:00 2031 GMT"})
+
+    assert cache.lookup(("example.com", 443), renewed).not_after.year == 2031
+
+
+def test_cache_drops_expired_certificates():
+    cache = CertificateCache()
+    tls = _FakeTLS(b"cert", {**PEERCERT, "notAfter": "Jan  1 00:00:00 2020 GMT"})
+
+    cache.lookup(("example.com", 443), tls)
+    cache.lookup(("example.com", 443), tls)
+
+    assert tls.parsed == 2
+
+
+def test_https_checks_report_certificate(
+    stub_tls_server: str,
+    stub_ca_file: str,
+    cert_cache: CertificateCache,
+    run_check: t.Callable[..., CheckResult],
+):
+    ssl_context = get_ssl_context(cafile=stub_ca_file)
+
+    for _ in range(3):
+        result = run_check(
+            f"{stub_tls_server}/200", method="GET", ssl_context=ssl_context
+        )
+
+        assert result.response.certificate.issuer == "CN=localhost"
+        assert result.response.certificate.subject_alt_names == ("localhost", "127.0.0.1")
+
+    assert (cert_cache.hits, cert_cache.misses) == (2, 1)
+
+
+def test_pooled_connections_keep_certificate(
+    stub_tls_server: str, stub_ca_file: str, cert_cache: CertificateCache
+):
+    pool = ConnectionPool()
+    ssl_context = get_ssl_context(cafile=stub_ca_file)
+
+    results = [
+        check_site(f"{stub_tls_server}/200", method="GET", pool=pool, ssl_context=ssl_context)
+        for _ in range(3)
+    ]
+    pool.close()
+
+    assert all(result.response.certificate is not None for result in results)
+    ## Only the first check made a handshake
+    assert cert_cache.misses + cert_cache.hits == 1
+
+
+def test_plain_http_has_no_certificate(stub_server: str):
+    result = check_site(f"{stub_server}/200")
+
+    assert result.response.certificate is None
+    assert result_record(result, "success")["cert_expires"] is None
+
+
+def test_cert_warn_days(
+    stub_tls_server: str,
+    stub_ca_file: str,
+    caplog: pytest.LogCaptureFixture,
+    classifier: StatusClassifier,
+):
+    result = check_site(
+        f"{stub_tls_server}/200", ssl_context=get_ssl_context(cafile=stub_ca_file)
+    )
+
+    with caplog.at_level(logging.WARNING, logger="sitecheck"):
+        report_result(result, classifier, cert_warn_days=30)
+    assert not caplog.records
+
+    ## The stub's certificate is valid until 2126
+    with caplog.at_level(logging.WARNING, logger="sitecheck"):
+        classification: str = report_result(result, classifier, cert_warn_days=365 * 200)
+
+    assert classification == "success"
+    assert "TLS certificate expires in" in caplog.text
+    assert "issuer: CN=localhost" in caplog.text
+
+
+def test_certificate_record_and_metrics(stub_tls_server: str, stub_ca_file: str):
+    result = check_site(
+        f"{stub_tls_server}/200", ssl_context=get_ssl_context(cafile=stub_ca_file)
+    )
+    metrics = Metrics()
+    metrics.observe(result, "success")
+
+    record: dict[str, t.Any] = result_record(result, "success")
+
+    assert record["cert_expires"].startswith("2126-")
+    assert record["cert_issuer"] == "CN=localhost"
+    assert (
+        f'sitecheck_cert_expiry_timestamp_seconds{{site="{stub_tls_server}/200"}} {result.response.certificate.not_after.timestamp()}'
+        in metrics.render()
+    )
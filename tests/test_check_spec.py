@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import typing as t
+
+log = logging.getLogger(__name__)
+
+import sitecheck
+from sitecheck import (
+    AsyncConnectionManager,
+    CheckSpec,
+    ConnectionManager,
+    ConnectionPool,
+    StatusClassifier,
+    _HTTPConnection,
+    check_site,
+    check_site_async,
+    classify_result,
+    watch_sites,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+@pytest.fixture
+def no_dynamic_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fail any request that isn't sent from a compiled `CheckSpec`."""
+
+    def _request(*args: t.Any, **kwargs: t.Any) -> None:
+        raise AssertionError("Request wasn't sent pre-serialized")
+
+    monkeypatch.setattr(_HTTPConnection, "request", _request)
+
+
+def test_spec_is_immutable():
+    spec = CheckSpec("example.com")
+
+    with pytest.raises(AttributeError):
+        spec.method = "GET"
+    assert not hasattr(spec, "__dict__")
+
+
+def test_spec_compiles_request():
+    spec = CheckSpec(
+        "example.com/path?q=1",
+        method="POST",
+        headers={"X-Token": "abc"},
+        body={"someKey": "someValue"},
+    )
+
+    assert spec.url.geturl() == "http://example.com/path?q=1"
+    assert spec.target == "/path?q=1"
+    assert spec.body == b'{"someKey": "someValue"}'
+    assert spec.header_lines == (
+        b"Host: example.com",
+        b"Accept-Encoding: identity",
+        b"Content-Length: 24",
+        b"X-Token: abc",
+    )
+    assert spec.request_head == (
+        b"POST /path?q=1 HTTP/1.1\r\n" + b"\r\n".join(spec.header_lines) + b"\r\n\r\n"
+    )
+
+
+def test_managers_use_precompiled_connection_key():
+    spec = CheckSpec("http://example.com:8080/path")
+
+    assert spec.connection_key == ("http", "example.com:8080")
+    for manager in (ConnectionManager(spec=spec), AsyncConnectionManager(spec=spec)):
+        assert manager._connection_key_of(spec.url) is spec.connection_key
+
+
+def test_spec_matches_dynamic_request():
+    kwargs: dict[str, t.Any] = {"headers": {"X-Token": "abc"}, "body": "payload"}
+    spec = CheckSpec("http://example.com:8080/path", method="PUT", **kwargs)
+
+    prepared: bytes = AsyncConnectionManager(spec=spec)._build_request("PUT")
+    dynamic: bytes = AsyncConnectionManager(
+        url="http://example.com:8080/path", **kwargs
+    )._build_request("PUT")
+
+    assert sorted(prepared.split(b"\r\n")) == sorted(dynamic.split(b"\r\n"))
+
+
+def test_spec_keeps_given_default_headers():
+    spec = CheckSpec(
+        "example.com", headers={"host": "other.example", "Accept-Encoding": "gzip"}
+    )
+
+    assert spec.header_lines == (b"host: other.example", b"Accept-Encoding: gzip")
+
+
+def test_spec_rejects_header_injection():
+    with pytest.raises(ValueError):
+        CheckSpec("example.com", headers={"X-Bad": "value\r\nInjected: yes"})
+
+
+def test_check_site_reports_invalid_spec():
+    result = check_site("example.com", headers={"X-Bad": "a\nb"})
+
+    assert isinstance(result.error, ValueError)
+
+
+@pytest.mark.usefixtures("no_dynamic_requests")
+@pytest.mark.parametrize("method", ["HEAD", "GET", "POST"])
+def test_spec_runs_repeatedly(stub_server: str, method: str):
+    pool = ConnectionPool()
+    spec = CheckSpec(
+        f"{stub_server}/201", method=method, body={"a": 1} if method == "POST" else None
+    )
+
+    for _ in range(3):
+        result = check_site(spec, pool=pool)
+
+        assert result.error is None
+        assert result.response.status_code == 201
+        assert result.spec is spec
+
+    assert pool.hits == 2
+
+    pool.close()
+
+
+def test_async_spec_runs_repeatedly(stub_server: str):
+    spec = CheckSpec(f"{stub_server}/201", method="POST", body="payload")
+
+    async def _run() -> list[int]:
+        return [
+            (await check_site_async(spec)).response.status_code for _ in range(3)
+        ]
+
+    assert asyncio.run(_run()) == [201, 201, 201]
+
+
+def test_redirects_fall_back_to_dynamic_requests(stub_server: str):
+    spec = CheckSpec(f"{stub_server}/302?location=/200", method="GET")
+
+    result = check_site(spec)
+
+    assert result.response.status_code == 200
+    assert result.response.redirects == [f"{stub_server}/200"]
+
+
+def test_spec_classifier_takes_precedence(stub_server: str):
+    spec = CheckSpec(
+        f"{stub_server}/404",
+        classifier=StatusClassifier.from_specs(success=["404"], failure=[]),
+    )
+
+    result = check_site(spec)
+
+    assert (
+        classify_result(result, StatusClassifier.from_specs([200], [404])) == "success"
+    )
+
+
+def test_watch_sites_compiles_once(stub_server: str, monkeypatch: pytest.MonkeyPatch):
+    parsed: list[str] = []
+    parse_site_url = sitecheck._parse_site_url
+
+    def _counting_parse(url: str, *args: t.Any) -> t.Any:
+        parsed.append(url)
+        return parse_site_url(url, *args)
+
+    monkeypatch.setattr(sitecheck, "_parse_site_url", _counting_parse)
+
+    sites: list[str] = [f"{stub_server}/200", f"{stub_server}/204"]
+    results = list(
+        itertools.islice(
+            watch_sites(sites, interval=0.05, jitter=False, sleep=0, method="GET"), 6
+        )
+    )
+
+    assert all(result.method == "GET" for result in results)
+    assert parsed == sites
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import typing as t
+import urllib.parse
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    CheckResult,
+    CheckSpec,
+    ConnectionPool,
+    StatusClassifier,
+    TextMatcher,
+    ValidatorCache,
+    check_site,
+    classify_result,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+LAST_MODIFIED: str = "Wed, 21 Oct 2026 07:28:00 GMT"
+
+
+@pytest.mark.parametrize(
+    "query", ["etag=v1", urllib.parse.urlencode({"last_modified": LAST_MODIFIED})]
+)
+def test_revalidates_unchanged_resource(
+    stub_server: str,
+    run_check: t.Callable[..., CheckResult],
+    query: str,
+    classifier: StatusClassifier,
+):
+    validators = ValidatorCache()
+    site: str = f"{stub_server}/200?{query}"
+
+    first = run_check(site, method="GET", validators=validators)
+    again = run_check(site, method="GET", validators=validators)
+
+    assert first.response.status_code == 200
+    assert not first.response.revalidated
+    assert again.response.status_code == 304
+    assert again.response.revalidated
+    assert again.response.body_bytes == 0
+    assert classify_result(again, classifier) == "success"
+
+
+def test_prepared_specs_send_conditional_headers(
+    stub_server: str, run_check: t.Callable[..., CheckResult]
+):
+    validators = ValidatorCache()
+    spec = CheckSpec(
+        f"{stub_server}/200?etag=v1", method="GET", headers={"X-Token": "abc"}
+    )
+
+    results = [run_check(spec, validators=validators) for _ in range(3)]
+
+    assert [result.response.status_code for result in results] == [200, 304, 304]
+
+
+def test_revalidates_on_pooled_connection(stub_server: str):
+    validators = ValidatorCache()
+    pool = ConnectionPool()
+
+    results = [
+        check_site(
+            f"{stub_server}/200?etag=v1", method="GET", pool=pool, validators=validators
+        )
+        for _ in range(3)
+    ]
+    pool.close()
+
+    assert [result.response.status_code for result in results] == [200, 304, 304]
+    assert pool.hits == 2
+
+
+def test_head_and_expectations_are_never_conditional(stub_server: str):
+    validators = ValidatorCache()
+    site: str = f"{stub_server}/200?etag=v1"
+    check_site(site, method="GET", validators=validators)
+
+    head = check_site(site, method="HEAD", validators=validators)
+    expect = check_site(
+        site, method="GET", expect=[TextMatcher("200")], validators=validators
+    )
+
+    assert head.response.status_code == 200
+    assert expect.response.status_code == 200
+    assert expect.response.failed_expectations == []
+
+
+def test_unsolicited_304_uses_classifier(
+    stub_server: str, classifier: StatusClassifier
+):
+    result = check_site(f"{stub_server}/304", method="GET")
+
+    assert not result.response.revalidated
+    assert classify_result(result, classifier) == "unexpected"
+
+
+def test_validator_cache():
+    cache = ValidatorCache(max_size=2)
+    cache.update("http://a", [("ETag", '"1"'), ("Last-Modified", LAST_MODIFIED)])
+    cache.update("http://b", [("etag", '"2"')])
+
+    assert cache.get("http://a") == {
+        "If-None-Match": '"1"',
+        "If-Modified-Since": LAST_MODIFIED,
+    }
+
+    ## The least recently used URL is evicted
+    cache.update("http://c", [("ETag", '"3"')])
+    assert cache.get("http://b") == {}
+    assert cache.get("http://a")
+
+    ## A response without validators forgets the old ones
+    cache.update("http://a", [("Content-Type", "text/plain")])
+    assert cache.get("http://a") == {}
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+import re
+import sys
+import textwrap
+import typing as t
+
+log = logging.getLogger(__name__)
+
+import sitecheck
+from sitecheck import (
+    CheckSpec,
+    ConfigError,
+    ExitCode,
+    TextMatcher,
+    check_sites,
+    classify_result,
+    load_config,
+    main,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+CONFIG_TOML: str = """
+[defaults]
+method = "GET"
+headers = { "User-Agent" = "sitecheck-tests" }
+read_timeout = 5
+
+[[checks]]
+url = "http://example.com/health"
+headers = { "X-Token" = "abc" }
+success_codes = ["2xx", "!204"]
+expect_json_path = ["status=ok"]
+interval = 15
+
+[[checks]]
+url = "http://example.com/submit"
+method = "post"
+body = { someKey = "someValue" }
+retries = 3
+"""
+
+
+def _write(tmp_path: Path, name: str, content: str) -> str:
+    path: Path = tmp_path / name
+    path.write_text(textwrap.dedent(content), encoding="utf-8")
+
+    return str(path)
+
+
+def _toml(tmp_path: Path, checks: str, defaults: str = "") -> str:
+    return _write(
+        tmp_path, "checks.toml", f"[defaults]\n{defaults}\n[[checks]]\n{checks}"
+    )
+
+
+def test_load_toml_config(tmp_path: Path):
+    health, submit = load_config(
+        _write(tmp_path, "checks.toml", CONFIG_TOML),
+        headers={"Accept": "*/*"},
+    )
+
+    assert health.method == "GET"
+    assert health.headers == {
+        "Accept": "*/*",
+        "User-Agent": "sitecheck-tests",
+        "X-Token": "abc",
+    }
+    assert health.interval == 15
+    assert health.classifier.classify(200) == "success"
+    assert health.classifier.classify(204) == "unexpected"
+    assert list(health.options) == ["read_timeout", "expect"]
+    assert [str(matcher) for matcher in health.options["expect"]] == [
+        "JSON path 'status=ok'"
+    ]
+
+    assert submit.method == "POST"
+    assert submit.body == b'{"someKey": "someValue"}'
+    assert submit.headers["Content-Type"] == "application/json"
+    assert submit.interval is None
+    assert dict(submit.options) == {"read_timeout": 5, "retries": 3}
+
+
+def test_load_json_config(tmp_path: Path):
+    config: dict[str, t.Any] = {
+        "checks": [
+            {"url": "http://example.com/a", "failure_codes": "5xx"},
+            {"url": "http://example.com/b", "failure_codes": "5xx"},
+            {"url": "http://example.com/c"},
+        ]
+    }
+
+    specs: list[CheckSpec] = load_config(
+        _write(tmp_path, "checks.json", json.dumps(config)), method="GET"
+    )
+
+    assert [spec.method for spec in specs] == ["GET"] * 3
+    assert specs[0].classifier.classify(503) == "failure"
+    assert specs[2].classifier.classify(503) == "unexpected"
+    ## Checks with the same codes share a classifier table
+    assert specs[0].classifier is specs[1].classifier
+
+
+@pytest.mark.parametrize(
+    "checks, message",
+    [
+        ('url = "example.com"\ntimeout = 5', "unknown setting 'timeout'"),
+        ('url = "example.com"\nretries = true', "checks[0].retries: expected int"),
+        ('url = "example.com"\nread_timeout = "5"', "checks[0].read_timeout"),
+        ('url = "example.com"\nconnect_timeout = 0', "must be greater than 0"),
+        ('url = "example.com"\nretries = 0', "must be at least 1"),
+        ('url = "example.com"\nmax_redirects = -1', "must not be negative"),
+        ('method = "GET"', "missing 'url'"),
+        ('url = "example.com"\nmethod = "BREW"', "checks[0].method"),
+        ('url = "example.com"\nsuccess_codes = ["6xx"]', "within 100-599"),
+        ('url = "example.com"\nheaders = { X-Count = 1 }', "must be strings"),
+        ('url = "example.com"\nheaders = { X-Bad = "a\\nb" }', "Invalid header"),
+        ('url = "example.com"\nexpect_regex = ["("]', "invalid body expectation"),
+        ('url = "example.com"\nexpect_text = ["ok"]', "need a method with a response"),
+    ],
+)
+def test_invalid_check(tmp_path: Path, checks: str, message: str):
+    with pytest.raises(ConfigError, match=re.escape(message)):
+        load_config(_toml(tmp_path, checks))
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        ("checks = [", "Can't load"),
+        ("checks = []", "non-empty 'checks' list"),
+        ("[[checks]]\nurl = 'example.com'\n[extra]", "unknown key"),
+        ("[defaults]\nurl = 'example.com'", "defaults can't set a url"),
+        ("checks = ['example.com']", "expected a table"),
+    ],
+)
+def test_invalid_config(tmp_path: Path, content: str, message: str):
+    with pytest.raises(ConfigError, match=message):
+        load_config(_write(tmp_path, "checks.toml", content))
+
+
+def test_missing_config_file(tmp_path: Path):
+    with pytest.raises(ConfigError):
+        load_config(str(tmp_path / "missing.toml"))
+
+
+def test_inherited_expectations_are_validated(tmp_path: Path):
+    path: str = _toml(tmp_path, 'url = "example.com"')
+
+    with pytest.raises(ConfigError):
+        load_config(path, method="HEAD", expect=[TextMatcher("ok")])
+
+    assert load_config(path, method="GET", expect=[TextMatcher("ok")])
+
+
+def test_check_options_override_run(stub_server: str, tmp_path: Path):
+    specs: list[CheckSpec] = load_config(
+        _write(
+            tmp_path,
+            "checks.toml",
+            f"""
+            [[checks]]
+            url = "{stub_server}/302?location=/200"
+
+            [[checks]]
+            url = "{stub_server}/302?location=/200"
+            max_redirects = 0
+            success_codes = ["3xx"]
+            """,
+        ),
+        method="GET",
+    )
+
+    results = {
+        result.spec: result for result in check_sites(specs, retries=1, sleep=0)
+    }
+    follows, stays = (results[spec] for spec in specs)
+
+    assert follows.response.status_code == 200
+    assert stays.response.status_code == 302
+    assert classify_result(stays, specs[0].classifier) == "success"
+
+
+def test_main_runs_config(
+    stub_server: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    path: str = _toml(
+        tmp_path,
+        f'url = "{stub_server}/404"\nsuccess_codes = ["404"]',
+        defaults="retries = 1",
+    )
+    monkeypatch.setattr(sys, "argv", ["sitecheck.py", "--config", path])
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == ExitCode.SUCCESS
+
+
+def test_main_rejects_invalid_config(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path: str = _toml(tmp_path, 'url = "example.com"\nretries = "many"')
+    monkeypatch.setattr(sys, "argv", ["sitecheck.py", "--config", path])
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == 2
+
+
+def test_main_sends_cli_headers(monkeypatch: pytest.MonkeyPatch):
+    compiled: list[CheckSpec] = []
+    monkeypatch.setattr(
+        sitecheck, "_run_checks", lambda args, specs, *_: compiled.extend(specs)
+    )
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "sitecheck.py",
+            "--site",
+            "http://example.com",
+            "--method",
+            "POST",
+            "--headers",
+            '{"Authorization": "Bearer abc"}',
+            "--body",
+            '{"someKey": "someValue"}',
+        ],
+    )
+
+    with pytest.raises(SystemExit):
+        main()
+
+    assert compiled[0].headers == {
+        "Authorization": "Bearer abc",
+        "Content-Type": "application/json",
+    }
+
+
+@pytest.mark.parametrize("headers", ["not json", "[1, 2]", '{"X-Count": 1}'])
+def test_main_rejects_invalid_headers(monkeypatch: pytest.MonkeyPatch, headers: str):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["sitecheck.py", "--site", "http://example.com", "--headers", headers],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == 2
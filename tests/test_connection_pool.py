@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import logging
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import CheckResult, ConnectionManager, ConnectionPool, check_sites
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+@pytest.mark.parametrize("method", ["HEAD", "GET"])
+def test_pool_reuses_connection(stub_server: str, method: str):
+    pool = ConnectionPool()
+
+    for _ in range(5):
+        connection_manager = ConnectionManager(url=f"{stub_server}/200", pool=pool)
+        res: dict[str, t.Any] = connection_manager.send_request(
+            method=method, sleep=0, retries=1
+        )
+        assert res["status_code"] == 200
+
+    assert pool.misses == 1
+    assert pool.hits == 4
+
+    pool.close()
+
+
+def test_pool_expires_idle_connections(stub_server: str):
+    pool = ConnectionPool(idle_timeout=0)
+
+    for _ in range(3):
+        ConnectionManager(url=f"{stub_server}/200", pool=pool).send_request(
+            method="HEAD", sleep=0, retries=1
+        )
+
+    assert pool.hits == 0
+    assert pool.misses == 3
+
+
+def test_pool_discards_connections_closed_by_server(stub_server: str):
+    pool = ConnectionPool()
+
+    connection_manager = ConnectionManager(url=f"{stub_server}/200", pool=pool)
+    connection_manager.send_request(method="HEAD", sleep=0, retries=1)
+
+    ## Simulate the server dropping the idle keep-alive connection
+    for idle in pool._idle.values():
+        for connection, _ in idle:
+            connection.sock.shutdown(2)
+
+    res: dict[str, t.Any] = ConnectionManager(
+        url=f"{stub_server}/200", pool=pool
+    ).send_request(method="HEAD", sleep=0, retries=1)
+
+    assert res["status_code"] == 200
+    assert pool.hits == 0
+    assert pool.misses == 2
+
+
+def test_batch_shares_pool(stub_server: str):
+    pool = ConnectionPool()
+    sites: list[str] = [f"{stub_server}/200"] * 40
+
+    results: list[CheckResult] = list(
+        check_sites(sites, concurrency=4, pool=pool, sleep=0, retries=1)
+    )
+
+    assert all(r.response.status_code == 200 for r in results)
+    assert pool.misses <= 4
+    assert pool.hits + pool.misses == len(sites)
+
+    pool.close()
+
+
+def test_pool_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        ConnectionPool(max_per_host=0)
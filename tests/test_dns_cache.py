@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import AsyncConnectionManager, ConnectionManager, DNSCache
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+@pytest.fixture()
+def counted_getaddrinfo(monkeypatch: pytest.MonkeyPatch) -> list[tuple]:
+    """Record every call to `socket.getaddrinfo()`, resolving unknown hosts as NXDOMAIN."""
+    calls: list[tuple] = []
+    real_getaddrinfo = socket.getaddrinfo
+
+    def _getaddrinfo(host, port, *args, **kwargs):
+        calls.append((host, port))
+        if host.endswith(".invalid"):
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return real_getaddrinfo(host, port, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", _getaddrinfo)
+
+    return calls
+
+
+def test_dns_cache_reuses_lookups(stub_server: str, counted_getaddrinfo: list[tuple]):
+    dns_cache = DNSCache()
+    url: str = stub_server.replace("127.0.0.1", "localhost")
+
+    for _ in range(3):
+        res: dict[str, t.Any] = ConnectionManager(
+            url=f"{url}/200", dns_cache=dns_cache
+        ).send_request(method="HEAD", sleep=0, retries=1)
+        assert res["status_code"] == 200
+
+    assert len(counted_getaddrinfo) == 1
+    assert dns_cache.hits == 2
+    assert dns_cache.misses == 1
+
+
+def test_dns_cache_expires_entries(counted_getaddrinfo: list[tuple]):
+    dns_cache = DNSCache(ttl=0)
+
+    dns_cache.resolve("localhost", 80)
+    dns_cache.resolve("localhost", 80)
+
+    assert len(counted_getaddrinfo) == 2
+
+
+def test_dns_cache_caches_nxdomain(counted_getaddrinfo: list[tuple]):
+    dns_cache = DNSCache()
+
+    for _ in range(3):
+        with pytest.raises(socket.gaierror):
+            ConnectionManager(
+                url="http://site.invalid", dns_cache=dns_cache
+            ).send_request(method="HEAD", sleep=0, retries=3)
+
+    assert len(counted_getaddrinfo) == 1
+
+
+def test_dns_cache_does_not_cache_temporary_failures(monkeypatch: pytest.MonkeyPatch):
+    calls: list[str] = []
+
+    def _getaddrinfo(host, *args, **kwargs):
+        calls.append(host)
+        raise socket.gaierror(socket.EAI_AGAIN, "Temporary failure in name resolution")
+
+    monkeypatch.setattr(socket, "getaddrinfo", _getaddrinfo)
+    dns_cache = DNSCache()
+
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            dns_cache.resolve("example.com", 443)
+
+    assert len(calls) == 2
+
+
+def test_async_dns_cache(stub_server: str, counted_getaddrinfo: list[tuple]):
+    dns_cache = DNSCache()
+    url: str = stub_server.replace("127.0.0.1", "localhost")
+
+    async def _check() -> list[dict[str, t.Any]]:
+        return [
+            await AsyncConnectionManager(
+                url=f"{url}/204", dns_cache=dns_cache
+            ).send_request(method="HEAD", sleep=0, retries=1)
+            for _ in range(3)
+        ]
+
+    results: list[dict[str, t.Any]] = asyncio.run(_check())
+
+    assert [r["status_code"] for r in results] == [204, 204, 204]
+    assert dns_cache.hits == 2
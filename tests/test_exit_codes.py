@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+import socket
+import sys
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    CheckResult,
+    ExitCode,
+    HTTPResponse,
+    StatusClassifier,
+    Summary,
+    Timings,
+    check_site,
+    check_site_async,
+    classify_result,
+    main,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def _result(site: str, total_ms: float | None) -> CheckResult:
+    return CheckResult(
+        site=site,
+        response=HTTPResponse(status_code=200, timings=Timings(total_ms=total_ms)),
+    )
+
+
+def test_read_timeout_is_timeout(blackhole_server: str, classifier: StatusClassifier):
+    result = check_site(blackhole_server, read_timeout=0.2, retries=2, sleep=0)
+
+    assert classify_result(result, classifier) == "timeout"
+
+
+def test_async_read_timeout_is_timeout(
+    blackhole_server: str, classifier: StatusClassifier
+):
+    result = asyncio.run(
+        check_site_async(blackhole_server, read_timeout=0.2, retries=1, sleep=0)
+    )
+
+    assert classify_result(result, classifier) == "timeout"
+
+
+def test_deadline_is_timeout(blackhole_server: str, classifier: StatusClassifier):
+    result = check_site(blackhole_server, deadline=0.2)
+
+    assert classify_result(result, classifier) == "timeout"
+
+
+def test_refused_connection_is_connection_error(
+    closed_port_url: str, classifier: StatusClassifier
+):
+    result = check_site(closed_port_url, retries=1)
+
+    assert classify_result(result, classifier) == "connection_error"
+
+
+def test_summary_counts_and_slowest():
+    summary = Summary(top=2)
+    for index, total_ms in enumerate([5.0, 50.0, None, 20.0, 1.0]):
+        summary.add(_result(f"site-{index}", total_ms), "success")
+    summary.add(CheckResult(site="down"), "connection_error")
+
+    assert summary.total == 6
+    assert summary.counts == {"success": 5, "connection_error": 1}
+    assert summary.slowest() == [("site-1", 50.0), ("site-3", 20.0)]
+    assert summary.exit_code == ExitCode.CONNECTION_ERROR
+
+
+def test_summary_lists_each_site_once():
+    summary = Summary(top=2)
+    for site, total_ms in [("a", 10.0), ("b", 30.0), ("a", 40.0), ("a", 5.0), ("c", 20.0)]:
+        summary.add(_result(site, total_ms), "success")
+
+    assert summary.slowest() == [("a", 40.0), ("b", 30.0)]
+
+    summary.add(_result("c", 50.0), "success")
+
+    assert summary.slowest() == [("c", 50.0), ("a", 40.0)]
+
+
+def test_summary_exit_code_picks_most_severe():
+    summary = Summary()
+
+    assert summary.exit_code == ExitCode.SUCCESS
+
+    summary.add(_result("a", 1.0), "success")
+    summary.add(_result("b", 1.0), "unexpected")
+    summary.add(_result("c", 1.0), "failure")
+
+    assert summary.exit_code == ExitCode.UNEXPECTED
+
+
+@pytest.mark.parametrize(
+    "path, exit_code",
+    [
+        ("/200", ExitCode.SUCCESS),
+        ("/404", ExitCode.FAILURE),
+        ("/418", ExitCode.UNEXPECTED),
+    ],
+)
+def test_main_exit_code(
+    stub_server: str, monkeypatch: pytest.MonkeyPatch, path: str, exit_code: ExitCode
+):
+    monkeypatch.setattr(
+        sys, "argv", ["sitecheck.py", "--site", f"{stub_server}{path}", "--retries", "1"]
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == exit_code
+
+
+def test_main_exit_code_timeout(blackhole_server: str, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["sitecheck.py", "--site", blackhole_server, "--retries", "1", "--read-timeout", "0.2"],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == ExitCode.TIMEOUT
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--sites-file", "missing.txt"],
+        ["--sites-file", "empty.txt"],
+        ["--site", "example.com", "--headers", '{"X-Bad": "a\\nb"}'],
+        ["--site", "example.com", "--ca-file", "missing.pem"],
+        ["--site", "example.com", "--ca-file", "empty.txt"],
+        ["--site", "example.com", "--output", "json", "--output-file", "missing/out.json"],
+    ],
+)
+def test_main_usage_errors_exit_2(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, argv: list[str]
+):
+    (tmp_path / "empty.txt").write_text("", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["sitecheck.py", *argv])
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == 2
+
+
+def test_main_metrics_bind_failure_exits_2(monkeypatch: pytest.MonkeyPatch):
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "sitecheck.py",
+                "--site",
+                "example.com",
+                "--metrics-port",
+                str(taken.getsockname()[1]),
+            ],
+        )
+
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+
+    assert exit_info.value.code == 2
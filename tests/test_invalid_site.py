@@ -32,10 +32,10 @@ def test_fail_invalid_site(sleep_time: int, retry_times: int, invalid_site: str)
 def test_invalid_site(sleep_time: int, retry_times: int, invalid_site: str):
     connection_manager = ConnectionManager(url=invalid_site)
 
-    res: dict[str, t.Any] = connection_manager.send_request(
-        method="GET", sleep=sleep_time, retries=retry_times
-    )
+    with pytest.raises(Exception, match="Failed to connect") as error:
+        connection_manager.send_request(
+            method="GET", sleep=sleep_time, retries=retry_times
+        )
 
-    assert res is None, ValueError(
-        f"res should be None due to an invalid website address, but was instead ({type(res)})"
-    )
+    assert isinstance(error.value.__cause__, ConnectionRefusedError)
+    assert connection_manager.attempts == retry_times
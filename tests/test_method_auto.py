@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+import sys
+import textwrap
+import typing as t
+import urllib.parse
+
+log = logging.getLogger(__name__)
+
+import sitecheck
+from sitecheck import (
+    AUTO_METHOD,
+    CheckResult,
+    ConfigError,
+    ConnectionPool,
+    ExitCode,
+    MethodMemo,
+    StatusClassifier,
+    check_site,
+    classify_result,
+    load_config,
+    main,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+@pytest.fixture
+def memo(monkeypatch: pytest.MonkeyPatch) -> MethodMemo:
+    """A fresh process-wide memo, so the session's stub server starts out accepting `HEAD`."""
+    memo = MethodMemo()
+    monkeypatch.setattr(sitecheck, "METHOD_MEMO", memo)
+
+    return memo
+
+
+def test_head_when_accepted(
+    stub_server: str, memo: MethodMemo, run_check: t.Callable[..., CheckResult]
+):
+    result = run_check(f"{stub_server}/200", method=AUTO_METHOD)
+
+    assert result.method == "HEAD"
+    assert result.response.status_code == 200
+    assert not result.response.ranged
+    assert result.attempts == 1
+    assert not memo.rejects_head(("http", stub_server.partition("://")[2]))
+
+
+@pytest.mark.parametrize("head_status", [405, 501])
+def test_falls_back_to_ranged_get(
+    stub_server: str,
+    memo: MethodMemo,
+    run_check: t.Callable[..., CheckResult],
+    head_status: int,
+    classifier: StatusClassifier,
+):
+    result = run_check(
+        f"{stub_server}/200?head_status={head_status}&size=100", method=AUTO_METHOD
+    )
+
+    assert result.method == "GET"
+    assert result.response.status_code == 206
+    assert result.response.ranged
+    assert ("Content-Range", "bytes 0-0/100") in result.response.headers
+    assert result.attempts == 1
+    assert result.response.head_status == head_status
+    assert classify_result(result, classifier) == "success"
+    assert memo.rejects_head(("http", stub_server.partition("://")[2]))
+
+
+def test_remembers_hosts_rejecting_head(
+    stub_server: str, memo: MethodMemo, run_check: t.Callable[..., CheckResult]
+):
+    site: str = f"{stub_server}/200?head_status=405"
+
+    run_check(site, method=AUTO_METHOD)
+    again = run_check(site, method=AUTO_METHOD)
+
+    assert again.method == "GET"
+    assert again.response.status_code == 206
+    assert again.attempts == 1
+    assert again.response.head_status is None
+
+
+def test_remembers_checked_host_across_redirects(
+    stub_server: str, memo: MethodMemo, run_check: t.Callable[..., CheckResult]
+):
+    target: str = stub_server.replace("127.0.0.1", "localhost") + "/200?head_status=405"
+    site: str = f"{stub_server}/302?{urllib.parse.urlencode({'location': target})}"
+
+    first = run_check(site, method=AUTO_METHOD)
+    again = run_check(site, method=AUTO_METHOD)
+
+    assert first.attempts == 1
+    assert first.response.head_status == 405
+    assert again.method == "GET"
+    assert again.attempts == 1
+    assert again.response.status_code == 206
+    assert memo.rejects_head(("http", stub_server.partition("://")[2]))
+
+
+def test_fallback_total_covers_head(
+    stub_server: str, memo: MethodMemo, run_check: t.Callable[..., CheckResult]
+):
+    ## Both the rejected `HEAD` and the ranged `GET` wait `delay` seconds
+    result = run_check(
+        f"{stub_server}/200?head_status=405&delay=0.2", method=AUTO_METHOD
+    )
+
+    assert result.response.status_code == 206
+    assert result.response.timings.total_ms >= 400
+
+
+def test_fallback_reuses_pooled_connection(stub_server: str, memo: MethodMemo):
+    pool = ConnectionPool()
+
+    result = check_site(
+        f"{stub_server}/200?head_status=405&size=100", pool=pool, method=AUTO_METHOD
+    )
+
+    assert result.response.status_code == 206
+    assert result.response.body_bytes == 1
+    assert pool.hits == 1
+
+    pool.close()
+
+
+def test_ranged_failures_keep_their_status(
+    stub_server: str, memo: MethodMemo, classifier: StatusClassifier
+):
+    result = check_site(f"{stub_server}/404?head_status=405", method=AUTO_METHOD)
+
+    assert result.response.status_code == 404
+    assert classify_result(result, classifier) == "failure"
+
+
+def test_memo_is_per_host():
+    memo = MethodMemo()
+    memo.remember_rejected(("http", "example.com"))
+
+    assert memo.rejects_head(("http", "example.com"))
+    assert not memo.rejects_head(("https", "example.com"))
+    assert not memo.rejects_head(("http", "example.org"))
+
+
+def test_config_accepts_auto(tmp_path: Path):
+    path: Path = tmp_path / "checks.toml"
+    path.write_text(
+        textwrap.dedent(
+            """
+            [[checks]]
+            url = "http://example.com"
+            method = "auto"
+
+            [[checks]]
+            url = "http://example.com"
+            method = "auto"
+            expect_text = ["ok"]
+            """
+        ),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ConfigError, match="need a method with a response"):
+        load_config(str(path))
+
+
+def test_main_method_auto(
+    stub_server: str, memo: MethodMemo, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["sitecheck.py", "--site", f"{stub_server}/200?head_status=405", "--method", "auto"],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == ExitCode.SUCCESS
+
+
+def test_main_rejects_auto_expectations(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["sitecheck.py", "--site", "example.com", "--method", "auto", "--expect-text", "ok"],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == 2
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import logging
+import threading
+import typing as t
+import urllib.error
+import urllib.request
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    METRICS_BUCKETS,
+    CheckResult,
+    HTTPResponse,
+    Metrics,
+    MetricsServer,
+    Timings,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def _result(
+    site: str = "http://example.com",
+    total_ms: float | None = 30.0,
+    attempts: int = 1,
+    redirects: list[str] | None = None,
+) -> CheckResult:
+    return CheckResult(
+        site=site,
+        attempts=attempts,
+        response=HTTPResponse(
+            status_code=200,
+            timings=Timings(total_ms=total_ms),
+            redirects=redirects or [],
+        ),
+    )
+
+
+def _samples(metrics: Metrics) -> dict[str, float]:
+    return {
+        line.rpartition(" ")[0]: float(line.rpartition(" ")[2])
+        for line in metrics.render().splitlines()
+        if not line.startswith("#")
+    }
+
+
+def test_render_metrics():
+    metrics = Metrics()
+    metrics.observe(_result(total_ms=30.0, attempts=3), "success")
+    metrics.observe(_result(total_ms=2000.0, redirects=["http://a", "http://b"]), "failure")
+    metrics.observe(CheckResult(site="http://down.example", attempts=2), "connection_error")
+
+    samples: dict[str, float] = _samples(metrics)
+    site: str = 'site="http://example.com"'
+
+    assert samples[f"sitecheck_up{{{site}}}"] == 0
+    assert samples['sitecheck_up{site="http://down.example"}'] == 0
+    assert samples[f'sitecheck_checks_total{{{site},classification="success"}}'] == 1
+    assert samples[f'sitecheck_checks_total{{{site},classification="failure"}}'] == 1
+    assert samples[f'sitecheck_check_duration_seconds_bucket{{{site},le="0.025"}}'] == 0
+    assert samples[f'sitecheck_check_duration_seconds_bucket{{{site},le="0.05"}}'] == 1
+    assert samples[f'sitecheck_check_duration_seconds_bucket{{{site},le="2.5"}}'] == 2
+    assert samples[f'sitecheck_check_duration_seconds_bucket{{{site},le="+Inf"}}'] == 2
+    assert samples[f"sitecheck_check_duration_seconds_sum{{{site}}}"] == pytest.approx(2.03)
+    assert samples[f"sitecheck_check_duration_seconds_count{{{site}}}"] == 2
+    assert samples[f"sitecheck_retries_total{{{site}}}"] == 2
+    assert samples[f"sitecheck_redirects_total{{{site}}}"] == 2
+    assert samples['sitecheck_retries_total{site="http://down.example"}'] == 1
+    assert (
+        samples['sitecheck_check_duration_seconds_count{site="http://down.example"}']
+        == 0
+    )
+
+
+def test_up_follows_last_check():
+    metrics = Metrics()
+    metrics.observe(_result(), "failure")
+    metrics.observe(_result(), "success")
+
+    assert _samples(metrics)['sitecheck_up{site="http://example.com"}'] == 1
+
+
+def test_bucket_bounds_are_inclusive():
+    metrics = Metrics()
+    metrics.observe(_result(total_ms=METRICS_BUCKETS[0] * 1000), "success")
+
+    assert (
+        _samples(metrics)[
+            f'sitecheck_check_duration_seconds_bucket{{site="http://example.com",le="{METRICS_BUCKETS[0]}"}}'
+        ]
+        == 1
+    )
+
+
+def test_labels_are_escaped():
+    metrics = Metrics()
+    metrics.observe(_result(site='http://example.com/"q"\\'), "success")
+
+    assert 'sitecheck_up{site="http://example.com/\\"q\\"\\\\"} 1' in metrics.render()
+
+
+def test_render_while_threads_record():
+    metrics = Metrics()
+    barrier = threading.Barrier(5)
+
+    def _observe(thread: int) -> None:
+        barrier.wait()
+        for check in range(500):
+            metrics.observe(
+                _result(site=f"http://{thread}-{check % 50}.example", attempts=2),
+                "success",
+            )
+
+    threads: list[threading.Thread] = [
+        threading.Thread(target=_observe, args=(thread,)) for thread in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+
+    ## Sites first seen mid-scrape are either rendered whole or not at all
+    barrier.wait()
+    while any(thread.is_alive() for thread in threads):
+        metrics.render()
+    for thread in threads:
+        thread.join()
+
+    samples: dict[str, float] = _samples(metrics)
+
+    assert sum(
+        value
+        for name, value in samples.items()
+        if name.startswith("sitecheck_check_duration_seconds_count")
+    ) == 2000
+    assert samples['sitecheck_retries_total{site="http://0-0.example"}'] == 10
+
+
+def test_metrics_server():
+    metrics = Metrics()
+    metrics.observe(_result(), "success")
+    server = MetricsServer(metrics, port=0).start()
+
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as res:
+            assert res.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert 'sitecheck_up{site="http://example.com"} 1' in res.read().decode()
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"http://127.0.0.1:{server.port}/other")
+        assert error.value.code == 404
+    finally:
+        server.close()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    RESULT_FIELDS,
+    RESULT_WRITERS,
+    CheckResult,
+    HTTPResponse,
+    ResultWriter,
+    StatusClassifier,
+    Timings,
+    check_site,
+    check_sites,
+    check_sites_async,
+    classify_result,
+    result_record,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def _result(status_code: int | None, **response_kwargs: t.Any) -> CheckResult:
+    if status_code is None:
+        return CheckResult(
+            site="http://example.com",
+            method="GET",
+            attempts=3,
+            error=ConnectionRefusedError("refused"),
+        )
+
+    return CheckResult(
+        site="http://example.com",
+        method="GET",
+        attempts=1,
+        response=HTTPResponse(
+            status_code=status_code,
+            reason="Reason",
+            timings=Timings(ttfb_ms=1.23456, total_ms=2.5),
+            **response_kwargs,
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "result, classification",
+    [
+        (_result(200), "success"),
+        (_result(200, failed_expectations=["text 'ok'"]), "failure"),
+        (_result(404), "failure"),
+        (_result(418), "unexpected"),
+        (_result(None), "connection_error"),
+    ],
+)
+def test_classify_result(
+    result: CheckResult, classification: str, classifier: StatusClassifier
+):
+    assert classify_result(result, classifier) == classification
+
+
+def test_result_record():
+    record = result_record(
+        _result(200, redirects=["http://example.com/home"]), "success"
+    )
+
+    assert tuple(record) == RESULT_FIELDS
+    assert record["status"] == 200
+    assert record["attempts"] == 1
+    assert record["redirects"] == ["http://example.com/home"]
+    assert record["ttfb_ms"] == 1.235
+    assert record["dns_ms"] is None
+    assert record["error"] is None
+
+
+def test_error_record():
+    record = result_record(_result(None), "connection_error")
+
+    assert record["status"] is None
+    assert record["attempts"] == 3
+    assert record["error"] == "ConnectionRefusedError: refused"
+
+
+def _write(output: str, results: list[CheckResult]) -> str:
+    stream = io.StringIO()
+    writer = RESULT_WRITERS[output](stream)
+    for result in results:
+        writer.write(result_record(result, "success"))
+    writer.close()
+
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("count", [0, 1, 3])
+def test_json_writer(count: int):
+    records = json.loads(_write("json", [_result(200)] * count))
+
+    assert len(records) == count
+
+
+def test_ndjson_writer():
+    lines: list[str] = _write("ndjson", [_result(200), _result(None)]).splitlines()
+
+    assert [json.loads(line)["status"] for line in lines] == [200, None]
+
+
+def test_csv_writer():
+    output: str = _write(
+        "csv", [_result(200, redirects=["http://a.example", "http://b.example"])]
+    )
+    rows = list(csv.DictReader(io.StringIO(output)))
+
+    assert len(rows) == 1
+    assert rows[0]["status"] == "200"
+    assert rows[0]["redirects"] == "http://a.example http://b.example"
+    assert rows[0]["tls_ms"] == ""
+
+
+def test_writers_must_implement_write():
+    class _NoWrite(ResultWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        _NoWrite(io.StringIO())
+
+
+def test_check_site_records_method_and_attempts(stub_server: str):
+    result = check_site(
+        f"{stub_server}/503?succeed_after=2&id=output-attempts&retry_after=0",
+        method="GET",
+        retries=3,
+        sleep=0,
+    )
+
+    assert result.response.status_code == 200
+    assert result.method == "GET"
+    assert result.attempts == 3
+
+
+def _lazy_sites(server: str, count: int, consumed: list[int]) -> t.Iterator[str]:
+    for index in range(count):
+        consumed.append(index)
+        yield f"{server}/200"
+
+
+def test_check_sites_reads_sites_lazily(stub_server: str):
+    consumed: list[int] = []
+
+    results = check_sites(_lazy_sites(stub_server, 50, consumed), concurrency=2)
+    next(results)
+
+    ## Only a couple of checks are queued ahead of the workers
+    assert len(consumed) <= 6
+
+    assert len(list(results)) == 49
+    assert len(consumed) == 50
+
+
+def test_check_sites_async_reads_sites_lazily(stub_server: str):
+    consumed: list[int] = []
+
+    async def _first_result() -> None:
+        async for _ in check_sites_async(
+            _lazy_sites(stub_server, 50, consumed), concurrency=2
+        ):
+            break
+
+    asyncio.run(_first_result())
+
+    assert len(consumed) <= 4
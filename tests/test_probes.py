@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import datetime
+import logging
+from pathlib import Path
+import socket
+import sys
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    RESULT_FIELDS,
+    CheckResult,
+    ConfigError,
+    ExitCode,
+    StatusClassifier,
+    check_site,
+    classify_result,
+    get_ssl_context,
+    load_config,
+    main,
+    result_record,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+@pytest.fixture
+def closed_port() -> str:
+    """A local port nothing listens on."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port: int = sock.getsockname()[1]
+    sock.close()
+
+    return f"http://127.0.0.1:{port}"
+
+
+def test_tcp_probe(
+    stub_server: str,
+    run_check: t.Callable[..., CheckResult],
+    classifier: StatusClassifier,
+):
+    result = run_check(stub_server, probe="tcp")
+
+    assert result.error is None
+    assert result.response is None
+    assert result.method == "TCP"
+    assert result.probe.certificate is None
+    assert result.probe.timings.connect_ms is not None
+    assert result.probe.timings.tls_ms is None
+    assert classify_result(result, classifier) == "success"
+
+
+def test_tls_probe(
+    stub_tls_server: str, stub_ca_file: str, run_check: t.Callable[..., CheckResult]
+):
+    result = run_check(
+        stub_tls_server,
+        probe="tls",
+        ssl_context=get_ssl_context(cafile=stub_ca_file),
+    )
+
+    assert result.error is None
+    assert result.method == "TLS"
+    assert result.probe.timings.tls_ms is not None
+    ## The stub's certificate is valid until 2126
+    assert result.probe.certificate.not_after.year == 2126
+    assert result.probe.certificate.not_after.tzinfo == datetime.timezone.utc
+
+
+def test_tls_probe_verifies_certificate(
+    stub_tls_server: str,
+    run_check: t.Callable[..., CheckResult],
+    classifier: StatusClassifier,
+):
+    result = run_check(stub_tls_server, probe="tls", retries=1)
+
+    assert result.probe is None
+    assert classify_result(result, classifier) == "connection_error"
+
+
+def test_probe_refused(
+    closed_port: str,
+    run_check: t.Callable[..., CheckResult],
+    classifier: StatusClassifier,
+):
+    result = run_check(closed_port, probe="tcp", retries=2)
+
+    assert result.attempts == 2
+    assert isinstance(result.error.__cause__, ConnectionRefusedError)
+    assert classify_result(result, classifier) == "connection_error"
+
+
+def test_tls_probe_times_out(
+    blackhole_server: str,
+    run_check: t.Callable[..., CheckResult],
+    classifier: StatusClassifier,
+):
+    ## The blackhole accepts the connection, but never answers the handshake
+    result = run_check(
+        blackhole_server.replace("http://", "https://"),
+        probe="tls",
+        connect_timeout=0.2,
+        retries=1,
+    )
+
+    assert classify_result(result, classifier) == "timeout"
+
+
+def test_probe_record(stub_tls_server: str, stub_ca_file: str):
+    result = check_site(
+        stub_tls_server, probe="tls", ssl_context=get_ssl_context(cafile=stub_ca_file)
+    )
+
+    record: dict[str, t.Any] = result_record(result, "success")
+
+    assert tuple(record) == RESULT_FIELDS
+    assert record["method"] == "TLS"
+    assert record["status"] is None
+    assert record["cert_expires"].startswith("2126-")
+    assert record["tls_ms"] is not None
+
+
+def test_config_probe(tmp_path: Path):
+    path: Path = tmp_path / "checks.toml"
+    path.write_text(
+        '[[checks]]\nurl = "example.com"\nprobe = "tls"\n[[checks]]\nurl = "example.com"\n',
+        encoding="utf-8",
+    )
+
+    tls, http = load_config(str(path))
+
+    assert tls.options["probe"] == "tls"
+    assert "probe" not in http.options
+
+    path.write_text('[[checks]]\nurl = "example.com"\nprobe = "udp"\n', encoding="utf-8")
+    with pytest.raises(ConfigError, match="checks\\[0\\].probe"):
+        load_config(str(path))
+
+    path.write_text(
+        '[[checks]]\nurl = "example.com"\nmethod = "GET"\nexpect_text = ["ok"]\n',
+        encoding="utf-8",
+    )
+    with pytest.raises(ConfigError, match="probes have no response body"):
+        load_config(str(path), probe="tcp")
+
+
+def test_main_probe(stub_server: str, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(sys, "argv", ["sitecheck.py", "--site", stub_server, "--probe", "tcp"])
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == ExitCode.SUCCESS
+
+
+def test_main_rejects_probe_expectations(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "sitecheck.py",
+            "--site",
+            "example.com",
+            "--method",
+            "GET",
+            "--probe",
+            "tcp",
+            "--expect-text",
+            "ok",
+        ],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == 2
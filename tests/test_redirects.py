@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+import urllib.parse
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    AsyncConnectionManager,
+    CheckResult,
+    ConnectionManager,
+    ConnectionPool,
+    RedirectLoop,
+    TooManyRedirects,
+    check_site,
+    check_site_async,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def _redirect_path(status: int, location: str) -> str:
+    return f"/{status}?location={urllib.parse.quote(location, safe='')}"
+
+
+def test_follows_redirect_chain(stub_server: str):
+    final: str = f"{stub_server}/200"
+    hop: str = f"{stub_server}{_redirect_path(307, final)}"
+
+    result = check_site(f"{stub_server}{_redirect_path(301, hop)}", method="GET")
+
+    assert result.error is None
+    assert result.response.status_code == 200
+    assert result.response.redirects == [hop, final]
+
+
+def test_resolves_relative_location(stub_server: str):
+    result = check_site(f"{stub_server}{_redirect_path(302, '/204')}", method="GET")
+
+    assert result.response.status_code == 204
+    assert result.response.redirects == [f"{stub_server}/204"]
+
+
+def test_hop_limit(stub_server: str):
+    hop: str = _redirect_path(302, "/200")
+
+    with pytest.raises(TooManyRedirects):
+        ConnectionManager(
+            url=f"{stub_server}{_redirect_path(302, hop)}", max_redirects=1
+        ).send_request(method="GET", sleep=0, retries=1)
+
+
+def test_redirect_loop(stub_server: str):
+    with pytest.raises(RedirectLoop):
+        ConnectionManager(url=f"{stub_server}{_redirect_path(302, 'self')}").send_request(
+            method="GET", sleep=0, retries=1
+        )
+
+
+def test_redirects_disabled(stub_server: str):
+    result = check_site(
+        f"{stub_server}{_redirect_path(302, '/200')}", method="GET", max_redirects=0
+    )
+
+    assert result.response.status_code == 302
+    assert result.response.redirects == []
+
+
+def test_see_other_switches_to_get(stub_server: str):
+    connection_manager = ConnectionManager(
+        url=f"{stub_server}{_redirect_path(303, '/200')}", body={"key": "value"}
+    )
+
+    res = connection_manager.send_request(method="POST", sleep=0, retries=1)
+
+    assert res["status_code"] == 200
+    assert connection_manager.body is None
+
+
+def test_same_host_redirect_reuses_connection(stub_server: str):
+    pool = ConnectionPool()
+    hop: str = _redirect_path(308, "/200")
+
+    result = check_site(
+        f"{stub_server}{_redirect_path(301, hop)}", method="GET", pool=pool
+    )
+
+    assert result.response.status_code == 200
+    assert len(result.response.redirects) == 2
+    assert pool.misses == 1
+    assert pool.hits == 0
+
+    pool.close()
+
+
+def test_cross_host_redirect_uses_new_connection(stub_server: str):
+    pool = ConnectionPool()
+    other_host: str = stub_server.replace("127.0.0.1", "localhost")
+
+    result = check_site(
+        f"{stub_server}{_redirect_path(302, f'{other_host}/200')}",
+        method="GET",
+        pool=pool,
+    )
+
+    assert result.response.status_code == 200
+    assert pool.misses == 2
+
+    pool.close()
+
+
+def test_async_follows_redirects(stub_server: str):
+    hop: str = f"{stub_server}{_redirect_path(302, '/200')}"
+
+    result = asyncio.run(
+        check_site_async(f"{stub_server}{_redirect_path(301, hop)}", method="GET")
+    )
+
+    assert result.response.status_code == 200
+    assert result.response.redirects == [hop, f"{stub_server}/200"]
+
+
+def test_async_redirect_loop(stub_server: str):
+    with pytest.raises(RedirectLoop):
+        asyncio.run(
+            AsyncConnectionManager(
+                url=f"{stub_server}{_redirect_path(302, 'self')}"
+            ).send_request(method="GET", sleep=0, retries=1)
+        )
+
+
+def test_long_redirect_chain(
+    stub_server: str, run_check: t.Callable[..., CheckResult]
+):
+    result = run_check(f"{stub_server}/308?redirects=5", method="GET", max_redirects=5)
+
+    assert result.response.status_code == 200
+    assert result.response.redirects[-1] == f"{stub_server}/308?redirects=0"
+    assert len(result.response.redirects) == 5
+
+
+def test_long_redirect_chain_hits_limit(stub_server: str):
+    result = check_site(f"{stub_server}/302?redirects=5", method="GET", max_redirects=4)
+
+    assert isinstance(result.error, TooManyRedirects)
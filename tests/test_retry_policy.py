@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import time
+import typing as t
+import uuid
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    AsyncConnectionManager,
+    ConnectionManager,
+    RetryBudget,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def test_exponential_delay_is_capped():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in range(5)] == [0.5, 1, 2, 3, 3]
+
+
+def test_full_jitter_stays_within_ceiling():
+    policy = RetryPolicy(base_delay=1, max_delay=10)
+
+    for attempt in range(6):
+        assert 0 <= policy.delay(attempt) <= min(10, 2**attempt)
+
+
+def test_constant_policy():
+    policy = RetryPolicy.constant(0.25)
+
+    assert {policy.delay(attempt) for attempt in range(4)} == {0.25}
+
+
+def test_retry_after_is_honored_and_capped():
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+
+    assert policy.delay(0, retry_after=2) == 2
+    assert policy.delay(0, retry_after=120) == 5
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, None), ("7", 7.0), ("soon", None)],
+)
+def test_parse_retry_after(value: str | None, expected: float | None):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    value: str = email.utils.formatdate(time.time() + 30, usegmt=True)
+
+    assert 25 <= parse_retry_after(value) <= 30
+
+
+def test_retry_budget_is_shared():
+    budget = RetryBudget(2)
+
+    assert [budget.try_acquire() for _ in range(3)] == [True, True, False]
+
+
+def test_retry_budget_refills():
+    budget = RetryBudget(1, refill_per_second=50)
+
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    time.sleep(0.05)
+    assert budget.try_acquire()
+
+
+def test_retries_503_until_success(stub_server: str):
+    connection_manager = ConnectionManager(
+        url=f"{stub_server}/503?succeed_after=2&id={uuid.uuid4()}",
+        retry_policy=RetryPolicy(base_delay=0.01),
+    )
+
+    res: dict[str, t.Any] = connection_manager.send_request(
+        method="GET", sleep=0, retries=3
+    )
+
+    assert res["status_code"] == 200
+
+
+def test_returns_last_429_when_out_of_attempts(stub_server: str):
+    connection_manager = ConnectionManager(
+        url=f"{stub_server}/429?retry_after=0",
+        retry_policy=RetryPolicy(base_delay=0.01),
+    )
+
+    res: dict[str, t.Any] = connection_manager.send_request(
+        method="HEAD", sleep=0, retries=2
+    )
+
+    assert res["status_code"] == 429
+
+
+def test_retry_after_longer_than_deadline_returns_response(stub_server: str):
+    connection_manager = ConnectionManager(
+        url=f"{stub_server}/503?retry_after=10", deadline=1
+    )
+
+    started: float = time.monotonic()
+    res: dict[str, t.Any] = connection_manager.send_request(
+        method="HEAD", sleep=0, retries=3
+    )
+
+    assert res["status_code"] == 503
+    assert time.monotonic() - started < 1
+
+
+def test_budget_stops_retries(stub_server: str):
+    policy = RetryPolicy(base_delay=0.01, budget=RetryBudget(1))
+
+    for _ in range(2):
+        res: dict[str, t.Any] = ConnectionManager(
+            url=f"{stub_server}/503?succeed_after=1&id={uuid.uuid4()}",
+            retry_policy=policy,
+        ).send_request(method="HEAD", sleep=0, retries=3)
+
+    ## The first check spent the only retry, so the second gets its first 503
+    assert res["status_code"] == 503
+
+
+def test_async_retries_503(stub_server: str):
+    connection_manager = AsyncConnectionManager(
+        url=f"{stub_server}/503?succeed_after=1&retry_after=0&id={uuid.uuid4()}",
+        retry_policy=RetryPolicy(base_delay=0.01),
+    )
+
+    res: dict[str, t.Any] = asyncio.run(
+        connection_manager.send_request(method="GET", sleep=0, retries=2)
+    )
+
+    assert res["status_code"] == 200
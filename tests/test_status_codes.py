@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import logging
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    DEFAULT_HTTP_FAILURE_CODES,
+    DEFAULT_HTTP_SUCCESS_CODES,
+    REDIRECT_CODES,
+    StatusClassifier,
+    StatusCodes,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+@pytest.mark.parametrize(
+    "specs, expected",
+    [
+        ((200, 201), [200, 201]),
+        (("2xx",), list(range(200, 300))),
+        (("2XX", "!204"), [code for code in range(200, 300) if code != 204]),
+        (("500-503",), [500, 501, 502, 503]),
+        (("!404", "4xx"), [code for code in range(400, 500) if code != 404]),
+        (("400,", "404,", "500"), [400, 404, 500]),
+        (("5xx !500-598",), [599]),
+    ],
+)
+def test_status_code_specs(specs: tuple, expected: list[int]):
+    assert list(StatusCodes(*specs)) == expected
+
+
+@pytest.mark.parametrize("spec", ["abc", "6xx", "99", "600", "503-500", "!", "2xxx"])
+def test_invalid_status_code_specs(spec: str):
+    with pytest.raises(ValueError):
+        StatusCodes(spec)
+
+
+@pytest.mark.parametrize("status_code", [-1, 600, 999])
+def test_out_of_range_codes_are_never_members(status_code: int):
+    assert status_code not in StatusCodes("1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+def test_redirect_codes():
+    assert list(REDIRECT_CODES) == [301, 302, 303, 307, 308]
+
+
+def test_classifier_matches_default_lists():
+    classifier = StatusClassifier.from_specs(
+        DEFAULT_HTTP_SUCCESS_CODES, DEFAULT_HTTP_FAILURE_CODES
+    )
+
+    for status_code in range(100, 600):
+        if status_code in DEFAULT_HTTP_SUCCESS_CODES:
+            expected: str = "success"
+        elif status_code in DEFAULT_HTTP_FAILURE_CODES:
+            expected = "failure"
+        else:
+            expected = "unexpected"
+
+        assert classifier.classify(status_code) == expected
+
+
+def test_classifier_success_wins_overlap():
+    classifier = StatusClassifier.from_specs(["2xx", "404"], ["4xx", "5xx"])
+
+    assert classifier.classify(404) == "success"
+    assert classifier.classify(403) == "failure"
+    assert classifier.classify(302) == "unexpected"
+    assert classifier.classify(999) == "unexpected"
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import time
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    AsyncConnectionManager,
+    ConnectionManager,
+    DeadlineExceeded,
+    check_site,
+    main,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def test_read_timeout(blackhole_server: str):
+    connection_manager = ConnectionManager(url=blackhole_server, read_timeout=0.2)
+
+    started: float = time.monotonic()
+    with pytest.raises(Exception):
+        connection_manager.send_request(method="HEAD", sleep=0, retries=2)
+
+    assert time.monotonic() - started < 2
+
+
+def test_deadline_caps_retries(blackhole_server: str):
+    connection_manager = ConnectionManager(
+        url=blackhole_server, read_timeout=5, deadline=0.5
+    )
+
+    started: float = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        connection_manager.send_request(method="HEAD", sleep=0, retries=10)
+
+    assert time.monotonic() - started < 1.5
+
+
+def test_deadline_gives_up_instead_of_sleeping(blackhole_server: str):
+    connection_manager = ConnectionManager(
+        url=blackhole_server, read_timeout=0.1, deadline=1
+    )
+
+    started: float = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        connection_manager.send_request(method="HEAD", sleep=5, retries=3)
+
+    assert time.monotonic() - started < 1
+
+
+def test_slow_response_within_timeouts(stub_server: str):
+    res: dict[str, t.Any] = ConnectionManager(
+        url=f"{stub_server}/200?delay=0.1", read_timeout=2, deadline=3
+    ).send_request(method="GET", sleep=0, retries=1)
+
+    assert res["status_code"] == 200
+
+
+def test_check_site_reports_deadline(blackhole_server: str):
+    result = check_site(blackhole_server, sleep=0, retries=3, deadline=0.3)
+
+    assert isinstance(result.error, DeadlineExceeded)
+
+
+def test_async_read_timeout(blackhole_server: str):
+    connection_manager = AsyncConnectionManager(url=blackhole_server, read_timeout=0.2)
+
+    started: float = time.monotonic()
+    with pytest.raises(Exception):
+        asyncio.run(connection_manager.send_request(method="HEAD", sleep=0, retries=2))
+
+    assert time.monotonic() - started < 2
+
+
+def test_async_deadline(blackhole_server: str):
+    connection_manager = AsyncConnectionManager(url=blackhole_server, deadline=0.3)
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(connection_manager.send_request(method="HEAD", sleep=0, retries=5))
+
+
+def test_async_tls_handshake_timeout(blackhole_server: str):
+    ## The blackhole accepts the connection, but never answers the TLS handshake
+    connection_manager = AsyncConnectionManager(
+        url=blackhole_server.replace("http://", "https://"), connect_timeout=0.2
+    )
+
+    started: float = time.monotonic()
+    with pytest.raises(Exception):
+        asyncio.run(connection_manager.send_request(method="HEAD", sleep=0, retries=2))
+
+    assert time.monotonic() - started < 2
+
+
+@pytest.mark.parametrize(
+    "option, value",
+    [
+        ("--connect-timeout", "0"),
+        ("--read-timeout", "-1"),
+        ("--deadline", "0"),
+        ("--retries", "0"),
+        ("--max-redirects", "-1"),
+        ("--sleep", "-1"),
+    ],
+)
+def test_main_rejects_invalid_limits(
+    monkeypatch: pytest.MonkeyPatch, option: str, value: str
+):
+    monkeypatch.setattr(
+        sys, "argv", ["sitecheck.py", "--site", "example.com", option, value]
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == 2
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    AsyncConnectionManager,
+    ConnectionManager,
+    ConnectionPool,
+    Timings,
+    check_site,
+    get_ssl_context,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def test_http_timings(stub_server: str):
+    res: dict[str, t.Any] = ConnectionManager(url=f"{stub_server}/200").send_request(
+        method="GET", sleep=0, retries=1
+    )
+    timings: Timings = res["timings"]
+
+    assert timings.dns_ms is not None
+    assert timings.connect_ms is not None
+    assert timings.tls_ms is None
+    assert 0 < timings.ttfb_ms <= timings.total_ms
+
+
+def test_https_timings(stub_tls_server: str, stub_ca_file: str):
+    res: dict[str, t.Any] = ConnectionManager(
+        url=f"{stub_tls_server}/200", ssl_context=get_ssl_context(cafile=stub_ca_file)
+    ).send_request(method="HEAD", sleep=0, retries=1)
+
+    assert res["timings"].tls_ms > 0
+
+
+def test_ttfb_excludes_connection_setup(stub_tls_server: str, stub_ca_file: str):
+    res: dict[str, t.Any] = ConnectionManager(
+        url=f"{stub_tls_server}/200", ssl_context=get_ssl_context(cafile=stub_ca_file)
+    ).send_request(method="HEAD", sleep=0, retries=1)
+    timings: Timings = res["timings"]
+
+    assert timings.ttfb_ms < timings.total_ms - timings.tls_ms
+
+
+def test_reused_connection_skips_connect_phases(stub_server: str):
+    pool = ConnectionPool()
+
+    for _ in range(2):
+        res: dict[str, t.Any] = ConnectionManager(
+            url=f"{stub_server}/200", pool=pool
+        ).send_request(method="HEAD", sleep=0, retries=1)
+
+    assert pool.hits == 1
+    assert res["timings"].dns_ms is None
+    assert res["timings"].connect_ms is None
+    assert res["timings"].ttfb_ms is not None
+
+    pool.close()
+
+
+def test_async_timings(stub_tls_server: str, stub_ca_file: str):
+    res: dict[str, t.Any] = asyncio.run(
+        AsyncConnectionManager(
+            url=f"{stub_tls_server}/200",
+            ssl_context=get_ssl_context(cafile=stub_ca_file),
+        ).send_request(method="GET", sleep=0, retries=1)
+    )
+    timings: Timings = res["timings"]
+
+    assert None not in (timings.dns_ms, timings.connect_ms, timings.tls_ms)
+    assert timings.ttfb_ms <= timings.total_ms
+
+
+def test_check_site_exposes_timings(stub_server: str):
+    result = check_site(f"{stub_server}/404", sleep=0)
+
+    assert result.response.timings.total_ms > 0
+
+
+def test_timings_str_skips_missing_phases():
+    assert str(Timings(ttfb_ms=1.0, total_ms=2.5)) == "total=2.5ms ttfb=1.0ms"
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import ssl
+import threading
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from sitecheck import (
+    TLS_SESSION_CACHE,
+    AsyncConnectionManager,
+    ConnectionManager,
+    TLSSessionCache,
+    get_ssl_context,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def test_ssl_context_is_shared(stub_ca_file: str):
+    assert get_ssl_context() is get_ssl_context()
+    assert get_ssl_context(cafile=stub_ca_file) is not get_ssl_context()
+
+
+def test_ssl_context_min_tls_version():
+    context: ssl.SSLContext = get_ssl_context(min_tls_version="1.3")
+
+    assert context.minimum_version == ssl.TLSVersion.TLSv1_3
+
+
+def test_https_request_with_custom_ca(stub_tls_server: str, stub_ca_file: str):
+    connection_manager = ConnectionManager(
+        url=f"{stub_tls_server}/200", ssl_context=get_ssl_context(cafile=stub_ca_file)
+    )
+
+    res: dict[str, t.Any] = connection_manager.send_request(
+        method="GET", sleep=0, retries=1
+    )
+
+    assert res["status_code"] == 200
+
+
+def test_https_request_rejects_untrusted_certificate(stub_tls_server: str):
+    connection_manager = ConnectionManager(url=f"{stub_tls_server}/200")
+
+    with pytest.raises(Exception):
+        connection_manager.send_request(method="HEAD", sleep=0, retries=1)
+
+
+def test_tls_session_is_resumed(stub_tls_server: str, stub_ca_file: str):
+    context: ssl.SSLContext = get_ssl_context(cafile=stub_ca_file)
+    resumed_before: int = TLS_SESSION_CACHE.resumed
+
+    for _ in range(3):
+        ConnectionManager(url=f"{stub_tls_server}/200", ssl_context=context).send_request(
+            method="GET", sleep=0, retries=1
+        )
+
+    ## Every handshake after the first for this host resumes the cached session
+    assert TLS_SESSION_CACHE.resumed - resumed_before >= 2
+
+
+def test_async_https_request(stub_tls_server: str, stub_ca_file: str):
+    connection_manager = AsyncConnectionManager(
+        url=f"{stub_tls_server}/404", ssl_context=get_ssl_context(cafile=stub_ca_file)
+    )
+
+    res: dict[str, t.Any] = asyncio.run(
+        connection_manager.send_request(method="HEAD", sleep=0, retries=1)
+    )
+
+    assert res["status_code"] == 404
+
+
+def test_tls_session_cache_evicts_least_recently_used():
+    cache = TLSSessionCache(max_size=2)
+    sessions: list[t.Any] = [object(), object(), object()]
+
+    cache.put("a", sessions[0])
+    cache.put("b", sessions[1])
+    cache.get("a")
+    cache.put("c", sessions[2])
+
+    assert cache.get("a") is sessions[0]
+    assert cache.get("b") is None
+    assert cache.get("c") is sessions[2]
+
+
+def test_tls_session_cache_counts_concurrent_resumptions():
+    cache = TLSSessionCache()
+    barrier = threading.Barrier(8)
+
+    def _resume() -> None:
+        barrier.wait()
+        for _ in range(1000):
+            cache.put("host", object(), resumed=True)
+
+    threads: list[threading.Thread] = [threading.Thread(target=_resume) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.resumed == 8000
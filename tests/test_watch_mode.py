@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import collections
+import itertools
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+from sitecheck import CheckResult, ConnectionPool, watch_sites
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def test_watch_sites_repeats_checks_on_interval(stub_server: str):
+    sites: list[str] = [f"{stub_server}/200", f"{stub_server}/404"]
+    interval: float = 0.2
+
+    started: float = time.monotonic()
+    results: list[CheckResult] = list(
+        itertools.islice(
+            watch_sites(sites, interval=interval, jitter=False, sleep=0), 6
+        )
+    )
+    elapsed: float = time.monotonic() - started
+
+    assert collections.Counter(r.site for r in results) == {site: 3 for site in sites}
+    ## Three rounds: at 0, 1 and 2 intervals
+    assert 2 * interval <= elapsed < 4 * interval
+
+
+def test_watch_sites_reuses_pooled_connections(stub_server: str):
+    pool = ConnectionPool()
+
+    results: list[CheckResult] = list(
+        itertools.islice(
+            watch_sites(
+                [f"{stub_server}/200"], interval=0.05, pool=pool, sleep=0, retries=1
+            ),
+            4,
+        )
+    )
+
+    assert all(r.response.status_code == 200 for r in results)
+    assert pool.misses == 1
+    assert pool.hits == 3
+
+    pool.close()
+
+
+def test_watch_sites_jitters_first_round(stub_server: str):
+    sites: list[str] = [f"{stub_server}/200"] * 3
+    interval: float = 0.5
+
+    started: float = time.monotonic()
+    first_round: list[CheckResult] = list(
+        itertools.islice(watch_sites(sites, interval=interval, sleep=0), 3)
+    )
+
+    assert len(first_round) == 3
+    assert time.monotonic() - started < 2 * interval
+
+
+def test_watch_sites_rejects_invalid_interval():
+    with pytest.raises(ValueError):
+        next(watch_sites(["http://127.0.0.1"], interval=0))
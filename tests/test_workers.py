@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import functools
+import logging
+import os
+from pathlib import Path
+import pickle
+import queue
+import sys
+import typing as t
+
+log = logging.getLogger(__name__)
+
+import sitecheck
+from sitecheck import (
+    CheckSpec,
+    ConnectionPool,
+    ExitCode,
+    JSONPathMatcher,
+    StatusClassifier,
+    _check_shard,
+    check_sites_sharded,
+    classify_result,
+    get_ssl_context,
+    main,
+)
+
+import pytest
+
+logging.basicConfig(
+    level="INFO",
+    format="[TESTS] | %(asctime)s | [%(levelname)s] | (%(name)s)-> %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+
+
+def _tls_kwargs(cafile: str) -> dict[str, t.Any]:
+    return {"ssl_context": get_ssl_context(cafile=cafile)}
+
+
+def _die() -> dict[str, t.Any]:
+    ## Exit like a killed worker, without sending the end marker
+    os._exit(3)
+
+
+def test_spec_pickles(classifier: StatusClassifier):
+    spec = CheckSpec(
+        "http://example.com/health",
+        method="POST",
+        headers={"X-Token": "abc"},
+        body={"a": 1},
+        classifier=classifier,
+        interval=5.0,
+        options={"retries": 2, "expect": [JSONPathMatcher("status=ok")]},
+    )
+
+    copy: CheckSpec = pickle.loads(pickle.dumps(spec))
+
+    assert copy.request_head == spec.request_head
+    assert copy.body == spec.body
+    assert copy.interval == 5.0
+    assert copy.options["retries"] == 2
+    assert copy.classifier.classify(404) == "failure"
+
+
+@pytest.mark.parametrize("engine", ["thread", "async"])
+def test_sharded_checks(stub_server: str, engine: str, classifier: StatusClassifier):
+    specs: list[CheckSpec] = [
+        CheckSpec(f"{stub_server}/{status}", classifier=classifier)
+        for status in [200, 404, 418, 200, 200]
+    ]
+
+    results = list(
+        check_sites_sharded(specs, workers=3, engine=engine, retries=1, sleep=0)
+    )
+
+    assert sorted(result.response.status_code for result in results) == [
+        200,
+        200,
+        200,
+        404,
+        418,
+    ]
+    ## Results come back with the parent's own specs
+    assert {id(result.spec) for result in results} == {id(spec) for spec in specs}
+
+
+def test_sharded_checks_build_per_process_kwargs(stub_tls_server: str, stub_ca_file: str):
+    results = list(
+        check_sites_sharded(
+            [f"{stub_tls_server}/200"] * 4,
+            workers=2,
+            setup=functools.partial(_tls_kwargs, stub_ca_file),
+            retries=1,
+        )
+    )
+
+    assert [result.response.status_code for result in results] == [200] * 4
+
+
+def test_sharded_timeouts_keep_their_cause(
+    blackhole_server: str, classifier: StatusClassifier
+):
+    (result,) = check_sites_sharded(
+        [blackhole_server], workers=2, read_timeout=0.2, retries=1, sleep=0
+    )
+
+    assert isinstance(result.error.__cause__, TimeoutError)
+    assert classify_result(result, classifier) == "timeout"
+
+
+def test_more_workers_than_sites(stub_server: str):
+    results = list(check_sites_sharded([f"{stub_server}/200"], workers=4, retries=1))
+
+    assert len(results) == 1
+
+
+def test_sharded_checks_compile_run_kwargs(stub_server: str):
+    results = list(
+        check_sites_sharded(
+            [f"{stub_server}/200"] * 2,
+            workers=2,
+            method="POST",
+            headers={"X-Token": "abc"},
+            body="payload",
+            retries=1,
+        )
+    )
+
+    assert [result.method for result in results] == ["POST"] * 2
+    assert [result.spec.headers for result in results] == [{"X-Token": "abc"}] * 2
+
+
+def test_shard_pool_idle_timeout(stub_server: str, monkeypatch: pytest.MonkeyPatch):
+    pools: list[ConnectionPool] = []
+
+    class _RecordingPool(ConnectionPool):
+        def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(sitecheck, "ConnectionPool", _RecordingPool)
+    results: queue.Queue = queue.Queue()
+
+    _check_shard(
+        0,
+        [(0, CheckSpec(f"{stub_server}/200"))],
+        results,
+        "thread",
+        2,
+        90.0,
+        None,
+        {"retries": 1},
+    )
+
+    assert [pool.idle_timeout for pool in pools] == [90.0]
+    assert pickle.loads(results.get())[1].response.status_code == 200
+    assert results.get() == 0
+
+
+def test_failed_worker_reports_its_checks(
+    stub_server: str, classifier: StatusClassifier
+):
+    sites: list[str] = [f"{stub_server}/200"] * 3
+
+    ## Every worker raises, as check_sites() rejects the concurrency
+    results = list(check_sites_sharded(sites, workers=2, concurrency=0, retries=1))
+
+    assert len(results) == 3
+    assert all(
+        classify_result(result, classifier) == "connection_error" for result in results
+    )
+    assert "stopped before checking" in str(results[0].error)
+
+
+def test_killed_worker_reports_its_checks(stub_server: str):
+    sites: list[str] = [f"{stub_server}/200"] * 3
+
+    results = list(check_sites_sharded(sites, workers=2, setup=_die, retries=1))
+
+    assert len(results) == 3
+    assert all(result.response is None for result in results)
+    assert "exited with code 3" in str(results[0].error)
+
+
+def test_main_with_workers(
+    stub_server: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    sites_file: Path = tmp_path / "sites.txt"
+    sites_file.write_text(
+        "\n".join(f"{stub_server}/{status}" for status in [200, 201, 404]),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["sitecheck.py", "--sites-file", str(sites_file), "--workers", "2", "--retries", "1"],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+
+    assert exit_info.value.code == ExitCode.FAILURE